@@ -1,7 +1,7 @@
 # ============================================================================
 # IMPORTAÇÕES
 # ============================================================================
-import random  # Para seleção aleatória de inimigo atirador
+import random  # Para seleção aleatória de inimigo atirador (random.Random por instância)
 from ..Dados.inimigo import Inimigo  # Classe de dados Inimigo
 from ..Dados.projetil import Projetil  # Classe de dados Projetil
 from ..utils import LARGURA_TELA, VELOCIDADE_INIMIGO  # Constantes
@@ -50,10 +50,11 @@ class InimigoBusiness:
     ATRIBUTOS:
     - inimigos: Lista de objetos Inimigo a gerenciar
     - velocidade_base: Velocidade de movimento dos inimigos
+    - rng: Gerador aleatório usado para escolher o atirador
     ========================================================================
     """
 
-    def __init__(self, inimigos, velocidade_base=VELOCIDADE_INIMIGO):
+    def __init__(self, inimigos, velocidade_base=VELOCIDADE_INIMIGO, rng=None):
         """
         CONSTRUTOR DA CLASSE INIMIGOBUSINESS
 
@@ -66,6 +67,8 @@ class InimigoBusiness:
         Args:
             inimigos (list): Lista de objetos Inimigo a gerenciar
             velocidade_base (int): Velocidade de movimento (padrão: VELOCIDADE_INIMIGO)
+            rng (random.Random, optional): Gerador aleatório da partida
+                (None = cria um random.Random próprio, sem estado global compartilhado)
 
         Exemplo de uso:
             inimigos = [Inimigo(100, 50), Inimigo(200, 50)]
@@ -73,6 +76,7 @@ class InimigoBusiness:
         """
         self.inimigos = inimigos              # Lista de inimigos a gerenciar
         self.velocidade_base = velocidade_base  # Velocidade de movimento
+        self.rng = rng if rng is not None else random.Random()  # Fonte de aleatoriedade própria
 
     # ========================================================================
     # MÉTODOS DE LÓGICA DE NEGÓCIO
@@ -107,8 +111,8 @@ class InimigoBusiness:
         """
         # Verifica se há inimigos disponíveis
         if self.inimigos:
-            # Seleciona inimigo aleatório usando random.choice()
-            atirador = random.choice(self.inimigos)
+            # Seleciona inimigo aleatório usando choice() do gerador configurado
+            atirador = self.rng.choice(self.inimigos)
 
             # Calcula posição X central do inimigo
             # atirador.largura // 2: centro do inimigo
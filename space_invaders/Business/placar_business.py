@@ -0,0 +1,188 @@
+# ============================================================================
+# IMPORTAÇÕES
+# ============================================================================
+import bisect     # Inserção/remoção e posição na lista ordenada
+import queue      # Resultados aguardando gravação em segundo plano
+import threading  # Registros (game loop) e consultas (rotas) em threads diferentes
+import time       # Data do resultado = fim da partida, não o momento da gravação
+
+MAX_TOP = 100  # Maior K aceito em top()
+
+
+# ============================================================================
+# CLASSE PLACARBUSINESS - CAMADA DE LÓGICA DE NEGÓCIO (BUSINESS)
+# ============================================================================
+class PlacarBusiness:
+    """
+    ========================================================================
+    CLASSE PLACARBUSINESS - LÓGICA DE NEGÓCIO
+    ========================================================================
+
+    PROPÓSITO:
+    Placar persistente: cada usuário entra com o MELHOR resultado das
+    partidas que jogou (partidas da IA não entram, a menos que incluir_ia).
+
+    REGRAS DE CLASSIFICAÇÃO:
+    - Mais pontos primeiro
+    - Empate: quem fez a pontuação antes fica à frente
+    - Posições distintas (1, 2, 3...)
+
+    ÍNDICE (mantido incrementalmente, sem reordenar por consulta):
+    - Lista ordenada de chaves (-pontos, criado_em, email)
+    - Novo recorde pessoal: remove a chave antiga e insere a nova (bisect)
+    - posicao(email): busca binária - O(log n)
+    - top(k): fatia da lista; resposta em cache até o próximo recorde
+
+    GRAVAÇÃO EM SEGUNDO PLANO:
+    - enfileirar() só coloca o resultado numa fila (seguro no game loop);
+      a thread "gravacao-placar" persiste e atualiza o índice, então uma
+      escrita lenta (ex: lock do SQLite) não congela a simulação
+
+    RELACIONAMENTOS:
+    - USA: RepositorioUsuarios/RepositorioSQLite (grava resultados, nomes)
+    - USADO POR: web/app.py (game over e rotas /api/placar)
+
+    ATRIBUTOS:
+    - repositorio: Onde os resultados são persistidos
+    - incluir_ia: Se partidas do modo IA entram no placar
+    ========================================================================
+    """
+
+    def __init__(self, repositorio, incluir_ia=False):
+        """
+        CONSTRUTOR - Monta o índice a partir dos resultados já gravados
+
+        Args:
+            repositorio: Repositório com registrar_resultado(), resultados() e obter()
+            incluir_ia (bool): Se True, partidas jogadas pela IA também contam
+        """
+        self.repositorio = repositorio
+        self.incluir_ia = incluir_ia
+        self._trava = threading.Lock()
+        self._melhores = {}  # email -> chave na lista ordenada
+        for resultado in repositorio.resultados():
+            chave = self._chave(resultado)
+            if chave is not None and (resultado["email"] not in self._melhores
+                                      or chave < self._melhores[resultado["email"]]):
+                self._melhores[resultado["email"]] = chave
+        self._ordem = sorted(self._melhores.values())  # Ordenação única, na carga
+        self._cache_top = {}  # k -> lista pronta para JSON
+        self._fila = queue.Queue()  # (email, pontos, campos) aguardando registrar()
+        self._thread = None
+
+    def _chave(self, resultado):
+        if resultado["modo_ia"] and not self.incluir_ia:
+            return None
+        return (-resultado["pontos"], resultado["criado_em"], resultado["email"])
+
+    def __len__(self):
+        """Número de usuários no placar."""
+        return len(self._ordem)
+
+    # ========================================================================
+    # MÉTODOS DE LÓGICA DE NEGÓCIO - REGISTRO
+    # ========================================================================
+
+    def registrar(self, email, pontos, **campos):
+        """
+        REGRA DE NEGÓCIO: Gravar o resultado final de uma partida
+
+        Persiste sempre; o índice só muda se for recorde pessoal.
+
+        Args:
+            email (str): Usuário que jogou
+            pontos (int): Pontuação final
+            **campos: ticks, semente, modo_ia (ver Dados/usuarios.novo_resultado)
+
+        Returns:
+            dict: Resultado gravado
+        """
+        resultado = self.repositorio.registrar_resultado(email, pontos, **campos)
+        chave = self._chave(resultado)
+        if chave is None:
+            return resultado
+        with self._trava:
+            atual = self._melhores.get(email)
+            if atual is not None and atual <= chave:
+                return resultado  # Não superou o melhor resultado
+            if atual is not None:
+                del self._ordem[bisect.bisect_left(self._ordem, atual)]
+            bisect.insort(self._ordem, chave)
+            self._melhores[email] = chave
+            self._cache_top.clear()
+        return resultado
+
+    def enfileirar(self, email, pontos, **campos):
+        """
+        Agenda registrar() na thread de gravação e retorna imediatamente.
+
+        Args:
+            email (str): Usuário que jogou
+            pontos (int): Pontuação final
+            **campos: Ver registrar()
+        """
+        with self._trava:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._laco_gravacao, name="gravacao-placar",
+                                                daemon=True)
+                self._thread.start()
+        campos.setdefault("criado_em", time.time())  # Desempate do placar pela hora do game over
+        self._fila.put((email, pontos, campos))
+
+    def aguardar(self):
+        """Bloqueia até todos os resultados enfileirados serem gravados."""
+        self._fila.join()
+
+    def _laco_gravacao(self):
+        while True:
+            email, pontos, campos = self._fila.get()
+            try:
+                self.registrar(email, pontos, **campos)
+            except Exception as e:  # OSError, sqlite3.Error...: a thread continua para os próximos
+                print(f"Erro ao gravar resultado da partida: {e}")
+            finally:
+                self._fila.task_done()
+
+    # ========================================================================
+    # MÉTODOS DE CONSULTA
+    # ========================================================================
+
+    def top(self, k=10):
+        """
+        Os k primeiros colocados (em cache até o próximo recorde).
+
+        Args:
+            k (int): Quantidade (1 a MAX_TOP)
+
+        Returns:
+            list[dict]: {"posicao", "nome", "pontos", "criado_em"} - sem email
+        """
+        k = min(max(int(k), 1), MAX_TOP)
+        with self._trava:
+            cache = self._cache_top.get(k)
+            if cache is not None:
+                return cache
+            chaves = self._ordem[:k]
+        linhas = []
+        for posicao, (pontos_negativos, criado_em, email) in enumerate(chaves, 1):
+            usuario = self.repositorio.obter(email)
+            linhas.append({"posicao": posicao, "nome": usuario["nome"] if usuario else None,
+                           "pontos": -pontos_negativos, "criado_em": criado_em})
+        with self._trava:
+            if self._ordem[:k] == chaves:  # Nenhum recorde enquanto buscava os nomes
+                self._cache_top[k] = linhas
+        return linhas
+
+    def posicao(self, email):
+        """
+        Melhor resultado e posição de um usuário.
+
+        Returns:
+            dict|None: {"posicao", "pontos", "criado_em", "total"} ou None se não jogou
+        """
+        with self._trava:
+            chave = self._melhores.get(email)
+            if chave is None:
+                return None
+            return {"posicao": bisect.bisect_left(self._ordem, chave) + 1, "pontos": -chave[0],
+                    "criado_em": chave[1], "total": len(self._ordem)}
@@ -44,10 +44,11 @@ class ProjetilBusiness:
     - jogador: Referência ao jogador (para sincronização)
     - altura_tela: Altura da tela (para detectar saída)
     - sprite_explosao: Sprite para efeitos de explosão
+    - relogio: Função que retorna o tempo atual em ms (opcional)
     ========================================================================
     """
 
-    def __init__(self, projeteis_jogador, projeteis_inimigo, jogador=None, altura_tela=ALTURA_TELA, sprite_explosao=None):
+    def __init__(self, projeteis_jogador, projeteis_inimigo, jogador=None, altura_tela=ALTURA_TELA, sprite_explosao=None, relogio=None):
         """
         CONSTRUTOR DA CLASSE PROJETILBUSINESS
 
@@ -59,12 +60,15 @@ class ProjetilBusiness:
             jogador (Jogador, optional): Referência ao jogador
             altura_tela (int): Altura da tela
             sprite_explosao: Sprite para explosões
+            relogio (callable, optional): Fonte de tempo em ms para as explosões
+                (None = relógio do pygame; JogoHeadless injeta seu relógio lógico)
         """
         self.projeteis_jogador = projeteis_jogador
         self.projeteis_inimigo = projeteis_inimigo
         self.jogador = jogador
         self.altura_tela = altura_tela
         self.sprite_explosao = sprite_explosao
+        self.relogio = relogio
 
     # ========================================================================
     # MÉTODOS DE LÓGICA DE NEGÓCIO - MOVIMENTO
@@ -177,7 +181,8 @@ class ProjetilBusiness:
                     pos_y = (tiro_jogador.y + tiro_inimigo.y) // 2
 
                     # Cria efeito de explosão
-                    explosao = EfeitoExplosao(pos_x, pos_y, tamanho=15)
+                    tempo_criacao = self.relogio() if self.relogio else None
+                    explosao = EfeitoExplosao(pos_x, pos_y, tamanho=15, tempo_criacao=tempo_criacao)
                     if self.sprite_explosao:
                         explosao.sprite = self.sprite_explosao
                     efeitos_explosao.append(explosao)
@@ -0,0 +1,297 @@
+# ============================================================================
+# CLASSE REPOSITORIOSQLITE - CAMADA DE DADOS (USUÁRIOS E RESULTADOS EM SQLITE)
+# ============================================================================
+"""
+PROPÓSITO:
+Backend opcional de produção para contas e resultados de partidas, com a
+MESMA interface de RepositorioUsuarios (Dados/usuarios.py): obter, existe,
+todos, adicionar, atualizar, substituir, registrar_resultado, resultados,
+flush e fechar.
+
+CONCORRÊNCIA (sem trava global):
+- Banco em modo WAL: leitores não bloqueiam o escritor nem entre si
+- Pool de conexões: cada operação pega uma conexão livre, usada por uma
+  única thread até devolver (threads do Flask e do Socket.IO vêm e vão;
+  conexões por thread vazariam)
+- Escritas concorrentes esperam o lock do SQLite (busy_timeout), não uma
+  trava do Python
+- SQL constante com parâmetros: o cache de statements de cada conexão
+  reutiliza a compilação (prepared statements)
+
+MIGRAÇÃO:
+    python -m space_invaders.Dados.banco space_invaders/data/usuarios.json \\
+        --banco space_invaders/data/space_invaders.sqlite3
+
+USO NO WEBSERVICE:
+    SPACE_INVADERS_BANCO=space_invaders/data/space_invaders.sqlite3 python -m space_invaders.web.main
+"""
+
+import argparse   # Ferramenta de migração
+import json       # Campos extras dos usuários
+import queue      # Pool de conexões
+import sqlite3
+import threading  # Registro das conexões criadas
+from contextlib import contextmanager
+from pathlib import Path
+from .usuarios import RepositorioUsuarios, novo_resultado
+
+TAMANHO_POOL = 8           # Conexões mantidas abertas
+ESPERA_LOCK_MS = 5000      # busy_timeout: espera pelo lock de escrita do SQLite
+CAMPOS_USUARIO = ("nome", "senha")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    email  TEXT PRIMARY KEY,
+    nome   TEXT NOT NULL,
+    senha  TEXT NOT NULL,
+    extras TEXT                  -- JSON com demais campos (ou NULL)
+);
+CREATE TABLE IF NOT EXISTS resultados (
+    id        INTEGER PRIMARY KEY,
+    email     TEXT NOT NULL,
+    pontos    INTEGER NOT NULL,
+    ticks     INTEGER NOT NULL,
+    semente   TEXT,              -- Semente de 64 bits sem sinal não cabe em INTEGER
+    modo_ia   INTEGER NOT NULL,
+    criado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_email ON resultados (email, pontos DESC);
+"""
+
+SQL_OBTER = "SELECT nome, senha, extras FROM usuarios WHERE email = ?"
+SQL_EXISTE = "SELECT 1 FROM usuarios WHERE email = ?"
+SQL_INSERIR = "INSERT OR IGNORE INTO usuarios (email, nome, senha, extras) VALUES (?, ?, ?, ?)"
+SQL_ATUALIZAR = "UPDATE usuarios SET nome = ?, senha = ?, extras = ? WHERE email = ?"
+SQL_INSERIR_RESULTADO = ("INSERT INTO resultados (email, pontos, ticks, semente, modo_ia, criado_em) "
+                         "VALUES (?, ?, ?, ?, ?, ?)")
+SQL_IMPORTAR_RESULTADO = (SQL_INSERIR_RESULTADO.replace("VALUES (?, ?, ?, ?, ?, ?)", "SELECT ?, ?, ?, ?, ?, ?")
+                          + " WHERE NOT EXISTS (SELECT 1 FROM resultados WHERE email = ? AND criado_em = ?)")
+SQL_RESULTADOS = "SELECT email, pontos, ticks, semente, modo_ia, criado_em FROM resultados"
+
+
+def _linha_usuario(email, dados):
+    extras = {c: v for c, v in dados.items() if c not in CAMPOS_USUARIO}
+    return (email, dados["nome"], dados["senha"], json.dumps(extras, ensure_ascii=False) if extras else None)
+
+
+def _dados_usuario(nome, senha, extras):
+    dados = {"nome": nome, "senha": senha}
+    if extras:
+        dados.update(json.loads(extras))
+    return dados
+
+
+def _linha_resultado(r):
+    semente = str(r["semente"]) if r["semente"] is not None else None
+    return (r["email"], r["pontos"], r["ticks"], semente, int(r["modo_ia"]), r["criado_em"])
+
+
+def _dict_resultado(email, pontos, ticks, semente, modo_ia, criado_em):
+    return {"email": email, "pontos": pontos, "ticks": ticks,
+            "semente": int(semente) if semente is not None else None,
+            "modo_ia": bool(modo_ia), "criado_em": criado_em}
+
+
+class RepositorioSQLite:
+    """
+    Repositório de usuários e resultados em SQLite (WAL + pool de conexões).
+
+    ATRIBUTOS:
+    - caminho: Arquivo do banco
+    """
+
+    def __init__(self, caminho, tamanho_pool=TAMANHO_POOL):
+        """
+        Abre (ou cria) o banco e o esquema.
+
+        Args:
+            caminho (str|Path): Arquivo .sqlite3
+            tamanho_pool (int): Conexões ociosas mantidas abertas
+        """
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._livres = queue.LifoQueue(maxsize=tamanho_pool)  # LIFO: reusa a conexão mais "quente"
+        self._abertas = set()
+        self._trava_abertas = threading.Lock()  # Só protege o registro de conexões
+        with self._conexao() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")  # Persistente no arquivo
+            conexao.executescript(ESQUEMA)
+
+    # ========================================================================
+    # POOL DE CONEXÕES
+    # ========================================================================
+    def _abrir(self):
+        # isolation_level=None: autocommit; transações explícitas com BEGIN IMMEDIATE.
+        # check_same_thread=False: a conexão muda de thread entre usos, nunca durante
+        conexao = sqlite3.connect(self.caminho, timeout=ESPERA_LOCK_MS / 1000, isolation_level=None,
+                                  check_same_thread=False, cached_statements=64)
+        conexao.execute(f"PRAGMA busy_timeout={ESPERA_LOCK_MS}")
+        conexao.execute("PRAGMA synchronous=NORMAL")  # Seguro em WAL; fsync só no checkpoint
+        with self._trava_abertas:
+            self._abertas.add(conexao)
+        return conexao
+
+    @contextmanager
+    def _conexao(self):
+        try:
+            conexao = self._livres.get_nowait()
+        except queue.Empty:
+            conexao = self._abrir()  # Pico de concorrência: conexão extra
+        try:
+            yield conexao
+        finally:
+            try:
+                self._livres.put_nowait(conexao)
+            except queue.Full:
+                with self._trava_abertas:
+                    self._abertas.discard(conexao)
+                conexao.close()
+
+    @contextmanager
+    def _transacao(self):
+        with self._conexao() as conexao:
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                yield conexao
+            except BaseException:
+                conexao.execute("ROLLBACK")
+                raise
+            conexao.execute("COMMIT")
+
+    # ========================================================================
+    # USUÁRIOS
+    # ========================================================================
+    def obter(self, email):
+        """Retorna os dados do usuário ou None."""
+        with self._conexao() as conexao:
+            linha = conexao.execute(SQL_OBTER, (email,)).fetchone()
+        return _dados_usuario(*linha) if linha else None
+
+    def existe(self, email):
+        with self._conexao() as conexao:
+            return conexao.execute(SQL_EXISTE, (email,)).fetchone() is not None
+
+    def todos(self):
+        with self._conexao() as conexao:
+            linhas = conexao.execute("SELECT email, nome, senha, extras FROM usuarios").fetchall()
+        return {email: _dados_usuario(nome, senha, extras) for email, nome, senha, extras in linhas}
+
+    def __len__(self):
+        with self._conexao() as conexao:
+            return conexao.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
+
+    def adicionar(self, email, dados):
+        """
+        Cadastra um usuário se o email ainda não existir (INSERT OR IGNORE: atômico).
+
+        Returns:
+            bool: False se o email já estava cadastrado
+        """
+        with self._conexao() as conexao:
+            return conexao.execute(SQL_INSERIR, _linha_usuario(email, dados)).rowcount == 1
+
+    def atualizar(self, email, **campos):
+        """
+        Altera campos de um usuário existente.
+
+        Returns:
+            bool: False se o usuário não existir
+        """
+        with self._transacao() as conexao:
+            linha = conexao.execute(SQL_OBTER, (email,)).fetchone()
+            if linha is None:
+                return False
+            dados = dict(_dados_usuario(*linha), **campos)
+            _, nome, senha, extras = _linha_usuario(email, dados)
+            conexao.execute(SQL_ATUALIZAR, (nome, senha, extras, email))
+        return True
+
+    def substituir(self, usuarios):
+        """Troca todos os usuários numa única transação."""
+        with self._transacao() as conexao:
+            conexao.execute("DELETE FROM usuarios")
+            conexao.executemany(SQL_INSERIR, (_linha_usuario(e, d) for e, d in usuarios.items()))
+
+    # ========================================================================
+    # RESULTADOS DAS PARTIDAS
+    # ========================================================================
+    def registrar_resultado(self, email, pontos, **campos):
+        """
+        Acrescenta o resultado de uma partida (campos de novo_resultado()).
+
+        Returns:
+            dict: Registro gravado
+        """
+        resultado = novo_resultado(email, pontos, **campos)
+        with self._conexao() as conexao:
+            conexao.execute(SQL_INSERIR_RESULTADO, _linha_resultado(resultado))
+        return resultado
+
+    def resultados(self, email=None):
+        """Resultados em ordem de registro (opcionalmente de um usuário)."""
+        with self._conexao() as conexao:
+            if email is None:
+                linhas = conexao.execute(SQL_RESULTADOS + " ORDER BY id").fetchall()
+            else:
+                linhas = conexao.execute(SQL_RESULTADOS + " WHERE email = ? ORDER BY id", (email,)).fetchall()
+        return [_dict_resultado(*linha) for linha in linhas]
+
+    # ========================================================================
+    # MIGRAÇÃO E ENCERRAMENTO
+    # ========================================================================
+    def importar(self, usuarios, resultados=()):
+        """
+        Importa usuários e resultados; rodar de novo não duplica nada
+        (contas existentes não são sobrescritas; resultados com mesmo
+        email e criado_em são ignorados).
+
+        Returns:
+            tuple: (usuários novos, resultados novos)
+        """
+        with self._transacao() as conexao:
+            base = conexao.total_changes  # Acumulado da conexão (reutilizada pelo pool)
+            conexao.executemany(SQL_INSERIR, (_linha_usuario(e, d) for e, d in usuarios.items()))
+            novos_usuarios = conexao.total_changes - base
+            conexao.executemany(SQL_IMPORTAR_RESULTADO, (_linha_resultado(r) + (r["email"], r["criado_em"])
+                                                         for r in resultados))
+            novos_resultados = conexao.total_changes - base - novos_usuarios
+        return novos_usuarios, novos_resultados
+
+    def flush(self):
+        """Escritas já são síncronas; força um checkpoint do WAL no arquivo principal."""
+        with self._conexao() as conexao:
+            conexao.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def fechar(self):
+        """Fecha todas as conexões do pool."""
+        while True:
+            try:
+                self._livres.get_nowait()
+            except queue.Empty:
+                break
+        with self._trava_abertas:
+            abertas, self._abertas = self._abertas, set()
+        for conexao in abertas:
+            conexao.close()
+
+
+def main(argv=None):
+    """FERRAMENTA DE LINHA DE COMANDO - Migra usuarios.json (e resultados.jsonl) para SQLite."""
+    parser = argparse.ArgumentParser(description="Importa usuarios.json para o banco SQLite")
+    parser.add_argument("usuarios", nargs="?", default="space_invaders/data/usuarios.json")
+    parser.add_argument("--banco", default="space_invaders/data/space_invaders.sqlite3")
+    args = parser.parse_args(argv)
+
+    origem = RepositorioUsuarios(args.usuarios)  # Inclui o diário ainda não compactado
+    banco = RepositorioSQLite(args.banco)
+    try:
+        novos, resultados = banco.importar(origem.todos(), origem.resultados())
+        print(f"{novos} usuários importados ({len(origem) - novos} já existiam), "
+              f"{resultados} resultados; banco: {args.banco} ({len(banco)} usuários)")
+    finally:
+        banco.fechar()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
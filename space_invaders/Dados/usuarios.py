@@ -0,0 +1,321 @@
+# ============================================================================
+# CLASSE REPOSITORIOUSUARIOS - CAMADA DE DADOS (PERSISTÊNCIA DE USUÁRIOS)
+# ============================================================================
+"""
+PROPÓSITO:
+Guarda as contas do webservice em memória e persiste em segundo plano,
+para que login e cadastro não releiam nem reescrevam o arquivo inteiro
+a cada requisição.
+
+ARMAZENAMENTO (mesmo formato de antes + diário):
+- usuarios.json: {email: {"nome", "senha"}} - carregado uma única vez
+- usuarios.json.diario: uma linha JSON por alteração {"email", "dados"},
+  acrescentada pela thread de gravação (fsync por lote)
+- Compactação: quando o diário passa de LIMITE_DIARIO linhas (ou ao
+  fechar), o snapshot completo é gravado em arquivo temporário e trocado
+  por os.replace (atômico); só então o diário é zerado
+- resultados.jsonl: resultados de partidas (uma linha por partida,
+  somente acréscimo, mesma thread de gravação)
+- Ao abrir, o diário é reaplicado sobre o snapshot (registros completos:
+  reaplicar duas vezes dá o mesmo resultado; uma linha truncada por
+  queda é ignorada e força compactação na próxima gravação)
+
+CONCORRÊNCIA:
+- Leituras (obter/existe) são consultas a um dict, sem trava
+- adicionar() verifica e insere sob uma trava curta: dois cadastros
+  simultâneos do mesmo email nunca se sobrescrevem
+- A gravação acontece fora da requisição (write-behind): uma queda pode
+  perder as alterações dos últimos INTERVALO_GRAVACAO_S segundos;
+  flush() força a gravação
+- Erro de disco (OSError) não descarta nada: alterações de usuários
+  viram uma compactação pendente, resultados voltam para a fila, e a
+  thread tenta de novo a cada INTERVALO_GRAVACAO_S
+- Um único processo deve ser dono do arquivo
+
+A mesma interface é implementada em SQLite por Dados/banco.py.
+"""
+
+import atexit     # Grava pendências ao encerrar o processo
+import json       # Formato do arquivo e do diário
+import os         # fsync e troca atômica
+import threading  # Thread de gravação em segundo plano
+import time       # Data dos resultados
+from pathlib import Path
+
+INTERVALO_GRAVACAO_S = 0.5  # Agrupa alterações próximas num único fsync
+LIMITE_DIARIO = 10_000      # Linhas no diário antes de compactar no snapshot
+ARQUIVO_RESULTADOS = "resultados.jsonl"
+
+
+def novo_resultado(email, pontos, ticks=0, semente=None, modo_ia=False, criado_em=None):
+    """
+    Registro do resultado final de uma partida (formato comum aos repositórios).
+
+    Args:
+        email (str): Usuário da sessão que jogou
+        pontos (int): Pontuacao.pontos no fim da partida
+        ticks (int): Duração da partida em ticks
+        semente (int, optional): Semente da partida
+        modo_ia (bool): Se a partida foi jogada pela IA
+        criado_em (float, optional): Unix time (padrão: agora)
+    """
+    return {"email": email, "pontos": int(pontos), "ticks": int(ticks), "semente": semente,
+            "modo_ia": bool(modo_ia), "criado_em": time.time() if criado_em is None else criado_em}
+
+
+class RepositorioUsuarios:
+    """
+    Repositório de usuários em memória com persistência write-behind.
+
+    ATRIBUTOS:
+    - caminho: Arquivo JSON de snapshot (usuarios.json)
+    - caminho_diario: Diário de alterações ainda não compactadas
+    - caminho_resultados: Resultados das partidas (JSON lines)
+    """
+
+    def __init__(self, caminho):
+        """
+        Carrega o snapshot e reaplica o diário (uma única leitura do disco).
+
+        Args:
+            caminho (str|Path): Arquivo usuarios.json
+        """
+        self.caminho = Path(caminho)
+        self.caminho_diario = self.caminho.with_name(self.caminho.name + ".diario")
+        self.caminho_resultados = self.caminho.with_name(ARQUIVO_RESULTADOS)
+        self._trava = threading.Lock()
+        self._trava_gravacao = threading.Lock()  # Uma gravação por vez (diário x compactação)
+        self._pendentes = []  # (email, dados) aguardando a thread de gravação
+        self._resultados_pendentes = []
+        self._compactar = False  # Pedido de reescrita completa (ex: substituir())
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+        self._linhas_diario = 0
+        self._usuarios = self._carregar()
+        self._resultados = self._carregar_resultados()
+
+    def _carregar(self):
+        usuarios = {}
+        if self.caminho.exists():
+            with open(self.caminho, "r", encoding="utf-8") as arquivo:
+                usuarios = json.load(arquivo)
+        if self.caminho_diario.exists():
+            with open(self.caminho_diario, "r", encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    self._linhas_diario += 1
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        # Linha incompleta (queda durante a escrita): a próxima gravação compacta
+                        self._compactar = True
+                        continue
+                    usuarios[registro["email"]] = registro["dados"]
+        return usuarios
+
+    def _carregar_resultados(self):
+        resultados = []
+        if self.caminho_resultados.exists():
+            with open(self.caminho_resultados, "r", encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    try:
+                        resultados.append(json.loads(linha))
+                    except ValueError:
+                        continue  # Linha incompleta (queda durante a escrita)
+        return resultados
+
+    # ========================================================================
+    # CONSULTAS (SEM TRAVA)
+    # ========================================================================
+    def obter(self, email):
+        """Retorna uma cópia dos dados do usuário ou None."""
+        dados = self._usuarios.get(email)
+        return dict(dados) if dados is not None else None
+
+    def existe(self, email):
+        return email in self._usuarios
+
+    def todos(self):
+        """Cópia rasa de todos os usuários {email: dados}."""
+        with self._trava:
+            return {email: dict(dados) for email, dados in self._usuarios.items()}
+
+    def __len__(self):
+        return len(self._usuarios)
+
+    def resultados(self, email=None):
+        """
+        Resultados das partidas em ordem de registro.
+
+        Args:
+            email (str, optional): Apenas os deste usuário
+
+        Returns:
+            list[dict]: Registros de novo_resultado()
+        """
+        with self._trava:
+            return [dict(r) for r in self._resultados if email is None or r["email"] == email]
+
+    # ========================================================================
+    # ALTERAÇÕES (WRITE-BEHIND)
+    # ========================================================================
+    def adicionar(self, email, dados):
+        """
+        Cadastra um usuário se o email ainda não existir.
+
+        Args:
+            email (str): Chave do usuário
+            dados (dict): {"nome", "senha", ...}
+
+        Returns:
+            bool: False se o email já estava cadastrado
+        """
+        with self._trava:
+            if email in self._usuarios:
+                return False
+            self._registrar(email, dict(dados))
+        return True
+
+    def atualizar(self, email, **campos):
+        """
+        Altera campos de um usuário existente (ex: senha com novo hash).
+
+        Returns:
+            bool: False se o usuário não existir
+        """
+        with self._trava:
+            atual = self._usuarios.get(email)
+            if atual is None:
+                return False
+            self._registrar(email, dict(atual, **campos))
+        return True
+
+    def substituir(self, usuarios):
+        """Troca todos os usuários (reescrita completa em segundo plano)."""
+        with self._trava:
+            self._usuarios = {email: dict(dados) for email, dados in usuarios.items()}
+            self._pendentes.clear()
+            self._compactar = True
+            self._agendar()
+
+    def registrar_resultado(self, email, pontos, **campos):
+        """
+        Acrescenta o resultado de uma partida (campos de novo_resultado()).
+
+        Returns:
+            dict: Registro gravado
+        """
+        resultado = novo_resultado(email, pontos, **campos)
+        with self._trava:
+            self._resultados.append(resultado)
+            self._resultados_pendentes.append(resultado)
+            self._agendar()
+        return dict(resultado)
+
+    def _registrar(self, email, dados):
+        """Aplica em memória e enfileira para o diário (com a trava adquirida)."""
+        self._usuarios[email] = dados
+        self._pendentes.append((email, dados))
+        self._agendar()
+
+    def _agendar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco_gravacao, name="gravacao-usuarios",
+                                            daemon=True)
+            self._thread.start()
+            atexit.register(self.fechar)
+        self._acordar.set()
+
+    # ========================================================================
+    # GRAVAÇÃO (THREAD EM SEGUNDO PLANO)
+    # ========================================================================
+    def _laco_gravacao(self):
+        while not self._parar.is_set():
+            self._acordar.wait()
+            self._parar.wait(INTERVALO_GRAVACAO_S)  # Junta rajadas de cadastros (fechar() interrompe)
+            self._acordar.clear()
+            try:
+                self._gravar_pendentes()
+            except OSError as e:
+                print(f"Erro ao gravar usuários: {e}")
+                self._acordar.set()  # Pendências foram mantidas: tenta de novo
+
+    def _gravar_pendentes(self):
+        with self._trava_gravacao:
+            with self._trava:
+                pendentes, self._pendentes = self._pendentes, []
+                resultados, self._resultados_pendentes = self._resultados_pendentes, []
+                compactar = self._compactar or self._linhas_diario + len(pendentes) >= LIMITE_DIARIO
+                if compactar:
+                    snapshot = dict(self._usuarios)  # Registros não são alterados in-place
+                    self._compactar = False
+            erro = None
+            try:
+                if compactar:
+                    self._gravar_snapshot(snapshot)
+                elif pendentes:
+                    self.caminho.parent.mkdir(parents=True, exist_ok=True)
+                    with open(self.caminho_diario, "a", encoding="utf-8") as arquivo:
+                        for email, dados in pendentes:
+                            arquivo.write(json.dumps({"email": email, "dados": dados}, ensure_ascii=False) + "\n")
+                        arquivo.flush()
+                        os.fsync(arquivo.fileno())
+                    self._linhas_diario += len(pendentes)
+            except OSError as e:
+                # _usuarios já contém as alterações (e cobre um diário gravado pela metade)
+                with self._trava:
+                    self._compactar = True
+                erro = e
+            if resultados:
+                try:
+                    self._acrescentar_resultados(resultados)
+                except OSError as e:
+                    with self._trava:
+                        self._resultados_pendentes[:0] = resultados  # Antes dos novos: mantém a ordem
+                    erro = erro or e
+            if erro is not None:
+                raise erro
+
+    def _acrescentar_resultados(self, resultados):
+        """Acrescenta ao resultados.jsonl; em erro desfaz o acréscimo parcial (nova tentativa não duplica)."""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        dados = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in resultados).encode("utf-8")
+        with open(self.caminho_resultados, "ab", buffering=0) as arquivo:
+            tamanho = arquivo.seek(0, os.SEEK_END)
+            try:
+                escritos = 0
+                while escritos < len(dados):
+                    escritos += arquivo.write(dados[escritos:])
+                os.fsync(arquivo.fileno())
+            except OSError:
+                os.ftruncate(arquivo.fileno(), tamanho)
+                raise
+
+    def _gravar_snapshot(self, usuarios):
+        """Grava o snapshot completo por troca atômica e zera o diário."""
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.caminho.with_name(self.caminho.name + ".tmp")
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(usuarios, arquivo, ensure_ascii=False, indent=2)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho)
+        # Se cair aqui, o diário é reaplicado sobre um snapshot que já o contém (idempotente)
+        if self.caminho_diario.exists():
+            os.remove(self.caminho_diario)
+        self._linhas_diario = 0
+
+    def flush(self):
+        """Grava agora, na thread chamadora, tudo o que estiver pendente."""
+        self._gravar_pendentes()
+
+    def fechar(self):
+        """Para a thread de gravação e compacta o diário no snapshot."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._parar.set()
+            self._acordar.set()
+            thread.join()
+        with self._trava:
+            self._compactar = self._compactar or self._linhas_diario > 0 or bool(self._pendentes)
+        self._gravar_pendentes()
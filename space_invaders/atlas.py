@@ -0,0 +1,138 @@
+# ============================================================================
+# ATLAS.PY - ATLAS DE SPRITES (DESKTOP E WEB)
+# ============================================================================
+"""
+PROPÓSITO:
+Junta todos os sprites do jogo numa única imagem (atlas), já nos tamanhos
+usados pelo jogo, com o retângulo de cada sprite.
+
+DESKTOP (Jogo):
+- obter_atlas_tela() monta o atlas uma vez por processo, converte para o
+  formato da tela (convert_alpha) e é compartilhado por todas as
+  instâncias de Jogo
+- Cada sprite é uma subsurface do atlas (sem cópia de pixels); blits não
+  pagam conversão de formato de pixel
+- O fundo (opaco, tela inteira) é copiado com convert(), sem alpha
+
+WEB:
+- A mesma imagem é servida em /atlas.png (um único download em vez de um
+  PNG por sprite); os retângulos vão para o template (para_dict())
+
+LAYOUT:
+- Fundo no topo; sprites pequenos numa prateleira logo abaixo, com 1 px
+  de espaço para o filtro do navegador não misturar vizinhos
+"""
+
+import io      # PNG em memória para o webservice
+import pygame  # Superfícies e conversão de formato
+from .utils import LARGURA_TELA, ALTURA_TELA, carregar_sprite
+
+# nome -> (arquivo em static/, largura, altura) - tamanhos usados pelo jogo
+SPRITES = {
+    "fundo": ("background.png", LARGURA_TELA, ALTURA_TELA),
+    "jogador": ("player_ship.png", 50, 30),
+    "inimigo1": ("invader_type1.png", 40, 25),
+    "inimigo2": ("invader_type2.png", 40, 25),
+    "inimigo3": ("invader_type3.png", 40, 25),
+    "tiro_jogador": ("bullet_player.png", 6, 15),
+    "tiro_inimigo": ("bullet_enemy.png", 6, 15),
+    "explosao": ("explosion.png", 32, 32),
+}
+ESPACO = 1  # Pixels livres entre sprites
+
+
+class Atlas:
+    """
+    Imagem única com todos os sprites e seus retângulos.
+
+    ATRIBUTOS:
+    - imagem: pygame.Surface com todos os sprites
+    - rects: nome -> pygame.Rect dentro da imagem
+    """
+
+    def __init__(self, imagem, rects):
+        self.imagem = imagem
+        self.rects = rects
+        self._sprites = {}
+
+    @classmethod
+    def montar(cls, diretorio="static"):
+        """
+        Carrega os PNGs de SPRITES (redimensionados) e os posiciona no atlas.
+
+        Args:
+            diretorio (str|Path): Pasta dos PNGs
+
+        Returns:
+            Atlas: Atlas sem conversão de formato (serve sem janela aberta)
+        """
+        imagens = {nome: carregar_sprite(arquivo, largura, altura, diretorio)
+                   for nome, (arquivo, largura, altura) in SPRITES.items()}
+        rects = {}
+        x = y = altura_prateleira = 0
+        largura_total = max(imagem.get_width() for imagem in imagens.values())
+        # Maiores primeiro: o fundo ocupa a primeira prateleira sozinho
+        for nome in sorted(imagens, key=lambda n: -imagens[n].get_height()):
+            largura, altura = imagens[nome].get_size()
+            if x + largura > largura_total:
+                x, y = 0, y + altura_prateleira + ESPACO
+                altura_prateleira = 0
+            rects[nome] = pygame.Rect(x, y, largura, altura)
+            x += largura + ESPACO
+            altura_prateleira = max(altura_prateleira, altura)
+        imagem = pygame.Surface((largura_total, y + altura_prateleira), pygame.SRCALPHA)
+        for nome, rect in rects.items():
+            imagem.blit(imagens[nome], rect)
+        return cls(imagem, rects)
+
+    def converter(self):
+        """
+        Converte o atlas para o formato da tela (exige pygame.display.set_mode).
+
+        Returns:
+            Atlas: Novo atlas convertido (mesmos retângulos)
+        """
+        return Atlas(self.imagem.convert_alpha(), self.rects)
+
+    def sprite(self, nome):
+        """Subsurface do sprite (compartilha os pixels do atlas)."""
+        sprite = self._sprites.get(nome)
+        if sprite is None:
+            sprite = self.imagem.subsurface(self.rects[nome])
+            self._sprites[nome] = sprite
+        return sprite
+
+    def para_dict(self):
+        """Retângulos para o cliente web: {nome: [x, y, largura, altura]}."""
+        return {nome: [rect.x, rect.y, rect.width, rect.height] for nome, rect in self.rects.items()}
+
+    def png(self):
+        """Atlas codificado em PNG (bytes)."""
+        arquivo = io.BytesIO()
+        pygame.image.save(self.imagem, arquivo, "atlas.png")
+        return arquivo.getvalue()
+
+
+# ============================================================================
+# ATLAS COMPARTILHADO DO DESKTOP
+# ============================================================================
+_atlas_tela = None
+
+
+def obter_atlas_tela():
+    """
+    Atlas convertido para o formato da tela, montado uma vez por processo.
+
+    Raises:
+        pygame.error: Se nenhuma janela foi criada ainda
+    """
+    global _atlas_tela
+    if _atlas_tela is None:
+        _atlas_tela = Atlas.montar().converter()
+    return _atlas_tela
+
+
+def descartar_atlas_tela():
+    """Esquece o atlas convertido (necessário após pygame.quit())."""
+    global _atlas_tela
+    _atlas_tela = None
@@ -12,10 +12,11 @@ PADRÃO DE DESIGN:
 - SEPARAÇÃO: Interface (desktop) separada da lógica (Jogo)
 """
 
+import argparse  # Opções de linha de comando
 import pygame  # Biblioteca de jogos
 from .jogo import Jogo  # Classe controladora principal
 
-def main():
+def main(argv=None):
     """
     FUNÇÃO PRINCIPAL - Inicializa e executa o jogo
 
@@ -28,13 +29,22 @@ def main():
     - INSTANCIAÇÃO: jogo = Jogo() cria novo objeto
     - ENCAPSULAMENTO: Toda lógica está dentro da classe Jogo
     - ABSTRAÇÃO: main() não precisa saber como Jogo funciona
+
+    OPÇÕES:
+    --retangulos-sujos: atualiza na janela só as áreas que mudaram
+                        (mais leve em Linux com renderização por software)
     """
+    parser = argparse.ArgumentParser(description="Space Invaders - versão desktop")
+    parser.add_argument("--retangulos-sujos", action="store_true",
+                        help="Renderização parcial com display.update(rects) em vez de flip()")
+    args = parser.parse_args(argv)
+
     # Inicializa todos os módulos do pygame
     pygame.init()
 
     # INSTANCIAÇÃO: Cria objeto da classe Jogo
     # Demonstra conceito fundamental de POO
-    jogo = Jogo()
+    jogo = Jogo(retangulos_sujos=args.retangulos_sujos)
 
     # Executa o jogo (chama método público)
     # Demonstra ENCAPSULAMENTO: interface simples, complexidade oculta
@@ -0,0 +1 @@
+# AI layer package
\ No newline at end of file
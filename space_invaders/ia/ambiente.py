@@ -0,0 +1,186 @@
+# ============================================================================
+# AMBIENTE.PY - API DE PASSOS PARA AGENTES (FRAME SKIP / ACTION REPEAT)
+# ============================================================================
+"""
+PROPÓSITO:
+Interface de treinamento sobre o JogoHeadless no estilo "ambiente":
+reiniciar() -> observação; passo(ação) -> (observação, recompensa, terminou, info).
+
+FRAME SKIP:
+- Agentes não precisam decidir a cada tick de 30 ms
+- passo(acao, frame_skip=k) aplica a ação e simula k ticks seguidos
+- A recompensa é ACUMULADA nos k ticks
+- Apenas a observação FINAL é codificada (nada de obter_estado()
+  ou codificação nos ticks intermediários) -> ~k vezes mais rápido
+
+AÇÕES:
+Sequência de 5 valores na ordem de ACOES (esquerda, direita, cima, baixo,
+atirar); valores > 0.5 significam "pressionado". Mudanças são enviadas
+por processar_comando(), o mesmo caminho das entradas web (e dos replays).
+"""
+
+import numpy as np  # Buffers de observação, recompensa e término
+from ..jogo_headless import JogoHeadless
+from ..utils import ESTADO_JOGANDO
+from .observacao import ACOES, VetorCaracteristicas
+
+
+# ============================================================================
+# CLASSE AMBIENTEJOGO - UM JOGO
+# ============================================================================
+class AmbienteJogo:
+    """
+    Ambiente de um único JogoHeadless.
+
+    ATRIBUTOS:
+    - jogo: JogoHeadless do episódio atual
+    - codificador: Codificador de observação (padrão VetorCaracteristicas)
+    - frame_skip: Ticks simulados por passo (padrão)
+    """
+
+    def __init__(self, codificador=None, frame_skip=1, penalidade_vida=0.0, max_ticks=None):
+        """
+        Args:
+            codificador (CodificadorObservacao, optional): Codificador com max_jogos >= 1
+            frame_skip (int): Ticks por passo quando passo() não informa outro valor
+            penalidade_vida (float): Valor subtraído da recompensa por vida perdida
+            max_ticks (int, optional): Limite de ticks por episódio (None = sem limite)
+        """
+        self.codificador = codificador if codificador is not None else VetorCaracteristicas(1)
+        self.frame_skip = frame_skip
+        self.penalidade_vida = penalidade_vida
+        self.max_ticks = max_ticks
+        self.jogo = None
+        self._obs = self.codificador.criar_buffer(1)
+        self._pressionados = [False] * len(ACOES)
+
+    def reiniciar(self, semente=None):
+        """
+        Começa um novo episódio (jogo novo, já no estado de jogo).
+
+        Um JogoHeadless novo garante relógio zerado: mesma semente
+        e mesmas ações => mesmo episódio.
+
+        Args:
+            semente (int, optional): Semente do episódio
+
+        Returns:
+            np.ndarray: Observação inicial (view do buffer interno)
+        """
+        self._novo_jogo(semente)
+        self.codificador.codificar((self.jogo,), self._obs)
+        return self._obs[0]
+
+    def _novo_jogo(self, semente):
+        """Cria o JogoHeadless do episódio e zera as teclas pressionadas."""
+        self.jogo = JogoHeadless(semente=semente)
+        self.jogo.iniciar_partida()
+        self._pressionados = [False] * len(ACOES)
+        return self.jogo
+
+    def aplicar_acao(self, acao):
+        """Envia ao jogo apenas os comandos que mudaram desde o último passo."""
+        for i, comando in enumerate(ACOES):
+            pressionado = acao[i] > 0.5
+            if pressionado != self._pressionados[i]:
+                self._pressionados[i] = pressionado
+                self.jogo.processar_comando(comando, "pressionar" if pressionado else "soltar")
+
+    def passo(self, acao, frame_skip=None):
+        """
+        Aplica a ação e simula frame_skip ticks.
+
+        Args:
+            acao (sequence[float]): 5 valores na ordem de ACOES
+            frame_skip (int, optional): Ticks deste passo (padrão: self.frame_skip)
+
+        Returns:
+            tuple: (observação, recompensa acumulada, terminou, info)
+        """
+        recompensa, terminou = self._simular(acao, self.frame_skip if frame_skip is None else frame_skip)
+        jogo = self.jogo
+        self.codificador.codificar((jogo,), self._obs)
+        info = {"pontos": jogo.pontuacao.pontos, "vidas": jogo.pontuacao.vidas_jogador, "tick": jogo.tick}
+        return self._obs[0], recompensa, terminou, info
+
+    def _simular(self, acao, k):
+        """Aplica a ação, avança k ticks e retorna (recompensa acumulada, terminou)."""
+        jogo = self.jogo
+        pontos = jogo.pontuacao.pontos
+        vidas = jogo.pontuacao.vidas_jogador
+        self.aplicar_acao(acao)
+        jogo.avancar(k)
+        # Recompensa acumulada nos k ticks (pontos só crescem dentro da partida)
+        recompensa = (jogo.pontuacao.pontos - pontos
+                      - self.penalidade_vida * (vidas - jogo.pontuacao.vidas_jogador))
+        terminou = jogo.estado != ESTADO_JOGANDO
+        if self.max_ticks is not None and jogo.tick >= self.max_ticks:
+            terminou = True
+        return recompensa, terminou
+
+
+# ============================================================================
+# CLASSE AMBIENTELOTE - VÁRIOS JOGOS EM PARALELO (MESMO PROCESSO)
+# ============================================================================
+class AmbienteLote:
+    """
+    N jogos avançados juntos; observações codificadas em lote (vetorizado).
+
+    Jogos terminados deixam de ser simulados até o próximo reiniciar().
+    Os arrays retornados são buffers internos reutilizados a cada passo.
+    """
+
+    def __init__(self, n_jogos, codificador=None, frame_skip=1, penalidade_vida=0.0, max_ticks=None):
+        """
+        Args:
+            n_jogos (int): Número de jogos simultâneos
+            codificador (CodificadorObservacao, optional): Codificador com max_jogos >= n_jogos
+            frame_skip (int): Ticks por passo (padrão)
+            penalidade_vida (float): Valor subtraído por vida perdida
+            max_ticks (int, optional): Limite de ticks por episódio
+        """
+        self.n_jogos = n_jogos
+        self.codificador = codificador if codificador is not None else VetorCaracteristicas(n_jogos)
+        self.ambientes = [AmbienteJogo(self.codificador, frame_skip, penalidade_vida, max_ticks)
+                          for _ in range(n_jogos)]
+        self.frame_skip = frame_skip
+        self.jogos = [None] * n_jogos
+        self._obs = self.codificador.criar_buffer(n_jogos)
+        self._recompensas = np.zeros(n_jogos, dtype=np.float32)
+        self._terminados = np.zeros(n_jogos, dtype=bool)
+
+    def reiniciar(self, sementes):
+        """
+        Reinicia todos os jogos.
+
+        Args:
+            sementes (sequence[int]): Uma semente por jogo
+
+        Returns:
+            np.ndarray: Observações (n_jogos, *forma)
+        """
+        for i, ambiente in enumerate(self.ambientes):
+            self.jogos[i] = ambiente._novo_jogo(sementes[i])
+        self._terminados.fill(False)
+        self.codificador.codificar(self.jogos, self._obs)
+        return self._obs
+
+    def passo(self, acoes, frame_skip=None):
+        """
+        Aplica uma ação por jogo e simula frame_skip ticks em cada jogo ativo.
+
+        Args:
+            acoes (np.ndarray): (n_jogos, 5) com valores na ordem de ACOES
+            frame_skip (int, optional): Ticks deste passo
+
+        Returns:
+            tuple: (observações, recompensas, terminados) - buffers internos
+        """
+        k = self.frame_skip if frame_skip is None else frame_skip
+        self._recompensas.fill(0.0)
+        for i, ambiente in enumerate(self.ambientes):
+            if self._terminados[i]:
+                continue
+            self._recompensas[i], self._terminados[i] = ambiente._simular(acoes[i], k)
+        self.codificador.codificar(self.jogos, self._obs)
+        return self._obs, self._recompensas, self._terminados
@@ -0,0 +1,123 @@
+# ============================================================================
+# CHECKPOINT.PY - FORMATO COMPACTO DE POLÍTICA (CARREGAMENTO POR MMAP)
+# ============================================================================
+"""
+PROPÓSITO:
+Arquivo de política (.sipol) pronto para ser mapeado em memória: todos
+os workers web que carregam o mesmo arquivo compartilham UMA cópia dos
+pesos no page cache, e carregar é praticamente instantâneo.
+
+FORMATO (little-endian):
+- b"SIPL" + tamanho do cabeçalho (u32)
+- Cabeçalho JSON (UTF-8), completado com espaços até múltiplo de 64 bytes:
+  {"versao", "configIA": {"layers", "neuronios"}, "arquitetura",
+   "dtype": "<f4", "deslocamento", "n_parametros", "hash", ...metadados}
+- Parâmetros float32 a partir de "deslocamento" (alinhado em 64 bytes),
+  no layout de RedeNeural.de_vetor (W e b de cada camada)
+
+"hash" é o SHA-256 dos bytes dos parâmetros (identifica a política).
+"""
+
+import hashlib  # Identificador da política
+import json     # Cabeçalho legível
+import os       # Troca atômica do arquivo
+import struct   # Prefixo binário
+from pathlib import Path
+import numpy as np
+from .rede import RedeNeural, ENTRADAS_PADRAO, SAIDAS_PADRAO
+
+MAGICO_POLITICA = b"SIPL"
+VERSAO_POLITICA = 1
+ALINHAMENTO = 64
+EXTENSAO_POLITICA = ".sipol"
+
+
+def _config_ia(arquitetura):
+    """configIA do overlay correspondente à arquitetura (None se não for uniforme)."""
+    ocultas = arquitetura[1:-1]
+    if (arquitetura[0] != ENTRADAS_PADRAO or arquitetura[-1] != SAIDAS_PADRAO
+            or not ocultas or len(set(ocultas)) != 1):
+        return None
+    return {"layers": len(ocultas), "neuronios": ocultas[0]}
+
+
+def salvar_politica(caminho, rede, **metadados):
+    """
+    Grava a rede no formato .sipol (troca atômica: leitores nunca veem arquivo parcial).
+
+    Args:
+        caminho (str|Path): Destino do arquivo
+        rede (RedeNeural): Política a salvar
+        **metadados: Campos extras do cabeçalho (ex: geracao, aptidao)
+
+    Returns:
+        dict: Cabeçalho gravado
+    """
+    caminho = Path(caminho)
+    parametros = rede.vetor_parametros().astype("<f4", copy=False)
+    dados = parametros.tobytes()
+    cabecalho = dict(metadados)
+    cabecalho.update({
+        "versao": VERSAO_POLITICA,
+        "configIA": _config_ia(rede.arquitetura),
+        "arquitetura": [int(n) for n in rede.arquitetura],
+        "dtype": "<f4",
+        "n_parametros": int(parametros.size),
+        "hash": hashlib.sha256(dados).hexdigest(),
+        "deslocamento": 0,
+    })
+    # O deslocamento faz parte do JSON: recalcula até estabilizar (no máximo 2 passadas)
+    while True:
+        texto = json.dumps(cabecalho).encode("utf-8")
+        prefixo = len(MAGICO_POLITICA) + 4
+        deslocamento = -(-(prefixo + len(texto)) // ALINHAMENTO) * ALINHAMENTO
+        if deslocamento == cabecalho["deslocamento"]:
+            break
+        cabecalho["deslocamento"] = deslocamento
+    texto = texto.ljust(deslocamento - prefixo, b" ")
+
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(MAGICO_POLITICA + struct.pack("<I", len(texto)) + texto + dados)
+    os.replace(temporario, caminho)
+    return cabecalho
+
+
+def ler_cabecalho(caminho):
+    """
+    Lê apenas o cabeçalho JSON de um arquivo .sipol.
+
+    Raises:
+        ValueError: Se o arquivo não for uma política válida
+    """
+    with open(caminho, "rb") as arquivo:
+        prefixo = arquivo.read(len(MAGICO_POLITICA) + 4)
+        if len(prefixo) < len(MAGICO_POLITICA) + 4 or not prefixo.startswith(MAGICO_POLITICA):
+            raise ValueError(f"{caminho} não é uma política do Space Invaders")
+        (tamanho,) = struct.unpack("<I", prefixo[len(MAGICO_POLITICA):])
+        cabecalho = json.loads(arquivo.read(tamanho).decode("utf-8"))
+    if cabecalho.get("versao") != VERSAO_POLITICA:
+        raise ValueError(f"Versão de política não suportada: {cabecalho.get('versao')}")
+    return cabecalho
+
+
+def carregar_politica(caminho):
+    """
+    Carrega a política mapeando os pesos em memória (somente leitura, sem cópia).
+
+    Args:
+        caminho (str|Path): Arquivo .sipol
+
+    Returns:
+        tuple: (RedeNeural com pesos em np.memmap, cabeçalho)
+    """
+    cabecalho = ler_cabecalho(caminho)
+    parametros = np.memmap(caminho, dtype=cabecalho["dtype"], mode="r",
+                           offset=cabecalho["deslocamento"], shape=(cabecalho["n_parametros"],))
+    return RedeNeural.de_vetor(parametros, cabecalho["arquitetura"]), cabecalho
+
+
+def nome_politica(camadas, neuronios):
+    """Nome padrão do arquivo da política de uma arquitetura do overlay."""
+    return f"politica_{camadas}x{neuronios}{EXTENSAO_POLITICA}"
@@ -0,0 +1,211 @@
+# ============================================================================
+# INFERENCIA.PY - SERVIÇO DE INFERÊNCIA EM MICRO-LOTES
+# ============================================================================
+"""
+PROPÓSITO:
+Controla todos os JogoHeadless no modo "JOGAR COM IA" com UMA passada
+em lote da rede por tick, em vez de uma passada pequena por sessão.
+
+FLUXO POR TICK:
+1. O game loop chama tick() após atualizar os jogos
+2. A thread de inferência coleta as observações de TODAS as sessões
+   (codificação vetorizada), faz um matmul por camada e distribui as
+   ações via processar_comando() (mesmo caminho das entradas web)
+3. Sessões com redes diferentes formam grupos (um lote por rede)
+
+LIMITE DE LATÊNCIA:
+- tick() espera no máximo prazo_ms pelo lote
+- Se o lote atrasar, o tick segue; as ações são aplicadas assim que
+  o lote terminar (valem para o próximo tick)
+- Se a thread ainda estiver ocupada, o tick não enfileira outro lote:
+  o jogo nunca acumula atraso por causa da IA
+"""
+
+import threading  # Thread dedicada à inferência
+import time       # Medição de duração dos lotes
+from .observacao import ACOES, VetorCaracteristicas
+
+
+# ============================================================================
+# CLASSE GRUPOPOLITICA - SESSÕES QUE COMPARTILHAM A MESMA REDE
+# ============================================================================
+class GrupoPolitica:
+    """Sessões controladas pela mesma RedeNeural (um lote por tick)."""
+
+    def __init__(self, rede, max_sessoes):
+        self.rede = rede
+        self.jogos = []
+        self.codificador = VetorCaracteristicas(max_sessoes)
+        self.observacoes = self.codificador.criar_buffer(max_sessoes)
+
+    def executar(self, trava=None, sessoes=None):
+        """
+        Codifica, infere e aplica as ações de todas as sessões do grupo.
+
+        Args:
+            trava (threading.Lock, optional): Trava do serviço; as ações são
+                aplicadas com ela adquirida
+            sessoes (dict, optional): id(jogo) -> grupo; sessões removidas
+                durante a inferência não recebem as ações deste lote
+        """
+        jogos = self.jogos
+        n = len(jogos)
+        if n == 0:
+            return 0
+        obs = self.observacoes[:n]
+        self.codificador.codificar(jogos, obs)
+        saidas = self.rede.inferir(obs)
+        if trava is None:
+            self._aplicar(jogos, saidas, sessoes)
+        else:
+            # Mesma trava de remover(): ou a remoção acontece antes (e o jogo é
+            # pulado) ou depois (e solta as teclas que este lote pressionou)
+            with trava:
+                self._aplicar(jogos, saidas, sessoes)
+        return n
+
+    def _aplicar(self, jogos, saidas, sessoes):
+        for i, jogo in enumerate(jogos):
+            if sessoes is not None and sessoes.get(id(jogo)) is not self:
+                continue  # Devolvido ao controle humano (ou a outra rede) durante o lote
+            linha = saidas[i]
+            ativos = jogo.comandos_ativos
+            for k, comando in enumerate(ACOES):
+                desejado = bool(linha[k] > 0.5)
+                # Só envia o que mudou; a decisão da IA prevalece sobre o estado atual
+                if ativos[comando] != desejado:
+                    jogo.processar_comando(comando, "pressionar" if desejado else "soltar")
+
+
+# ============================================================================
+# CLASSE SERVICOINFERENCIA - THREAD DE INFERÊNCIA COM PRAZO
+# ============================================================================
+class ServicoInferencia:
+    """
+    Serviço em processo que agrupa as sessões de IA por rede.
+
+    ATRIBUTOS:
+    - prazo_ms: Tempo máximo que tick() espera pelo lote
+    - estatisticas: Contadores para monitoramento
+    """
+
+    def __init__(self, max_sessoes=256, prazo_ms=5.0):
+        """
+        Args:
+            max_sessoes (int): Capacidade de sessões por rede
+            prazo_ms (float): Espera máxima do game loop por lote
+        """
+        self.max_sessoes = max_sessoes
+        self.prazo_ms = prazo_ms
+        self._grupos = {}    # id(rede) -> GrupoPolitica
+        self._sessoes = {}   # id(jogo) -> GrupoPolitica
+        self._trava = threading.Lock()
+        self._pedido = threading.Event()
+        self._concluido = threading.Event()
+        self._concluido.set()
+        self._thread = None
+        self._rodando = False
+        self.estatisticas = {
+            "lotes": 0,
+            "lotes_atrasados": 0,     # Passaram do prazo (ações no tick seguinte)
+            "ticks_sem_lote": 0,      # Thread ocupada: tick não enfileirou lote
+            "sessoes_ultimo_lote": 0,
+            "ms_ultimo_lote": 0.0,
+        }
+
+    # ========================================================================
+    # REGISTRO DE SESSÕES
+    # ========================================================================
+    def registrar(self, jogo, rede):
+        """
+        Passa o jogo para controle da rede informada.
+
+        Raises:
+            ValueError: Se o grupo da rede já estiver na capacidade máxima
+        """
+        with self._trava:
+            self._remover(jogo)
+            grupo = self._grupos.get(id(rede))
+            if grupo is None:
+                grupo = self._grupos[id(rede)] = GrupoPolitica(rede, self.max_sessoes)
+            if len(grupo.jogos) >= self.max_sessoes:
+                raise ValueError(f"Limite de {self.max_sessoes} sessões de IA por rede atingido")
+            # Nova lista: a thread de inferência pode estar iterando a antiga
+            grupo.jogos = grupo.jogos + [jogo]
+            self._sessoes[id(jogo)] = grupo
+
+    def remover(self, jogo):
+        """Devolve o jogo ao controle humano (ignora se não registrado)."""
+        with self._trava:
+            self._remover(jogo)
+
+    def _remover(self, jogo):
+        grupo = self._sessoes.pop(id(jogo), None)
+        if grupo is None:
+            return
+        grupo.jogos = [j for j in grupo.jogos if j is not jogo]
+        if not grupo.jogos:
+            del self._grupos[id(grupo.rede)]
+        # Solta as teclas que a IA deixou pressionadas (via comando: fica no replay)
+        for comando in ACOES:
+            if jogo.comandos_ativos[comando]:
+                jogo.processar_comando(comando, "soltar")
+
+    def controlado(self, jogo):
+        """Retorna True se o jogo está sob controle da IA."""
+        return id(jogo) in self._sessoes
+
+    # ========================================================================
+    # EXECUÇÃO
+    # ========================================================================
+    def executar_lote(self):
+        """Executa um lote síncrono para todos os grupos; retorna nº de sessões."""
+        inicio = time.perf_counter()
+        with self._trava:
+            grupos = list(self._grupos.values())
+        total = sum(grupo.executar(self._trava, self._sessoes) for grupo in grupos)
+        self.estatisticas["lotes"] += 1
+        self.estatisticas["sessoes_ultimo_lote"] = total
+        self.estatisticas["ms_ultimo_lote"] = (time.perf_counter() - inicio) * 1000
+        return total
+
+    def tick(self):
+        """
+        Dispara o lote deste tick e espera no máximo prazo_ms.
+
+        Chamado pelo game loop; nunca bloqueia além do prazo.
+        """
+        if not self._sessoes:
+            return
+        self._iniciar_thread()
+        if not self._concluido.is_set():
+            self.estatisticas["ticks_sem_lote"] += 1
+            return
+        self._concluido.clear()
+        self._pedido.set()
+        if not self._concluido.wait(self.prazo_ms / 1000):
+            self.estatisticas["lotes_atrasados"] += 1
+
+    def _iniciar_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._rodando = True
+            self._thread = threading.Thread(target=self._loop, name="inferencia-ia", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while self._rodando:
+            self._pedido.wait()
+            self._pedido.clear()
+            if not self._rodando:
+                break
+            try:
+                self.executar_lote()
+            except Exception as e:
+                print(f"Erro no lote de inferência: {e}")
+            finally:
+                self._concluido.set()
+
+    def parar(self):
+        """Encerra a thread de inferência."""
+        self._rodando = False
+        self._pedido.set()
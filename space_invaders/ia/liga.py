@@ -0,0 +1,235 @@
+# ============================================================================
+# LIGA.PY - LIGA DE AVALIAÇÃO DAS POLÍTICAS TREINADAS
+# ============================================================================
+"""
+PROPÓSITO:
+Compara todas as políticas .sipol de uma pasta no MESMO conjunto de
+cenários (sementes fixas de ondas) e produz uma tabela de classificação.
+
+EFICIÊNCIA:
+- Jogos headless em avanço rápido (frame skip, sem renderização)
+- Avaliações distribuídas num pool de processos (uma tarefa por política,
+  com todos os cenários pendentes dela jogados em lote)
+- Cache em JSON por (hash da política, semente): só políticas novas ou
+  alteradas são avaliadas; o hash vem do cabeçalho .sipol
+- Mudar frame skip ou limite de ticks invalida o cache
+
+USO:
+    python -m space_invaders.ia.liga checkpoints --cenarios 16
+"""
+
+import argparse         # Linha de comando
+import json             # Cache de resultados
+import multiprocessing  # Pool de processos
+import os               # Núcleos e troca atômica do cache
+import time             # Vazão
+from pathlib import Path
+import numpy as np
+from ..utils import derivar_semente
+from .ambiente import AmbienteLote
+from .checkpoint import EXTENSAO_POLITICA, carregar_politica, ler_cabecalho
+
+ARQUIVO_CACHE = "liga_cache.json"
+
+
+# ============================================================================
+# AVALIAÇÃO (EXECUTADA NOS PROCESSOS TRABALHADORES)
+# ============================================================================
+def jogar_cenarios(rede, sementes, frame_skip=4, max_ticks=3000):
+    """
+    Joga um episódio por semente, em lote, e retorna o resultado de cada um.
+
+    Returns:
+        list[dict]: {"pontos", "ticks", "vidas"} na ordem das sementes
+    """
+    lote = AmbienteLote(len(sementes), frame_skip=frame_skip, max_ticks=max_ticks)
+    obs = lote.reiniciar(sementes)
+    terminados = np.zeros(lote.n_jogos, dtype=bool)
+    while not terminados.all():
+        obs, _, terminados = lote.passo(rede.inferir(obs))
+    return [{"pontos": jogo.pontuacao.pontos, "ticks": jogo.tick,
+             "vidas": jogo.pontuacao.vidas_jogador} for jogo in lote.jogos]
+
+
+def _avaliar_politica(tarefa):
+    """Tarefa do pool: (caminho, hash, sementes, frame_skip, max_ticks) -> (hash, resultados)."""
+    caminho, hash_politica, sementes, frame_skip, max_ticks = tarefa
+    rede, _ = carregar_politica(caminho)
+    return hash_politica, dict(zip(sementes, jogar_cenarios(rede, sementes, frame_skip, max_ticks)))
+
+
+# ============================================================================
+# CLASSE LIGA
+# ============================================================================
+class Liga:
+    """
+    Avalia políticas em cenários fixos, com cache por (hash, semente).
+
+    ATRIBUTOS:
+    - pasta: Pasta com os arquivos .sipol (busca recursiva)
+    - sementes: Cenários da liga
+    - resultados: {hash: {semente: {"pontos", "ticks", "vidas"}}}
+    """
+
+    def __init__(self, pasta, cenarios=16, semente=0, frame_skip=4, max_ticks=3000,
+                 processos=None, arquivo_cache=None):
+        """
+        Args:
+            pasta (str|Path): Pasta das políticas
+            cenarios (int): Número de cenários (sementes) da liga
+            semente (int): Semente base dos cenários
+            frame_skip (int): Ticks por decisão da rede
+            max_ticks (int): Limite de ticks por episódio
+            processos (int, optional): Trabalhadores (None = núcleos; 1 = sem pool)
+            arquivo_cache (str|Path, optional): Padrão: pasta/liga_cache.json
+        """
+        self.pasta = Path(pasta)
+        self.sementes = [derivar_semente(semente, i) for i in range(cenarios)]
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.processos = processos or os.cpu_count() or 1
+        self.arquivo_cache = Path(arquivo_cache) if arquivo_cache else self.pasta / ARQUIVO_CACHE
+        self.resultados = self._carregar_cache()
+
+    def _parametros(self):
+        return {"frame_skip": self.frame_skip, "max_ticks": self.max_ticks}
+
+    def _carregar_cache(self):
+        """Lê o cache (chaves de semente como texto no JSON); descarta se os parâmetros mudaram."""
+        if not self.arquivo_cache.exists():
+            return {}
+        try:
+            cache = json.loads(self.arquivo_cache.read_text(encoding="utf-8"))
+        except ValueError as e:
+            print(f"Cache da liga ignorado ({e})")
+            return {}
+        if cache.get("parametros") != self._parametros():
+            return {}
+        return {h: {int(s): r for s, r in por_semente.items()}
+                for h, por_semente in cache.get("resultados", {}).items()}
+
+    def _salvar_cache(self):
+        self.arquivo_cache.parent.mkdir(parents=True, exist_ok=True)
+        temporario = self.arquivo_cache.with_name(self.arquivo_cache.name + ".tmp")
+        temporario.write_text(json.dumps({"parametros": self._parametros(),
+                                          "resultados": self.resultados}), encoding="utf-8")
+        os.replace(temporario, self.arquivo_cache)
+
+    def politicas(self):
+        """
+        Lista as políticas da pasta.
+
+        Returns:
+            list[tuple]: (caminho, cabeçalho) ordenado por caminho; arquivos inválidos são ignorados
+        """
+        encontradas = []
+        for caminho in sorted(self.pasta.rglob(f"*{EXTENSAO_POLITICA}")):
+            try:
+                encontradas.append((caminho, ler_cabecalho(caminho)))
+            except (OSError, ValueError) as e:
+                print(f"Política ignorada {caminho}: {e}")
+        return encontradas
+
+    def executar(self):
+        """
+        Avalia apenas os pares (política, cenário) ausentes do cache.
+
+        Returns:
+            list[dict]: Tabela de classificação (ver classificacao())
+        """
+        politicas = self.politicas()
+        tarefas = []
+        for caminho, cabecalho in politicas:
+            conhecidos = self.resultados.get(cabecalho["hash"], {})
+            pendentes = [s for s in self.sementes if s not in conhecidos]
+            if pendentes:
+                tarefas.append((str(caminho), cabecalho["hash"], pendentes, self.frame_skip, self.max_ticks))
+
+        if tarefas:
+            inicio = time.perf_counter()
+            if self.processos <= 1 or len(tarefas) == 1:
+                concluidas = map(_avaliar_politica, tarefas)
+                pool = None
+            else:
+                pool = multiprocessing.Pool(min(self.processos, len(tarefas)))
+                concluidas = pool.imap_unordered(_avaliar_politica, tarefas)
+            try:
+                for hash_politica, por_semente in concluidas:
+                    self.resultados.setdefault(hash_politica, {}).update(por_semente)
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            self._salvar_cache()
+            n_episodios = sum(len(t[2]) for t in tarefas)
+            duracao = time.perf_counter() - inicio
+            print(f"{len(tarefas)} políticas avaliadas: {n_episodios} episódios em {duracao:.1f}s "
+                  f"({n_episodios / duracao:.1f} episódios/s)")
+        else:
+            print("Nenhuma política nova ou alterada: usando apenas o cache")
+        return self.classificacao(politicas)
+
+    def classificacao(self, politicas=None):
+        """
+        Monta a tabela ordenada pela média de pontos nos cenários da liga.
+
+        "vitorias" conta os cenários em que a política fez a maior pontuação
+        (empates contam para todas as empatadas).
+        """
+        politicas = self.politicas() if politicas is None else politicas
+        linhas = []
+        for caminho, cabecalho in politicas:
+            por_semente = self.resultados.get(cabecalho["hash"], {})
+            pontos = [por_semente[s]["pontos"] for s in self.sementes if s in por_semente]
+            if len(pontos) != len(self.sementes):
+                continue
+            linhas.append({
+                "politica": str(caminho.relative_to(self.pasta)),
+                "hash": cabecalho["hash"],
+                "configIA": cabecalho.get("configIA"),
+                "media": float(np.mean(pontos)),
+                "minimo": min(pontos),
+                "maximo": max(pontos),
+                "vitorias": 0,
+                "_pontos": pontos,
+            })
+        for i in range(len(self.sementes)):
+            melhor = max((linha["_pontos"][i] for linha in linhas), default=None)
+            for linha in linhas:
+                if linha["_pontos"][i] == melhor:
+                    linha["vitorias"] += 1
+        for linha in linhas:
+            del linha["_pontos"]
+        linhas.sort(key=lambda linha: (-linha["media"], -linha["vitorias"], linha["politica"]))
+        return linhas
+
+
+def formatar_tabela(linhas):
+    """Tabela de classificação em texto."""
+    saida = [f"{'#':>3}  {'POLÍTICA':<40} {'CONFIG':>8} {'MÉDIA':>9} {'MÍN':>6} {'MÁX':>6} {'VIT':>4}  HASH"]
+    for posicao, linha in enumerate(linhas, 1):
+        config = linha["configIA"]
+        config = f"{config['layers']}x{config['neuronios']}" if config else "-"
+        saida.append(f"{posicao:>3}  {linha['politica']:<40} {config:>8} {linha['media']:>9.1f} "
+                     f"{linha['minimo']:>6} {linha['maximo']:>6} {linha['vitorias']:>4}  {linha['hash'][:12]}")
+    return "\n".join(saida)
+
+
+def main(argv=None):
+    """FERRAMENTA DE LINHA DE COMANDO - Classifica as políticas de uma pasta."""
+    parser = argparse.ArgumentParser(description="Liga de avaliação das políticas .sipol")
+    parser.add_argument("pasta", nargs="?", default="checkpoints")
+    parser.add_argument("--cenarios", type=int, default=16)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--frame-skip", type=int, default=4)
+    parser.add_argument("--max-ticks", type=int, default=3000)
+    parser.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    liga = Liga(args.pasta, args.cenarios, args.semente, args.frame_skip, args.max_ticks, args.processos)
+    print(formatar_tabela(liga.executar()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,372 @@
+# ============================================================================
+# MEMORIA.PY - MEMÓRIA DE REPLAY (EXPERIÊNCIAS) EM ARQUIVOS MAPEADOS
+# ============================================================================
+"""
+PROPÓSITO:
+Armazena transições (obs, ação, recompensa, próxima obs, terminou) para
+treino off-policy contra o JogoHeadless, com tamanho FIXO em disco.
+
+ARMAZENAMENTO:
+- Uma pasta com um arquivo np.memmap por campo, pré-alocados na criação
+- Buffer circular: ao encher, as transições mais antigas são sobrescritas
+- Capacidade limitada pelo disco, não pela RAM (o SO pagina sob demanda)
+- meta.json descreve capacidade e formas (outros processos abrem pela pasta)
+
+CONCORRÊNCIA:
+- Vários processos de coleta chamam adicionar_lote(): a reserva de
+  posições é feita sob trava de arquivo (curta); a escrita dos dados
+  acontece fora da trava
+- Um processo de aprendizado abre a mesma pasta e lê direto do page
+  cache (sem cópias entre processos)
+- A prioridade de uma posição é zerada antes da escrita e gravada por
+  último: posições com prioridade 0 nunca são amostradas (prioridades
+  informadas precisam ser > 0)
+
+AMOSTRAGEM (vetorizada, custo O(k log capacidade) - independe do tamanho):
+- amostrar(k): uniforme em [0, n); só as raras posições em escrita são
+  sorteadas de novo
+- amostrar(k, alfa=0.6, beta=0.4): proporcional à prioridade^alfa,
+  com pesos de importância (n * P(i))^-beta normalizados
+- Prioridade^alfa fica numa árvore de somas (arvore.bin, também mapeada
+  e compartilhada entre processos), atualizada a cada escrita de
+  prioridade; por isso alfa é fixado na criação da memória
+"""
+
+import json       # Metadados da memória
+from pathlib import Path
+import numpy as np
+from .observacao import ACOES
+
+try:
+    import fcntl  # POSIX
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+VERSAO_MEMORIA = 1
+ALFA_PADRAO = 0.6
+RODADAS_UNIFORME = 64  # Sorteios de posições em escrita antes de listar as concluídas
+CONTROLE_DTYPE = np.dtype([("escritos", "<i8"), ("prioridade_max", "<f8")])
+
+
+class _TravaArquivo:
+    """Trava exclusiva entre processos baseada em arquivo."""
+
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "a+b")
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.arquivo.fileno(), fcntl.LOCK_EX)
+        else:
+            self.arquivo.seek(0)
+            msvcrt.locking(self.arquivo.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.arquivo.fileno(), fcntl.LOCK_UN)
+        else:
+            self.arquivo.seek(0)
+            msvcrt.locking(self.arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def fechar(self):
+        self.arquivo.close()
+
+
+# ============================================================================
+# CLASSE MEMORIAREPLAY - BUFFER CIRCULAR EM NP.MEMMAP
+# ============================================================================
+class MemoriaReplay:
+    """
+    Memória de replay com buffer circular em arquivos mapeados.
+
+    ATRIBUTOS (arrays np.memmap com capacidade linhas):
+    - observacoes, proximas: float32 (capacidade, *forma_obs)
+    - acoes: uint8 (capacidade, n_acoes) - 1 = pressionado
+    - recompensas: float32 (capacidade,)
+    - terminados: bool (capacidade,)
+    - prioridades: float32 (capacidade,) - 0 = posição vazia/em escrita
+    - alfa: Expoente da amostragem priorizada (fixo por memória)
+    """
+
+    def __init__(self, pasta, capacidade=None, forma_obs=None, n_acoes=len(ACOES), alfa=None):
+        """
+        Abre a memória da pasta ou cria uma nova se a pasta não tiver meta.json.
+
+        Args:
+            pasta (str|Path): Pasta dos arquivos da memória
+            capacidade (int, optional): Número de transições (obrigatório ao criar)
+            forma_obs (tuple, optional): Forma de uma observação (obrigatório ao criar)
+            n_acoes (int): Número de ações (padrão: 5, ACOES)
+            alfa (float, optional): Expoente da amostragem priorizada (padrão: 0.6)
+
+        Raises:
+            ValueError: Se faltar capacidade/forma ao criar, ou se não baterem
+                        com uma memória existente
+        """
+        self.pasta = Path(pasta)
+        caminho_meta = self.pasta / "meta.json"
+        if caminho_meta.exists():
+            meta = json.loads(caminho_meta.read_text(encoding="utf-8"))
+            if meta.get("versao") != VERSAO_MEMORIA:
+                raise ValueError(f"Versão de memória não suportada: {meta.get('versao')}")
+            if capacidade is not None and capacidade != meta["capacidade"]:
+                raise ValueError(f"Memória existente tem capacidade {meta['capacidade']}, não {capacidade}")
+            if forma_obs is not None and tuple(forma_obs) != tuple(meta["forma_obs"]):
+                raise ValueError(f"Memória existente tem observações {tuple(meta['forma_obs'])}")
+            if alfa is not None and alfa != meta.get("alfa", ALFA_PADRAO):
+                raise ValueError(f"Memória existente tem alfa {meta.get('alfa', ALFA_PADRAO)}")
+            modo = "r+"
+        else:
+            if capacidade is None or forma_obs is None:
+                raise ValueError("Para criar a memória informe capacidade e forma_obs")
+            meta = {"versao": VERSAO_MEMORIA, "capacidade": int(capacidade),
+                    "forma_obs": [int(d) for d in forma_obs], "n_acoes": int(n_acoes),
+                    "alfa": ALFA_PADRAO if alfa is None else float(alfa)}
+            self.pasta.mkdir(parents=True, exist_ok=True)
+            modo = "w+"
+
+        self.capacidade = meta["capacidade"]
+        self.forma_obs = tuple(meta["forma_obs"])
+        self.n_acoes = meta["n_acoes"]
+        self.alfa = meta.get("alfa", ALFA_PADRAO)
+        # Árvore de somas: folhas em [folhas, folhas + capacidade), raiz em 1
+        self._folhas = 1 << max(0, (self.capacidade - 1).bit_length())
+        self._profundidade = self._folhas.bit_length() - 1
+        self.trava = _TravaArquivo(self.pasta / "trava")
+        with self.trava:
+            # Se outro processo criou a memória enquanto esperávamos, apenas abre
+            if modo == "w+" and caminho_meta.exists():
+                modo = "r+"
+            self.observacoes = self._mapear("observacoes", np.float32, self.forma_obs, modo)
+            self.proximas = self._mapear("proximas", np.float32, self.forma_obs, modo)
+            self.acoes = self._mapear("acoes", np.uint8, (self.n_acoes,), modo)
+            self.recompensas = self._mapear("recompensas", np.float32, (), modo)
+            self.terminados = self._mapear("terminados", np.bool_, (), modo)
+            self.prioridades = self._mapear("prioridades", np.float32, (), modo)
+            self._controle = np.memmap(self.pasta / "controle.bin", dtype=CONTROLE_DTYPE,
+                                       mode=modo, shape=(1,))
+            caminho_arvore = self.pasta / "arvore.bin"
+            construir = modo == "w+" or not caminho_arvore.exists()  # Memória anterior à árvore
+            self._arvore = np.memmap(caminho_arvore, dtype=np.float64,
+                                     mode="w+" if construir else "r+", shape=(2 * self._folhas,))
+            if construir and modo == "r+":
+                self._atualizar_arvore(np.arange(self.capacidade),
+                                       np.power(self.prioridades, self.alfa, dtype=np.float64))
+            if modo == "w+":
+                self._controle[0] = (0, 1.0)
+                self._controle.flush()
+                # meta.json por último: sua existência indica memória pronta
+                caminho_meta.write_text(json.dumps(meta), encoding="utf-8")
+
+    def _mapear(self, nome, dtype, forma, modo):
+        return np.memmap(self.pasta / f"{nome}.bin", dtype=dtype, mode=modo,
+                         shape=(self.capacidade,) + tuple(forma))
+
+    def _definir_prioridades(self, posicoes, prioridades):
+        """Grava prioridades e as folhas da árvore (com a trava adquirida)."""
+        self.prioridades[posicoes] = prioridades
+        self._atualizar_arvore(posicoes, np.power(self.prioridades[posicoes], self.alfa, dtype=np.float64))
+
+    def _atualizar_arvore(self, posicoes, valores):
+        """Troca folhas e recalcula só os ancestrais delas: O(k log capacidade)."""
+        arvore = self._arvore
+        nos = np.asarray(posicoes, dtype=np.int64) + self._folhas
+        arvore[nos] = valores
+        for _ in range(self._profundidade):
+            nos = np.unique(nos >> 1)
+            arvore[nos] = arvore[2 * nos] + arvore[2 * nos + 1]
+
+    # ========================================================================
+    # ESCRITA
+    # ========================================================================
+    @property
+    def escritos(self):
+        """Total de transições já reservadas (inclui as sobrescritas)."""
+        return int(self._controle["escritos"][0])
+
+    def __len__(self):
+        return min(self.escritos, self.capacidade)
+
+    def adicionar_lote(self, observacoes, acoes, recompensas, proximas, terminados, prioridades=None):
+        """
+        Acrescenta k transições (sobrescrevendo as mais antigas se cheia).
+
+        Args:
+            observacoes (np.ndarray): (k, *forma_obs)
+            acoes (np.ndarray): (k, n_acoes), valores > 0.5 = pressionado
+            recompensas (np.ndarray): (k,)
+            proximas (np.ndarray): (k, *forma_obs)
+            terminados (np.ndarray): (k,)
+            prioridades (np.ndarray, optional): (k,) > 0; padrão: maior prioridade já vista
+
+        Com k > capacidade só as últimas `capacidade` transições são gravadas
+        (as anteriores seriam sobrescritas pelo próprio lote).
+
+        Returns:
+            np.ndarray: Posições (índices) onde as transições foram gravadas
+
+        Raises:
+            ValueError: Se alguma prioridade não for positiva (0 marca posição em escrita)
+        """
+        k = len(recompensas)
+        if prioridades is not None and np.any(np.asarray(prioridades) <= 0):
+            raise ValueError("Prioridades devem ser > 0")
+        descartadas = max(0, k - self.capacidade)
+        if descartadas:
+            observacoes, acoes, recompensas, proximas, terminados = (
+                np.asarray(campo)[descartadas:]
+                for campo in (observacoes, acoes, recompensas, proximas, terminados))
+            if prioridades is not None:
+                prioridades = np.asarray(prioridades)[descartadas:]
+        with self.trava:
+            inicio = self.escritos
+            self._controle["escritos"][0] = inicio + k
+            prioridade_max = float(self._controle["prioridade_max"][0])
+            posicoes = (inicio + descartadas + np.arange(k - descartadas)) % self.capacidade
+            self._definir_prioridades(posicoes, 0.0)  # Em escrita: não amostrar
+        self.observacoes[posicoes] = observacoes
+        self.proximas[posicoes] = proximas
+        self.acoes[posicoes] = np.asarray(acoes) > 0.5
+        self.recompensas[posicoes] = recompensas
+        self.terminados[posicoes] = terminados
+        with self.trava:
+            self._definir_prioridades(posicoes, prioridade_max if prioridades is None else prioridades)
+        return posicoes
+
+    def adicionar(self, observacao, acao, recompensa, proxima, terminou):
+        """Acrescenta uma transição (atalho para adicionar_lote)."""
+        return self.adicionar_lote(observacao[None], np.asarray(acao)[None], (recompensa,),
+                                   proxima[None], (terminou,))[0]
+
+    def atualizar_prioridades(self, indices, erros, epsilon=1e-3):
+        """
+        Define prioridades a partir dos erros TD das transições amostradas.
+
+        Args:
+            indices (np.ndarray): Posições retornadas por amostrar()
+            erros (np.ndarray): Erro de cada transição (usa o valor absoluto)
+            epsilon (float): Mínimo somado para nenhuma transição ficar com prioridade 0
+
+        Raises:
+            ValueError: Se epsilon não for positivo
+        """
+        if epsilon <= 0:
+            raise ValueError("epsilon deve ser > 0 (prioridade 0 marca posição em escrita)")
+        prioridades = np.abs(erros).astype(np.float32) + np.float32(epsilon)
+        indices = np.asarray(indices)
+        maior = float(prioridades.max())
+        with self.trava:
+            # Posição sobrescrita desde a amostragem e ainda em escrita: continua fora da amostragem
+            em_escrita = self.prioridades[indices] == 0
+            self._definir_prioridades(indices[~em_escrita], prioridades[~em_escrita])
+            if maior > self._controle["prioridade_max"][0]:
+                self._controle["prioridade_max"][0] = maior
+
+    # ========================================================================
+    # LEITURA
+    # ========================================================================
+    def criar_lote(self, k):
+        """Buffers de saída reutilizáveis para amostrar(k, saida=...)."""
+        return {
+            "observacoes": np.empty((k,) + self.forma_obs, dtype=np.float32),
+            "acoes": np.empty((k, self.n_acoes), dtype=np.uint8),
+            "recompensas": np.empty(k, dtype=np.float32),
+            "proximas": np.empty((k,) + self.forma_obs, dtype=np.float32),
+            "terminados": np.empty(k, dtype=np.bool_),
+            "indices": np.empty(k, dtype=np.int64),
+            "pesos": np.empty(k, dtype=np.float32),
+        }
+
+    def amostrar(self, k, rng=None, alfa=None, beta=0.4, saida=None):
+        """
+        Amostra k transições.
+
+        Args:
+            k (int): Tamanho do lote
+            rng (np.random.Generator, optional): Gerador (reprodutibilidade)
+            alfa (float, optional): None = uniforme; senão prioridade^alfa
+                                    (precisa ser o alfa da memória)
+            beta (float): Expoente dos pesos de importância (apenas priorizada)
+            saida (dict, optional): Buffers de criar_lote(k) (evita alocação)
+
+        Returns:
+            dict: observacoes, acoes, recompensas, proximas, terminados,
+                  indices e pesos (1.0 na amostragem uniforme)
+
+        Raises:
+            ValueError: Se a memória estiver vazia (ou só com posições em escrita),
+                        ou se alfa for diferente do alfa da memória
+        """
+        if alfa is not None and alfa != self.alfa:
+            raise ValueError(f"Esta memória amostra com alfa={self.alfa} (fixado na criação)")
+        rng = rng if rng is not None else np.random.default_rng()
+        n = len(self)
+        if n == 0:
+            raise ValueError("Memória de replay vazia")
+        saida = saida if saida is not None else self.criar_lote(k)
+        indices = saida["indices"]
+
+        if alfa is None:
+            if self._arvore[1] <= 0:  # Raiz = soma de todas as prioridades^alfa
+                raise ValueError("Memória de replay sem transições concluídas")
+            indices[:] = rng.integers(0, n, k)
+            # Posições em escrita (prioridade 0) são sorteadas de novo
+            for _ in range(RODADAS_UNIFORME):
+                pendentes = np.flatnonzero(self.prioridades[indices] == 0)
+                if len(pendentes) == 0:
+                    break
+                indices[pendentes] = rng.integers(0, n, len(pendentes))
+            else:
+                # Quase tudo em escrita (raro): sorteia entre as concluídas, O(n)
+                concluidas = np.flatnonzero(self.prioridades[:n])
+                if len(concluidas) == 0:
+                    raise ValueError("Memória de replay sem transições concluídas")
+                indices[pendentes] = concluidas[rng.integers(0, len(concluidas), len(pendentes))]
+            saida["pesos"].fill(1.0)
+        else:
+            with self.trava:  # Árvore consistente durante a descida
+                total = float(self._arvore[1])
+                if total <= 0:
+                    raise ValueError("Memória de replay sem transições concluídas")
+                indices[:] = self._descer(rng.random(k) * total)
+                # Arredondamento pode cair numa folha vazia: sorteia essas de novo
+                for _ in range(RODADAS_UNIFORME):
+                    vazias = np.flatnonzero(self._arvore[indices + self._folhas] <= 0)
+                    if len(vazias) == 0:
+                        break
+                    indices[vazias] = self._descer(rng.random(len(vazias)) * total)
+                probabilidades = self._arvore[indices + self._folhas] / total
+            pesos = np.power(n * probabilidades, -beta)
+            saida["pesos"][:] = pesos / pesos.max()
+
+        np.take(self.observacoes, indices, axis=0, out=saida["observacoes"])
+        np.take(self.acoes, indices, axis=0, out=saida["acoes"])
+        np.take(self.recompensas, indices, out=saida["recompensas"])
+        np.take(self.proximas, indices, axis=0, out=saida["proximas"])
+        np.take(self.terminados, indices, out=saida["terminados"])
+        return saida
+
+    def _descer(self, valores):
+        """Folha de cada valor acumulado (descida vetorizada na árvore de somas)."""
+        arvore = self._arvore
+        nos = np.ones(len(valores), dtype=np.int64)
+        for _ in range(self._profundidade):
+            esquerda = 2 * nos
+            soma_esquerda = arvore[esquerda]
+            direita = valores >= soma_esquerda
+            valores = valores - soma_esquerda * direita
+            nos = esquerda + direita
+        return np.minimum(nos - self._folhas, self.capacidade - 1)
+
+    def flush(self):
+        """Força a gravação das páginas alteradas em disco."""
+        for array in (self.observacoes, self.proximas, self.acoes, self.recompensas,
+                      self.terminados, self.prioridades, self._arvore, self._controle):
+            array.flush()
+
+    def fechar(self):
+        """Grava pendências e libera a trava de arquivo."""
+        self.flush()
+        self.trava.fechar()
@@ -0,0 +1,462 @@
+# ============================================================================
+# OBSERVACAO.PY - CODIFICADORES DE OBSERVAÇÃO PARA AGENTES
+# ============================================================================
+"""
+PROPÓSITO:
+Transforma o estado de um ou vários JogoHeadless em arrays NumPy prontos
+para a camada de entrada de uma rede neural (modo "JOGAR COM IA").
+
+CODIFICADORES DISPONÍVEIS:
+- VetorCaracteristicas: vetor fixo de 8 valores (entrada do configIA)
+- GradeOcupacao: grade reduzida com canais de inimigos, tiros e jogador
+- RaiosJogador: distâncias ao longo de raios partindo da nave
+
+DESEMPENHO:
+- Todos os buffers NumPy são PRÉ-ALOCADOS no construtor (max_jogos)
+- codificar() escreve no array do chamador (saida) usando out=
+- Nenhum array NumPy é alocado por tick; apenas a coleta das entidades
+  (leitura das properties dos objetos Dados) passa pelo interpretador
+- O cálculo é VETORIZADO sobre todos os jogos do lote de uma vez
+
+USO:
+    codificador = VetorCaracteristicas(max_jogos=64)
+    obs = codificador.criar_buffer(len(jogos))
+    codificador.codificar(jogos, obs)   # a cada tick, sem alocação
+"""
+
+import numpy as np  # Arrays pré-alocados e operações vetorizadas
+from ..utils import LARGURA_TELA, ALTURA_TELA
+
+# ============================================================================
+# CONSTANTES - CAPACIDADE DOS BUFFERS DE ENTIDADES
+# ============================================================================
+MAX_INIMIGOS = 24           # Formação completa: 3 linhas x 8 colunas
+MAX_TIROS_INIMIGO = 5       # Mesmo limite de JogoHeadless.max_tiros_inimigos
+MAX_TIROS_JOGADOR = 32      # Cooldown de 200 ms limita a ~15 tiros em tela
+DIAGONAL_TELA = float(np.hypot(LARGURA_TELA, ALTURA_TELA))
+
+# Ações de saída da rede (mesma ordem em todo o pacote ia)
+ACOES = ("esquerda", "direita", "cima", "baixo", "atirar")
+
+
+# ============================================================================
+# CLASSE BASE - COLETA DE ENTIDADES EM BUFFERS PRÉ-ALOCADOS
+# ============================================================================
+class CodificadorObservacao:
+    """
+    Classe base dos codificadores.
+
+    RESPONSABILIDADE:
+    - Pré-alocar buffers de entidades para até max_jogos jogos
+    - Copiar posições das entidades de cada jogo para esses buffers
+    - Subclasses implementam codificar() sobre os buffers (vetorizado)
+
+    ATRIBUTOS:
+    - forma: Forma da observação de UM jogo (tupla)
+    - max_jogos: Capacidade do lote
+    """
+
+    forma = ()
+
+    def __init__(self, max_jogos=1):
+        """
+        Args:
+            max_jogos (int): Número máximo de jogos codificados por chamada
+        """
+        self.max_jogos = max_jogos
+        # Retângulos (x, y, largura, altura) por jogo
+        self._jogador = np.zeros((max_jogos, 4), dtype=np.float32)
+        self._inimigos = np.zeros((max_jogos, MAX_INIMIGOS, 4), dtype=np.float32)
+        self._tiros_inimigo = np.zeros((max_jogos, MAX_TIROS_INIMIGO, 4), dtype=np.float32)
+        self._tiros_jogador = np.zeros((max_jogos, MAX_TIROS_JOGADOR, 4), dtype=np.float32)
+        # Quantidade de entidades válidas por jogo
+        self._n_inimigos = np.zeros(max_jogos, dtype=np.intp)
+        self._n_tiros_inimigo = np.zeros(max_jogos, dtype=np.intp)
+        self._n_tiros_jogador = np.zeros(max_jogos, dtype=np.intp)
+        self._tiro_pronto = np.zeros(max_jogos, dtype=np.float32)
+
+    @property
+    def tamanho(self):
+        """Número de valores da observação de um jogo."""
+        return int(np.prod(self.forma))
+
+    def criar_buffer(self, n_jogos=None):
+        """
+        Cria o array de saída (uma vez, fora do loop de ticks).
+
+        Args:
+            n_jogos (int, optional): Tamanho do lote (padrão: max_jogos)
+
+        Returns:
+            np.ndarray: float32 com forma (n_jogos, *forma)
+        """
+        n = self.max_jogos if n_jogos is None else n_jogos
+        return np.zeros((n,) + tuple(self.forma), dtype=np.float32)
+
+    def coletar(self, jogos):
+        """
+        Copia as entidades dos jogos para os buffers internos.
+
+        Args:
+            jogos (sequence[JogoHeadless]): Lote de jogos
+
+        Returns:
+            int: Número de jogos coletados
+
+        Raises:
+            ValueError: Se o lote for maior que max_jogos
+        """
+        n = len(jogos)
+        if n > self.max_jogos:
+            raise ValueError(f"Lote com {n} jogos excede max_jogos={self.max_jogos}")
+        for i, jogo in enumerate(jogos):
+            with jogo.trava:
+                j = jogo.jogador
+                linha = self._jogador[i]
+                linha[0] = j.x
+                linha[1] = j.y
+                linha[2] = j.largura
+                linha[3] = j.altura
+                self._n_inimigos[i] = self._copiar_retangulos(jogo.inimigos, self._inimigos[i])
+                self._n_tiros_inimigo[i] = self._copiar_retangulos(jogo.projeteis_inimigo, self._tiros_inimigo[i])
+                self._n_tiros_jogador[i] = self._copiar_retangulos(jogo.projeteis_jogador, self._tiros_jogador[i])
+                self._tiro_pronto[i] = jogo.tempo_ms - jogo.tempo_ultimo_tiro > jogo.intervalo_tiro
+        return n
+
+    @staticmethod
+    def _copiar_retangulos(entidades, destino):
+        """Copia (x, y, largura, altura) das entidades; retorna quantas couberam."""
+        n = min(len(entidades), len(destino))
+        for k in range(n):
+            e = entidades[k]
+            linha = destino[k]
+            linha[0] = e.x
+            linha[1] = e.y
+            linha[2] = e.largura
+            linha[3] = e.altura
+        return n
+
+    def codificar(self, jogos, saida):
+        """
+        Escreve a observação de cada jogo em saida[i].
+
+        Args:
+            jogos (sequence[JogoHeadless]): Lote de jogos
+            saida (np.ndarray): Buffer (len(jogos), *forma) criado por criar_buffer()
+
+        Returns:
+            np.ndarray: O próprio buffer saida
+        """
+        raise NotImplementedError
+
+    def codificar_um(self, jogo, saida=None):
+        """
+        Atalho para um único jogo.
+
+        Args:
+            jogo (JogoHeadless): Jogo a codificar
+            saida (np.ndarray, optional): Buffer com forma self.forma
+
+        Returns:
+            np.ndarray: Observação com forma self.forma
+        """
+        if saida is None:
+            saida = np.zeros(self.forma, dtype=np.float32)
+        self.codificar((jogo,), saida[np.newaxis])
+        return saida
+
+
+# ============================================================================
+# VETOR DE CARACTERÍSTICAS - ENTRADA DA REDE DO OVERLAY (8 VALORES)
+# ============================================================================
+class VetorCaracteristicas(CodificadorObservacao):
+    """
+    Vetor fixo de 8 características normalizadas:
+
+    0-1: centro do jogador (x / largura da tela, y / altura da tela)
+    2-3: deslocamento (dx, dy) até o inimigo mais próximo
+    4-5: deslocamento (dx, dy) até o tiro inimigo mais próximo (0, 1 se não houver)
+    6:   fração de inimigos restantes na formação
+    7:   1 se o tiro do jogador está disponível (cooldown expirado)
+    """
+
+    forma = (8,)
+
+    def __init__(self, max_jogos=1):
+        super().__init__(max_jogos)
+        n = max_jogos
+        self._centro = np.zeros((n, 2), dtype=np.float32)
+        self._indices = np.zeros(n, dtype=np.intp)
+        self._base_linha = np.arange(n, dtype=np.intp)
+        self._plano = np.zeros(n, dtype=np.intp)
+        self._coluna = np.zeros(n, dtype=np.float32)
+        self._vazio = np.zeros(n, dtype=bool)
+        self._escala = np.array([LARGURA_TELA, ALTURA_TELA], dtype=np.float32)
+        # Scratch por tipo de entidade: dx, dy, distância e máscara de inválidos
+        self._scratch = {}
+        for nome, capacidade in (("inimigos", MAX_INIMIGOS), ("tiros", MAX_TIROS_INIMIGO)):
+            self._scratch[nome] = (
+                np.zeros((n, capacidade), dtype=np.float32),
+                np.zeros((n, capacidade), dtype=np.float32),
+                np.zeros((n, capacidade), dtype=np.float32),
+                np.zeros((n, capacidade), dtype=bool),
+                np.arange(capacidade, dtype=np.intp),
+            )
+
+    def codificar(self, jogos, saida):
+        n = self.coletar(jogos)
+        if n == 0:
+            return saida
+        jogador = self._jogador[:n]
+        centro = self._centro[:n]
+        # Centro do jogador
+        np.multiply(jogador[:, 2:4], 0.5, out=centro)
+        np.add(centro, jogador[:, 0:2], out=centro)
+        np.divide(centro, self._escala, out=saida[:, 0:2])
+
+        self._mais_proximo(n, "inimigos", self._inimigos, self._n_inimigos, saida[:, 2:4])
+        self._mais_proximo(n, "tiros", self._tiros_inimigo, self._n_tiros_inimigo, saida[:, 4:6])
+
+        np.divide(self._n_inimigos[:n], MAX_INIMIGOS, out=saida[:, 6], casting="unsafe")
+        saida[:, 7] = self._tiro_pronto[:n]
+        return saida
+
+    def _mais_proximo(self, n, nome, retangulos, contagens, destino):
+        """Escreve em destino (n, 2) o (dx, dy) normalizado até a entidade mais próxima."""
+        dx, dy, dist, invalido, posicoes = self._scratch[nome]
+        dx, dy, dist, invalido = dx[:n], dy[:n], dist[:n], invalido[:n]
+        capacidade = dx.shape[1]
+        centro = self._centro[:n]
+        ret = retangulos[:n]
+        # dx = (x + largura/2) - centro_x
+        np.multiply(ret[:, :, 2], 0.5, out=dx)
+        np.add(dx, ret[:, :, 0], out=dx)
+        np.subtract(dx, centro[:, 0:1], out=dx)
+        np.multiply(ret[:, :, 3], 0.5, out=dy)
+        np.add(dy, ret[:, :, 1], out=dy)
+        np.subtract(dy, centro[:, 1:2], out=dy)
+        np.hypot(dx, dy, out=dist)
+        # Entidades além da contagem não participam do argmin
+        np.greater_equal(posicoes, contagens[:n, np.newaxis], out=invalido)
+        np.copyto(dist, np.inf, where=invalido)
+        indices = self._indices[:n]
+        np.argmin(dist, axis=1, out=indices)
+        plano = self._plano[:n]
+        np.multiply(self._base_linha[:n], capacidade, out=plano)
+        np.add(plano, indices, out=plano)
+        coluna = self._coluna[:n]
+        vazio = self._vazio[:n]
+        np.equal(contagens[:n], 0, out=vazio)
+        for eixo, (valores, padrao) in enumerate(((dx, 0.0), (dy, 1.0))):
+            np.take(valores.reshape(-1), plano, out=coluna)
+            np.divide(coluna, self._escala[eixo], out=destino[:, eixo])
+            np.copyto(destino[:, eixo], padrao, where=vazio)
+
+
+# ============================================================================
+# GRADE DE OCUPAÇÃO - VISÃO REDUZIDA DA TELA
+# ============================================================================
+class GradeOcupacao(CodificadorObservacao):
+    """
+    Grade (canais, linhas, colunas) com 1.0 nas células ocupadas.
+
+    CANAIS:
+    0: inimigos | 1: tiros inimigos | 2: tiros do jogador | 3: jogador
+
+    Cada entidade marca a célula que contém seu centro.
+    """
+
+    CANAIS = 4
+
+    def __init__(self, max_jogos=1, tamanho_celula=40):
+        """
+        Args:
+            max_jogos (int): Capacidade do lote
+            tamanho_celula (int): Lado da célula em pixels (padrão 40 -> 15 x 20)
+        """
+        super().__init__(max_jogos)
+        self.tamanho_celula = tamanho_celula
+        self.linhas = -(-ALTURA_TELA // tamanho_celula)
+        self.colunas = -(-LARGURA_TELA // tamanho_celula)
+        self.forma = (self.CANAIS, self.linhas, self.colunas)
+        n = max_jogos
+        celulas_por_jogo = self.CANAIS * self.linhas * self.colunas
+        # Última posição é um "descarte" para entidades inválidas
+        self._grade = np.zeros(n * celulas_por_jogo + 1, dtype=np.float32)
+        self._descarte = n * celulas_por_jogo
+        # Scratch por canal com capacidade da maior lista
+        self._canais = []
+        for canal, (retangulos, contagens) in enumerate((
+                (self._inimigos, self._n_inimigos),
+                (self._tiros_inimigo, self._n_tiros_inimigo),
+                (self._tiros_jogador, self._n_tiros_jogador),
+                (self._jogador[:, np.newaxis, :], None))):
+            capacidade = retangulos.shape[1]
+            self._canais.append((
+                canal, retangulos, contagens,
+                np.zeros((n, capacidade), dtype=np.float32),   # coordenada temporária
+                np.zeros((n, capacidade), dtype=np.intp),      # linha
+                np.zeros((n, capacidade), dtype=np.intp),      # índice plano
+                np.zeros((n, capacidade), dtype=bool),         # inválido
+                np.arange(capacidade, dtype=np.intp),
+                (np.arange(n, dtype=np.intp) * celulas_por_jogo + canal * self.linhas * self.colunas)[:, np.newaxis],
+            ))
+
+    def codificar(self, jogos, saida):
+        n = self.coletar(jogos)
+        if n == 0:
+            return saida
+        celulas = self.CANAIS * self.linhas * self.colunas
+        grade = self._grade[:n * celulas]
+        grade.fill(0.0)
+        for canal, retangulos, contagens, coord, linha, plano, invalido, posicoes, base in self._canais:
+            ret = retangulos[:n]
+            coord, linha, plano, invalido = coord[:n], linha[:n], plano[:n], invalido[:n]
+            # Linha da célula: (y + altura/2) // tamanho_celula, limitada à grade
+            np.multiply(ret[:, :, 3], 0.5, out=coord)
+            np.add(coord, ret[:, :, 1], out=coord)
+            np.floor_divide(coord, self.tamanho_celula, out=coord)
+            np.clip(coord, 0, self.linhas - 1, out=coord)
+            np.copyto(linha, coord, casting="unsafe")
+            # Coluna da célula
+            np.multiply(ret[:, :, 2], 0.5, out=coord)
+            np.add(coord, ret[:, :, 0], out=coord)
+            np.floor_divide(coord, self.tamanho_celula, out=coord)
+            np.clip(coord, 0, self.colunas - 1, out=coord)
+            np.copyto(plano, coord, casting="unsafe")
+            # Índice plano = base do jogo/canal + linha * colunas + coluna
+            np.multiply(linha, self.colunas, out=linha)
+            np.add(plano, linha, out=plano)
+            np.add(plano, base[:n], out=plano)
+            if contagens is not None:
+                np.greater_equal(posicoes, contagens[:n, np.newaxis], out=invalido)
+                np.copyto(plano, self._descarte, where=invalido)
+            self._grade[plano] = 1.0
+        np.copyto(saida, grade.reshape((n,) + self.forma))
+        return saida
+
+
+# ============================================================================
+# RAIOS A PARTIR DA NAVE - SENSORES DE DISTÂNCIA
+# ============================================================================
+class RaiosJogador(CodificadorObservacao):
+    """
+    Lança n_raios a partir do centro da nave e mede a distância até o
+    primeiro inimigo (canal 0) e o primeiro tiro inimigo (canal 1).
+
+    Saída (n_raios, 2) com distância / alcance, limitada a 1.0
+    (1.0 = nada no caminho). O raio 0 aponta para cima; os demais
+    seguem no sentido horário.
+    """
+
+    def __init__(self, max_jogos=1, n_raios=8, alcance=DIAGONAL_TELA):
+        """
+        Args:
+            max_jogos (int): Capacidade do lote
+            n_raios (int): Número de raios distribuídos em 360 graus
+            alcance (float): Distância máxima medida em pixels
+        """
+        super().__init__(max_jogos)
+        self.n_raios = n_raios
+        self.alcance = float(alcance)
+        self.forma = (n_raios, 2)
+        angulos = np.arange(n_raios) * (2 * np.pi / n_raios)
+        direcao_x = np.sin(angulos)
+        direcao_y = -np.cos(angulos)
+        # Inverso da direção (componentes nulas viram um valor enorme com sinal)
+        minimo = 1e-9
+        self._inv_x = (1.0 / np.where(np.abs(direcao_x) < minimo, minimo, direcao_x)).astype(np.float32)[np.newaxis, :, np.newaxis]
+        self._inv_y = (1.0 / np.where(np.abs(direcao_y) < minimo, minimo, direcao_y)).astype(np.float32)[np.newaxis, :, np.newaxis]
+        n = max_jogos
+        capacidade = max(MAX_INIMIGOS, MAX_TIROS_INIMIGO)
+        forma_scratch = (n, n_raios, capacidade)
+        self._t = [np.zeros(forma_scratch, dtype=np.float32) for _ in range(4)]
+        self._tmin = np.zeros(forma_scratch, dtype=np.float32)
+        self._tmax = np.zeros(forma_scratch, dtype=np.float32)
+        self._miss = np.zeros(forma_scratch, dtype=bool)
+        self._borda = np.zeros((n, 1, capacidade), dtype=np.float32)
+        self._invalido = np.zeros((n, capacidade), dtype=bool)
+        self._posicoes = np.arange(capacidade, dtype=np.intp)
+        self._origem = np.zeros((n, 2), dtype=np.float32)
+        self._menor = np.zeros((n, n_raios), dtype=np.float32)
+
+    def codificar(self, jogos, saida):
+        n = self.coletar(jogos)
+        if n == 0:
+            return saida
+        origem = self._origem[:n]
+        np.multiply(self._jogador[:n, 2:4], 0.5, out=origem)
+        np.add(origem, self._jogador[:n, 0:2], out=origem)
+        for canal, (retangulos, contagens) in enumerate((
+                (self._inimigos, self._n_inimigos),
+                (self._tiros_inimigo, self._n_tiros_inimigo))):
+            self._distancias(n, retangulos[:n], contagens[:n], saida[:, :, canal])
+        return saida
+
+    def _distancias(self, n, ret, contagens, destino):
+        """Interseção raio x retângulo (método das faixas) para todo o lote."""
+        capacidade = ret.shape[1]
+        t1, t2, t3, t4 = (t[:n, :, :capacidade] for t in self._t)
+        tmin = self._tmin[:n, :, :capacidade]
+        tmax = self._tmax[:n, :, :capacidade]
+        miss = self._miss[:n, :, :capacidade]
+        borda = self._borda[:n, :, :capacidade]
+        origem = self._origem[:n]
+        # Faixa em X: t = (borda - origem_x) / direcao_x
+        np.subtract(ret[:, np.newaxis, :, 0], origem[:, 0, np.newaxis, np.newaxis], out=borda)
+        np.multiply(borda, self._inv_x, out=t1)
+        np.add(ret[:, np.newaxis, :, 0], ret[:, np.newaxis, :, 2], out=borda)
+        np.subtract(borda, origem[:, 0, np.newaxis, np.newaxis], out=borda)
+        np.multiply(borda, self._inv_x, out=t2)
+        # Faixa em Y
+        np.subtract(ret[:, np.newaxis, :, 1], origem[:, 1, np.newaxis, np.newaxis], out=borda)
+        np.multiply(borda, self._inv_y, out=t3)
+        np.add(ret[:, np.newaxis, :, 1], ret[:, np.newaxis, :, 3], out=borda)
+        np.subtract(borda, origem[:, 1, np.newaxis, np.newaxis], out=borda)
+        np.multiply(borda, self._inv_y, out=t4)
+        # tmin = max(min(t1, t2), min(t3, t4)); tmax = min(max(t1, t2), max(t3, t4))
+        np.minimum(t1, t2, out=tmin)
+        np.maximum(t1, t2, out=tmax)
+        np.minimum(t3, t4, out=t1)
+        np.maximum(t3, t4, out=t2)
+        np.maximum(tmin, t1, out=tmin)
+        np.minimum(tmax, t2, out=tmax)
+        # Entrada atrás da origem conta a partir de 0 (origem dentro do retângulo)
+        np.maximum(tmin, 0.0, out=tmin)
+        # Sem interseção: tmax < tmin; entidade inválida: além da contagem
+        np.less(tmax, tmin, out=miss)
+        np.copyto(tmin, np.inf, where=miss)
+        invalido = self._invalido[:n, :capacidade]
+        np.greater_equal(self._posicoes[:capacidade], contagens[:, np.newaxis], out=invalido)
+        np.copyto(tmin, np.inf, where=invalido[:, np.newaxis, :])
+        menor = self._menor[:n]
+        np.min(tmin, axis=2, out=menor)
+        np.divide(menor, self.alcance, out=menor)
+        np.minimum(menor, 1.0, out=destino)
+
+
+# ============================================================================
+# REGISTRO DE CODIFICADORES (PLUGÁVEIS)
+# ============================================================================
+CODIFICADORES = {
+    "vetor": VetorCaracteristicas,
+    "grade": GradeOcupacao,
+    "raios": RaiosJogador,
+}
+
+
+def criar_codificador(nome, max_jogos=1, **opcoes):
+    """
+    Cria um codificador pelo nome registrado em CODIFICADORES.
+
+    Args:
+        nome (str): "vetor", "grade" ou "raios"
+        max_jogos (int): Capacidade do lote
+        **opcoes: Parâmetros extras do codificador (ex: n_raios=16)
+
+    Raises:
+        ValueError: Se o nome não estiver registrado
+    """
+    if nome not in CODIFICADORES:
+        raise ValueError(f"Codificador desconhecido: {nome!r} (opções: {', '.join(CODIFICADORES)})")
+    return CODIFICADORES[nome](max_jogos=max_jogos, **opcoes)
@@ -0,0 +1,179 @@
+# ============================================================================
+# REDE.PY - REDE NEURAL (MLP) DA POLÍTICA DO MODO "JOGAR COM IA"
+# ============================================================================
+"""
+PROPÓSITO:
+Perceptron multicamadas com a mesma arquitetura configurada no overlay
+web (configIA): entrada -> [neurônios] x camadas ocultas -> saída.
+
+ARQUITETURA PADRÃO:
+- Entrada: 8 (VetorCaracteristicas)
+- Camadas ocultas: 1 a 10, com 8 a 256 neurônios, ativação tanh
+- Saída: 5 (ACOES), ativação sigmoide (> 0.5 = pressionar)
+
+DESEMPENHO:
+- Pesos em float32
+- inferir() processa um LOTE inteiro com um matmul por camada
+- Buffers de ativação são reutilizados (alocados uma vez por capacidade)
+"""
+
+import numpy as np  # Álgebra linear vetorizada
+from .observacao import ACOES, VetorCaracteristicas
+
+# Limites do overlay configIA (templates/index.html)
+MIN_CAMADAS, MAX_CAMADAS = 1, 10
+MIN_NEURONIOS, MAX_NEURONIOS = 8, 256
+ENTRADAS_PADRAO = VetorCaracteristicas.forma[0]
+SAIDAS_PADRAO = len(ACOES)
+
+
+def tamanho_genoma(arquitetura):
+    """Número de parâmetros (pesos + vieses) de uma arquitetura."""
+    return sum(a * b + b for a, b in zip(arquitetura[:-1], arquitetura[1:]))
+
+
+def arquitetura_overlay(camadas, neuronios):
+    """Arquitetura completa a partir do configIA: [8] + [neuronios] * camadas + [5]."""
+    return [ENTRADAS_PADRAO] + [neuronios] * camadas + [SAIDAS_PADRAO]
+
+
+# ============================================================================
+# CLASSE REDENEURAL - MLP COM INFERÊNCIA EM LOTE
+# ============================================================================
+class RedeNeural:
+    """
+    MLP com camadas densas (pesos W: entrada x saída, vieses b).
+
+    ATRIBUTOS:
+    - pesos: Lista de matrizes float32
+    - vieses: Lista de vetores float32
+    - arquitetura: Tamanhos das camadas, ex: [8, 16, 16, 5]
+    """
+
+    def __init__(self, pesos, vieses):
+        """
+        Args:
+            pesos (list[np.ndarray]): Matrizes (n_entrada, n_saida) de cada camada
+            vieses (list[np.ndarray]): Vetores (n_saida,) de cada camada
+
+        Raises:
+            ValueError: Se as dimensões das camadas não encadearem
+        """
+        if len(pesos) != len(vieses) or not pesos:
+            raise ValueError("Rede precisa de pelo menos uma camada com pesos e vieses")
+        for i, (w, b) in enumerate(zip(pesos, vieses)):
+            if w.ndim != 2 or b.shape != (w.shape[1],):
+                raise ValueError(f"Camada {i}: pesos {w.shape} incompatíveis com vieses {b.shape}")
+            if i > 0 and pesos[i - 1].shape[1] != w.shape[0]:
+                raise ValueError(f"Camada {i}: entrada {w.shape[0]} != saída anterior {pesos[i - 1].shape[1]}")
+        self.pesos = [np.asarray(w, dtype=np.float32) for w in pesos]
+        self.vieses = [np.asarray(b, dtype=np.float32) for b in vieses]
+        self.arquitetura = [self.pesos[0].shape[0]] + [w.shape[1] for w in self.pesos]
+        self._capacidade = 0
+        self._ativacoes = []
+
+    @classmethod
+    def aleatoria(cls, camadas_ocultas=2, neuronios=16, entradas=ENTRADAS_PADRAO,
+                  saidas=SAIDAS_PADRAO, semente=None):
+        """
+        Cria rede com pesos aleatórios (inicialização Xavier/Glorot).
+
+        Args:
+            camadas_ocultas (int): Número de camadas ocultas (1-10 no overlay)
+            neuronios (int): Neurônios por camada oculta (8-256 no overlay)
+            entradas (int): Tamanho da observação
+            saidas (int): Número de ações
+            semente (int, optional): Semente dos pesos
+
+        Returns:
+            RedeNeural: Nova rede
+        """
+        rng = np.random.default_rng(semente)
+        tamanhos = [entradas] + [neuronios] * camadas_ocultas + [saidas]
+        pesos, vieses = [], []
+        for n_entrada, n_saida in zip(tamanhos[:-1], tamanhos[1:]):
+            limite = np.sqrt(6.0 / (n_entrada + n_saida))
+            pesos.append(rng.uniform(-limite, limite, (n_entrada, n_saida)).astype(np.float32))
+            vieses.append(np.zeros(n_saida, dtype=np.float32))
+        return cls(pesos, vieses)
+
+    @classmethod
+    def de_vetor(cls, vetor, arquitetura):
+        """
+        Cria rede cujos pesos são VIEWS de um vetor plano (genoma), sem cópia.
+
+        Layout: para cada camada, W (n_entrada x n_saida, row-major) seguido de b.
+        Alterar o vetor altera a rede (usado com o pool em memória compartilhada).
+
+        Args:
+            vetor (np.ndarray): float32 com tamanho_genoma(arquitetura) elementos
+            arquitetura (sequence[int]): Tamanhos das camadas, ex: [8, 16, 16, 5]
+
+        Returns:
+            RedeNeural: Rede que compartilha memória com o vetor
+
+        Raises:
+            ValueError: Se o tamanho do vetor não corresponder à arquitetura
+        """
+        if vetor.size != tamanho_genoma(arquitetura):
+            raise ValueError(f"Genoma com {vetor.size} valores; arquitetura {list(arquitetura)} "
+                             f"exige {tamanho_genoma(arquitetura)}")
+        pesos, vieses = [], []
+        inicio = 0
+        for n_entrada, n_saida in zip(arquitetura[:-1], arquitetura[1:]):
+            fim = inicio + n_entrada * n_saida
+            pesos.append(vetor[inicio:fim].reshape(n_entrada, n_saida))
+            vieses.append(vetor[fim:fim + n_saida])
+            inicio = fim + n_saida
+        return cls(pesos, vieses)
+
+    def vetor_parametros(self):
+        """Retorna uma cópia plana float32 dos parâmetros (layout de de_vetor)."""
+        partes = []
+        for w, b in zip(self.pesos, self.vieses):
+            partes.append(w.ravel())
+            partes.append(b)
+        return np.concatenate(partes).astype(np.float32, copy=False)
+
+    @property
+    def n_parametros(self):
+        """Número total de pesos + vieses."""
+        return sum(w.size + b.size for w, b in zip(self.pesos, self.vieses))
+
+    def _reservar(self, n):
+        """Garante buffers de ativação para lotes de até n linhas."""
+        if n <= self._capacidade:
+            return
+        capacidade = max(n, 2 * self._capacidade)
+        self._ativacoes = [np.zeros((capacidade, w.shape[1]), dtype=np.float32) for w in self.pesos]
+        self._capacidade = capacidade
+
+    def inferir(self, entradas):
+        """
+        Propagação direta de um lote.
+
+        Args:
+            entradas (np.ndarray): (n, arquitetura[0]) float32
+
+        Returns:
+            np.ndarray: (n, arquitetura[-1]) em [0, 1] - VIEW de buffer interno,
+                        válida até a próxima chamada
+        """
+        n = entradas.shape[0]
+        self._reservar(n)
+        x = entradas
+        ultima = len(self.pesos) - 1
+        for i, (w, b) in enumerate(zip(self.pesos, self.vieses)):
+            saida = self._ativacoes[i][:n]
+            np.matmul(x, w, out=saida)
+            np.add(saida, b, out=saida)
+            if i < ultima:
+                np.tanh(saida, out=saida)
+            else:
+                # Sigmoide: 1 / (1 + exp(-z))
+                np.negative(saida, out=saida)
+                np.exp(saida, out=saida)
+                np.add(saida, 1.0, out=saida)
+                np.reciprocal(saida, out=saida)
+            x = saida
+        return x
@@ -0,0 +1,322 @@
+# ============================================================================
+# TREINO.PY - NEUROEVOLUÇÃO PARALELA (GENOMAS EM MEMÓRIA COMPARTILHADA)
+# ============================================================================
+"""
+PROPÓSITO:
+Treina a rede do modo "JOGAR COM IA" (até 10 camadas x 256 neurônios)
+com um algoritmo genético: avaliar população -> selecionar elite ->
+mutar (ruído gaussiano) -> próxima geração.
+
+PARALELISMO:
+- População inteira num POOL float32 em multiprocessing.shared_memory
+  (forma: populacao x tamanho do genoma)
+- Processos trabalhadores se conectam ao pool pelo nome UMA vez;
+  cada tarefa envia apenas (índice do genoma, sementes) -> os vetores
+  de pesos nunca são serializados (pickle)
+- Cada trabalhador cria a RedeNeural como VIEW da linha do pool
+
+DETERMINISMO:
+- Sementes dos episódios e das mutações derivadas de (semente, geração)
+  com derivar_semente(): mesma semente + mesmos parâmetros = mesmo treino,
+  independente do número de processos
+- Todos os genomas de uma geração jogam os MESMOS cenários (comparação justa)
+
+SAÍDA:
+- Checkpoint a cada geração (populacao, aptidões, melhor genoma)
+- politica_<camadas>x<neuronios>.sipol com o melhor genoma (ver checkpoint.py)
+- Vazão reportada em episódios por segundo
+
+USO:
+    python -m space_invaders.ia.treino --camadas 2 --neuronios 16 --geracoes 50
+"""
+
+import argparse                               # Linha de comando
+import multiprocessing                        # Pool de processos
+import os                                     # Troca atômica de arquivos
+import time                                   # Medição de vazão
+from multiprocessing import shared_memory     # Pool de genomas sem cópia
+from pathlib import Path
+import numpy as np
+from ..utils import derivar_semente
+from .ambiente import AmbienteLote
+from .checkpoint import nome_politica, salvar_politica
+from .rede import RedeNeural, arquitetura_overlay, tamanho_genoma
+
+# Índices de derivação de sementes por geração
+SEMENTE_EPISODIOS = 0
+SEMENTE_MUTACAO = 1
+
+
+# ============================================================================
+# AVALIAÇÃO - USADA PELOS TRABALHADORES E PELO MODO SEM PROCESSOS
+# ============================================================================
+def avaliar_rede(rede, lote, sementes):
+    """
+    Joga um episódio por semente, todos em lote, e retorna a recompensa média.
+
+    Args:
+        rede (RedeNeural): Política avaliada
+        lote (AmbienteLote): Ambiente com n_jogos == len(sementes)
+        sementes (sequence[int]): Cenários (uma semente por episódio)
+
+    Returns:
+        float: Recompensa média por episódio
+    """
+    obs = lote.reiniciar(sementes)
+    total = np.zeros(lote.n_jogos, dtype=np.float64)
+    terminados = np.zeros(lote.n_jogos, dtype=bool)
+    while not terminados.all():
+        obs, recompensas, terminados = lote.passo(rede.inferir(obs))
+        total += recompensas
+    return float(total.mean())
+
+
+# Estado de cada processo trabalhador (preenchido por _iniciar_trabalhador)
+_TRABALHADOR = {}
+
+
+def _iniciar_trabalhador(nome_memoria, forma, arquitetura, episodios, frame_skip, max_ticks):
+    """Conecta o trabalhador ao pool compartilhado e prepara seu ambiente."""
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    pool = np.ndarray(forma, dtype=np.float32, buffer=memoria.buf)
+    _TRABALHADOR.update(
+        memoria=memoria,  # Mantém a referência viva enquanto o processo existir
+        redes=[RedeNeural.de_vetor(pool[i], arquitetura) for i in range(forma[0])],
+        lote=AmbienteLote(episodios, frame_skip=frame_skip, max_ticks=max_ticks),
+    )
+
+
+def _avaliar_genoma(tarefa):
+    """Tarefa do pool: (índice, sementes) -> (índice, aptidão)."""
+    indice, sementes = tarefa
+    return indice, avaliar_rede(_TRABALHADOR["redes"][indice], _TRABALHADOR["lote"], sementes)
+
+
+# ============================================================================
+# CLASSE TREINADORNEUROEVOLUCAO
+# ============================================================================
+class TreinadorNeuroevolucao:
+    """
+    Algoritmo genético com elitismo sobre genomas float32 compartilhados.
+
+    ATRIBUTOS:
+    - arquitetura: Tamanhos das camadas da rede treinada
+    - populacao: View (populacao x genoma) do pool em memória compartilhada
+    - aptidoes: Recompensa média de cada genoma na última avaliação
+    - geracao: Próxima geração a avaliar
+    """
+
+    def __init__(self, camadas=2, neuronios=16, populacao=64, episodios=4, fracao_elite=0.125,
+                 sigma=0.05, frame_skip=4, max_ticks=3000, processos=None, semente=0,
+                 pasta_checkpoints="checkpoints"):
+        """
+        Args:
+            camadas (int): Camadas ocultas (configIA.layers, 1-10)
+            neuronios (int): Neurônios por camada (configIA.neuronios, 8-256)
+            populacao (int): Genomas por geração
+            episodios (int): Episódios (cenários) por genoma e geração
+            fracao_elite (float): Fração mantida sem mutação e usada como pais
+            sigma (float): Desvio padrão da mutação gaussiana
+            frame_skip (int): Ticks por decisão da rede
+            max_ticks (int): Limite de ticks por episódio
+            processos (int, optional): Trabalhadores (None = núcleos da máquina; 1 = sem pool)
+            semente (int): Semente base do treino
+            pasta_checkpoints (str|Path): Destino dos checkpoints por geração
+        """
+        self.camadas = camadas
+        self.neuronios = neuronios
+        self.arquitetura = arquitetura_overlay(camadas, neuronios)
+        self.tamanho_populacao = populacao
+        self.episodios = episodios
+        self.n_elite = max(1, int(populacao * fracao_elite))
+        self.sigma = sigma
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.processos = processos or os.cpu_count() or 1
+        self.semente = semente
+        self.pasta_checkpoints = Path(pasta_checkpoints)
+        self.geracao = 0
+        self.aptidoes = np.zeros(populacao, dtype=np.float64)
+
+        forma = (populacao, tamanho_genoma(self.arquitetura))
+        self.memoria = shared_memory.SharedMemory(create=True, size=forma[0] * forma[1] * 4)
+        self.populacao = np.ndarray(forma, dtype=np.float32, buffer=self.memoria.buf)
+        for i in range(populacao):
+            rede = RedeNeural.aleatoria(camadas, neuronios, semente=derivar_semente(semente, i))
+            self.populacao[i] = rede.vetor_parametros()
+        self._pool = None
+        self._redes_locais = None
+        self._lote_local = None
+
+    # ========================================================================
+    # AVALIAÇÃO
+    # ========================================================================
+    def sementes_geracao(self, geracao):
+        """Cenários da geração (iguais para todos os genomas)."""
+        base = derivar_semente(derivar_semente(self.semente, geracao), SEMENTE_EPISODIOS)
+        return [derivar_semente(base, e) for e in range(self.episodios)]
+
+    def _iniciar_pool(self):
+        if self._pool is None:
+            argumentos = (self.memoria.name, self.populacao.shape, self.arquitetura,
+                          self.episodios, self.frame_skip, self.max_ticks)
+            self._pool = multiprocessing.Pool(self.processos, _iniciar_trabalhador, argumentos)
+
+    def avaliar(self):
+        """
+        Avalia todos os genomas da geração atual.
+
+        Returns:
+            np.ndarray: Aptidões (view de self.aptidoes)
+        """
+        sementes = self.sementes_geracao(self.geracao)
+        tarefas = [(i, sementes) for i in range(self.tamanho_populacao)]
+        if self.processos <= 1:
+            if self._redes_locais is None:
+                self._redes_locais = [RedeNeural.de_vetor(linha, self.arquitetura) for linha in self.populacao]
+                self._lote_local = AmbienteLote(self.episodios, frame_skip=self.frame_skip,
+                                                max_ticks=self.max_ticks)
+            for i, _ in tarefas:
+                self.aptidoes[i] = avaliar_rede(self._redes_locais[i], self._lote_local, sementes)
+        else:
+            self._iniciar_pool()
+            blocos = max(1, len(tarefas) // (self.processos * 4))
+            for i, aptidao in self._pool.imap_unordered(_avaliar_genoma, tarefas, chunksize=blocos):
+                self.aptidoes[i] = aptidao
+        return self.aptidoes
+
+    # ========================================================================
+    # EVOLUÇÃO
+    # ========================================================================
+    def evoluir(self):
+        """
+        Substitui a população pela próxima geração (in-place no pool).
+
+        Elite (melhores n_elite) passa intacta; o resto é pai da elite
+        sorteado + ruído gaussiano de desvio sigma.
+        """
+        rng = np.random.default_rng(derivar_semente(derivar_semente(self.semente, self.geracao),
+                                                    SEMENTE_MUTACAO))
+        # Ordenação estável: empates decididos pelo índice (determinístico)
+        ordem = np.argsort(-self.aptidoes, kind="stable")
+        elite = self.populacao[ordem[:self.n_elite]].copy()
+        self.populacao[:self.n_elite] = elite
+        n_filhos = self.tamanho_populacao - self.n_elite
+        pais = rng.integers(0, self.n_elite, n_filhos)
+        filhos = self.populacao[self.n_elite:]
+        np.take(elite, pais, axis=0, out=filhos)
+        filhos += rng.standard_normal(filhos.shape, dtype=np.float32) * np.float32(self.sigma)
+        self.geracao += 1
+
+    def salvar_checkpoint(self):
+        """
+        Grava o checkpoint da geração avaliada (troca atômica do arquivo)
+        e atualiza a política .sipol da arquitetura com o melhor genoma.
+
+        Returns:
+            Path: Caminho do checkpoint
+        """
+        self.pasta_checkpoints.mkdir(parents=True, exist_ok=True)
+        caminho = self.pasta_checkpoints / f"geracao_{self.geracao:04d}.npz"
+        temporario = caminho.with_suffix(".tmp.npz")
+        melhor = int(np.argmax(self.aptidoes))
+        np.savez(temporario, arquitetura=np.array(self.arquitetura, dtype=np.int32),
+                 geracao=self.geracao, semente=np.uint64(self.semente),
+                 populacao=self.populacao, aptidoes=self.aptidoes,
+                 melhor=self.populacao[melhor], aptidao_melhor=self.aptidoes[melhor])
+        os.replace(temporario, caminho)
+        # Melhor genoma também no formato de política carregado pelo modo web
+        salvar_politica(self.pasta_checkpoints / nome_politica(self.camadas, self.neuronios),
+                        RedeNeural.de_vetor(self.populacao[melhor], self.arquitetura),
+                        geracao=self.geracao, aptidao=float(self.aptidoes[melhor]), semente=self.semente)
+        return caminho
+
+    def retomar(self, caminho):
+        """
+        Carrega população e geração de um checkpoint salvo por salvar_checkpoint().
+
+        Raises:
+            ValueError: Se a arquitetura ou o tamanho da população forem diferentes
+        """
+        with np.load(caminho) as dados:
+            if list(dados["arquitetura"]) != self.arquitetura or dados["populacao"].shape != self.populacao.shape:
+                raise ValueError("Checkpoint incompatível com a arquitetura/população do treinador")
+            self.populacao[:] = dados["populacao"]
+            self.aptidoes[:] = dados["aptidoes"]
+            self.geracao = int(dados["geracao"])
+        self.evoluir()
+
+    def treinar(self, geracoes):
+        """
+        Executa geracoes ciclos de avaliar -> checkpoint -> evoluir.
+
+        Returns:
+            list[dict]: Histórico por geração (melhor, média, episodios_por_segundo)
+        """
+        historico = []
+        for _ in range(geracoes):
+            inicio = time.perf_counter()
+            aptidoes = self.avaliar()
+            duracao = time.perf_counter() - inicio
+            n_episodios = self.tamanho_populacao * self.episodios
+            registro = {
+                "geracao": self.geracao,
+                "melhor": float(aptidoes.max()),
+                "media": float(aptidoes.mean()),
+                "episodios_por_segundo": n_episodios / duracao if duracao > 0 else 0.0,
+            }
+            caminho = self.salvar_checkpoint()
+            print(f"Geração {registro['geracao']:4d} | melhor {registro['melhor']:8.1f} | "
+                  f"média {registro['media']:8.1f} | {registro['episodios_por_segundo']:7.1f} episódios/s "
+                  f"({self.processos} processos) | {caminho.name}")
+            historico.append(registro)
+            self.evoluir()
+        return historico
+
+    def fechar(self):
+        """Encerra o pool de processos e libera a memória compartilhada."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._redes_locais = self._lote_local = None
+        self.populacao = None
+        self.memoria.close()
+        self.memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def main(argv=None):
+    """FERRAMENTA DE LINHA DE COMANDO - Treina a rede do modo IA."""
+    parser = argparse.ArgumentParser(description="Neuroevolução paralela da rede do modo JOGAR COM IA")
+    parser.add_argument("--camadas", type=int, default=2)
+    parser.add_argument("--neuronios", type=int, default=16)
+    parser.add_argument("--populacao", type=int, default=64)
+    parser.add_argument("--episodios", type=int, default=4)
+    parser.add_argument("--geracoes", type=int, default=50)
+    parser.add_argument("--sigma", type=float, default=0.05)
+    parser.add_argument("--frame-skip", type=int, default=4)
+    parser.add_argument("--max-ticks", type=int, default=3000)
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default="checkpoints")
+    parser.add_argument("--retomar", default=None, help="Checkpoint .npz para continuar o treino")
+    args = parser.parse_args(argv)
+
+    with TreinadorNeuroevolucao(args.camadas, args.neuronios, args.populacao, args.episodios,
+                                sigma=args.sigma, frame_skip=args.frame_skip, max_ticks=args.max_ticks,
+                                processos=args.processos, semente=args.semente,
+                                pasta_checkpoints=args.saida) as treinador:
+        if args.retomar:
+            treinador.retomar(args.retomar)
+        treinador.treinar(args.geracoes)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
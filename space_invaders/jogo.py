@@ -23,6 +23,7 @@ CLASSES NESTE ARQUIVO:
 """
 
 import pygame  # Biblioteca de jogos
+import random  # Gerador aleatório próprio da partida
 import sys     # Para sair do programa
 # Importa camada de DADOS (entidades)
 from .Dados.jogador import Jogador
@@ -33,6 +34,8 @@ from .Business.jogador_business import JogadorBusiness
 from .Business.inimigo_business import InimigoBusiness
 from .Business.projetil_business import ProjetilBusiness
 from .Business.pontuacao_business import PontuacaoBusiness
+# Atlas de sprites (formato da tela, compartilhado)
+from .atlas import obter_atlas_tela, descartar_atlas_tela
 # Importa constantes e utilitários
 from .utils import *
 
@@ -55,8 +58,6 @@ class Menu:
             tela: Superfície pygame para renderização
         """
         self.tela = tela
-        self.fonte_titulo = pygame.font.Font(None, 72)   # Fonte grande para título
-        self.fonte_opcao = pygame.font.Font(None, 48)    # Fonte média para opções
         self.opcao_selecionada = 0  # Índice da opção atual
         self.opcoes = ["INICIAR", "SAIR"]  # Lista de opções do menu
 
@@ -107,7 +108,7 @@ class Menu:
         self.tela.fill(COR_FUNDO)
 
         # Renderiza título
-        titulo = self.fonte_titulo.render("SPACE INVADERS", True, COR_TITULO)
+        titulo = renderizar_texto("SPACE INVADERS", 72, COR_TITULO)
         titulo_rect = titulo.get_rect(center=(LARGURA_TELA // 2, 200))
         self.tela.blit(titulo, titulo_rect)
 
@@ -115,12 +116,11 @@ class Menu:
         for i, opcao in enumerate(self.opcoes):
             # Destaca opção selecionada com cor diferente
             cor = COR_TEXTO_SELECIONADO if i == self.opcao_selecionada else COR_TEXTO
-            texto = self.fonte_opcao.render(opcao, True, cor)
+            texto = renderizar_texto(opcao, 48, cor)
             texto_rect = texto.get_rect(center=(LARGURA_TELA // 2, 350 + i * 80))
             self.tela.blit(texto, texto_rect)
 
-        # Renderiza instruções
-        fonte_instrucao = pygame.font.Font(None, 24)
+        # Renderiza instruções (superfícies em cache: renderizadas só no primeiro quadro)
         instrucoes = [
             "Use as setas ou W/S para navegar",
             "Pressione ENTER ou ESPAÇO para selecionar",
@@ -128,7 +128,7 @@ class Menu:
         ]
 
         for i, instrucao in enumerate(instrucoes):
-            texto = fonte_instrucao.render(instrucao, True, COR_TEXTO)
+            texto = renderizar_texto(instrucao, 24, COR_TEXTO)
             texto_rect = texto.get_rect(center=(LARGURA_TELA // 2, 520 + i * 25))
             self.tela.blit(texto, texto_rect)
 
@@ -154,9 +154,6 @@ class GameOver:
             pontuacao (int): Pontuação final do jogador
         """
         self.tela = tela
-        self.fonte_titulo = pygame.font.Font(None, 72)
-        self.fonte_texto = pygame.font.Font(None, 48)
-        self.fonte_instrucao = pygame.font.Font(None, 32)
         self.pontuacao = pontuacao
         self.opcao_selecionada = 0
         self.opcoes = ["JOGAR NOVAMENTE", "MENU PRINCIPAL", "SAIR"]
@@ -189,24 +186,23 @@ class GameOver:
         self.tela.fill(COR_FUNDO)
 
         # Título
-        titulo = self.fonte_titulo.render("GAME OVER", True, COR_INIMIGO)
+        titulo = renderizar_texto("GAME OVER", 72, COR_INIMIGO)
         titulo_rect = titulo.get_rect(center=(LARGURA_TELA // 2, 150))
         self.tela.blit(titulo, titulo_rect)
 
         # Pontuação final
-        pontos = self.fonte_texto.render(f"Pontuação: {self.pontuacao}", True, COR_TEXTO)
+        pontos = renderizar_texto(f"Pontuação: {self.pontuacao}", 48, COR_TEXTO)
         pontos_rect = pontos.get_rect(center=(LARGURA_TELA // 2, 220))
         self.tela.blit(pontos, pontos_rect)
 
         # Opções
         for i, opcao in enumerate(self.opcoes):
             cor = COR_TEXTO_SELECIONADO if i == self.opcao_selecionada else COR_TEXTO
-            texto = self.fonte_instrucao.render(opcao, True, cor)
+            texto = renderizar_texto(opcao, 32, cor)
             texto_rect = texto.get_rect(center=(LARGURA_TELA // 2, 320 + i * 60))
             self.tela.blit(texto, texto_rect)
 
         # Instruções
-        fonte_pequena = pygame.font.Font(None, 24)
         instrucoes = [
             "Use as setas ou W/S para navegar",
             "Pressione ENTER ou ESPAÇO para selecionar",
@@ -214,7 +210,7 @@ class GameOver:
         ]
 
         for i, instrucao in enumerate(instrucoes):
-            texto = fonte_pequena.render(instrucao, True, COR_TEXTO)
+            texto = renderizar_texto(instrucao, 24, COR_TEXTO)
             texto_rect = texto.get_rect(center=(LARGURA_TELA // 2, 520 + i * 25))
             self.tela.blit(texto, texto_rect)
 
@@ -258,7 +254,7 @@ class Jogo:
     ========================================================================
     """
 
-    def __init__(self):
+    def __init__(self, semente=None, retangulos_sujos=False):
         """
         CONSTRUTOR - Inicializa o jogo completo
 
@@ -267,6 +263,11 @@ class Jogo:
         - Inimigos (lista de entidades)
         - Business classes (lógica)
         - Interface (Menu, GameOver)
+
+        Args:
+            semente (int, optional): Semente do RNG dos inimigos (None = sorteia)
+            retangulos_sujos (bool): Renderização parcial - atualiza na tela só as
+                                     áreas que mudaram (ver desenhar_jogo_parcial)
         """
         # Inicializa pygame se necessário
         if not pygame.get_init():
@@ -278,9 +279,17 @@ class Jogo:
         self.clock = pygame.time.Clock()  # Controla FPS
         self.rodando = True
 
+        # Renderização por retângulos sujos (opcional)
+        self.retangulos_sujos = retangulos_sujos
+        self.rects_anteriores = None  # Áreas desenhadas no quadro anterior (None = redesenhar tudo)
+
         # MÁQUINA DE ESTADOS: Estado inicial é o menu
         self.estado = ESTADO_MENU
 
+        # Aleatoriedade própria do jogo (tiros inimigos reprodutíveis pela semente)
+        self.semente = semente if semente is not None else random.getrandbits(64)
+        self.rng = random.Random(self.semente)
+
         # Carrega recursos visuais (sprites)
         self._carregar_recursos()
 
@@ -312,21 +321,33 @@ class Jogo:
         Carrega sprites (imagens) do jogo
 
         SEPARAÇÃO: Recursos visuais separados da lógica
+        DESEMPENHO: Sprites são subsurfaces do atlas já no formato da tela,
+        montado uma vez e compartilhado por todas as instâncias de Jogo
         """
-        self.background = carregar_sprite("background.png", LARGURA_TELA, ALTURA_TELA)
-        self.sprite_jogador = carregar_sprite("player_ship.png", 50, 30)
+        self.atlas = obter_atlas_tela()
+        self.background = self.atlas.sprite("fundo").convert()  # Opaco: blit sem alpha
+        self.sprite_jogador = self.atlas.sprite("jogador")
         # Sprites diferentes para cada tipo de inimigo
         self.sprites_inimigos = {
-            1: carregar_sprite("invader_type1.png", 40, 25),
-            2: carregar_sprite("invader_type2.png", 40, 25),
-            3: carregar_sprite("invader_type3.png", 40, 25),
+            1: self.atlas.sprite("inimigo1"),
+            2: self.atlas.sprite("inimigo2"),
+            3: self.atlas.sprite("inimigo3"),
         }
         # Sprites de projéteis
         self.sprite_projeteis = {
-            "jogador": carregar_sprite("bullet_player.png", 6, 15),
-            "inimigo": carregar_sprite("bullet_enemy.png", 6, 15),
+            "jogador": self.atlas.sprite("tiro_jogador"),
+            "inimigo": self.atlas.sprite("tiro_inimigo"),
         }
-        self.sprite_explosao = carregar_sprite("explosion.png", 32, 32)
+        self.sprite_explosao = self.atlas.sprite("explosao")
+        # Quadros da explosão já redimensionados, por tamanho em pixels
+        # (o efeito cresce de 15 a 22 px: poucos tamanhos, escalados uma única vez)
+        self.quadros_explosao = {}
+        # Quadros do efeito de fallback (círculos), por (tamanho, passo da animação)
+        self.quadros_explosao_fallback = {}
+        # Meia largura/altura de cada superfície desenhada (centraliza sem get_rect)
+        self.deslocamentos = {}
+        # Retângulos sólidos das entidades sem sprite, por (tamanho, cor)
+        self.superficies_solidas = {}
 
     def inicializar_jogo(self, reset_velocidade=False):
         """
@@ -351,7 +372,7 @@ class Jogo:
 
         # COMPOSIÇÃO: Cria inimigos e seu business
         self.inimigos = self.criar_inimigos()
-        self.inimigo_business = InimigoBusiness(self.inimigos, velocidade_base=self.velocidade_inimigo_base)
+        self.inimigo_business = InimigoBusiness(self.inimigos, velocidade_base=self.velocidade_inimigo_base, rng=self.rng)
 
         # Listas de projéteis
         self.projeteis_jogador = []
@@ -438,6 +459,8 @@ class Jogo:
             if evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_ESCAPE:
                     self.estado = ESTADO_MENU
+            if evento.type == pygame.WINDOWEXPOSED:
+                self.rects_anteriores = None  # Conteúdo da janela perdido: redesenha tudo
 
         teclas = pygame.key.get_pressed()
         # Movimento horizontal
@@ -588,8 +611,10 @@ class Jogo:
         """
         if self.estado == ESTADO_MENU:
             self.menu.desenhar()
+            self.rects_anteriores = None  # Ao voltar ao jogo, a tela inteira mudou
         elif self.estado == ESTADO_GAME_OVER:
             self.game_over.desenhar()
+            self.rects_anteriores = None
         elif self.estado == ESTADO_JOGANDO:
             self.desenhar_jogo()
 
@@ -598,108 +623,173 @@ class Jogo:
         Desenha os elementos do jogo durante o gameplay.
         Responsabilidade do controlador: gerenciar toda a renderização.
         """
+        if self.retangulos_sujos and self.rects_anteriores is not None:
+            self.desenhar_jogo_parcial()
+            return
+
         # Desenha fundo
         if self.background:
             self.tela.blit(self.background, (0, 0))
         else:
             self.tela.fill(COR_FUNDO)
 
-        # Desenha jogador usando método local
-        self.desenhar_jogador()
-
-        # Desenha inimigos usando método local
-        for inimigo in self.inimigos:
-            self.desenhar_inimigo(inimigo)
-
-        # Desenha projéteis usando método local
-        for projetil in self.projeteis_jogador + self.projeteis_inimigo:
-            self.desenhar_projetil(projetil)
-
-        # Desenha efeitos de explosão
-        for efeito in self.efeitos_explosao:
-            self.desenhar_efeito_explosao(efeito)
+        # Jogador, inimigos, projéteis e explosões (nesta ordem) numa única
+        # chamada Surface.blits: um laço em C em vez de um blit por entidade
+        rects = self.tela.blits(self.sequencia_blits(), doreturn=self.retangulos_sujos)
 
         # Desenha HUD
-        self.desenhar_hud()
+        rects_hud = self.desenhar_hud()
+        if self.retangulos_sujos:
+            self.rects_anteriores = rects + rects_hud  # Próximos quadros: só o que mudar
         pygame.display.flip()
 
-    def desenhar_jogador(self):
+    def desenhar_jogo_parcial(self):
         """
-        Método do controlador para renderizar o jogador.
-        Separação correta: renderização no controlador, dados na entidade.
-        """
-        if self.jogador.sprite:
-            sprite_rect = self.jogador.sprite.get_rect(center=self.jogador.rect.center)
-            self.tela.blit(self.jogador.sprite, sprite_rect)
-        else:
-            pygame.draw.rect(self.tela, COR_JOGADOR, self.jogador.rect)
+        Renderização por retângulos sujos: em vez de redesenhar o fundo da
+        tela inteira e enviar 800x600 pixels com flip(), restaura o fundo só
+        onde havia entidades/HUD no quadro anterior, desenha o quadro atual
+        e envia para a janela apenas a união dessas áreas (display.update).
 
-    def desenhar_inimigo(self, inimigo):
+        O primeiro quadro (e o primeiro após menu/game over ou janela
+        exposta) passa pelo desenho completo de desenhar_jogo().
         """
-        Método do controlador para renderizar um inimigo.
-        Separação correta: renderização no controlador, dados na entidade.
-        """
-        if inimigo.sprite:
-            sprite_rect = inimigo.sprite.get_rect(center=inimigo.rect.center)
-            self.tela.blit(inimigo.sprite, sprite_rect)
+        anteriores = self.rects_anteriores
+        self.restaurar_fundo(anteriores)
+        atuais = self.tela.blits(self.sequencia_blits())
+        atuais += self.desenhar_hud()
+        self.rects_anteriores = atuais
+        sujos = anteriores + atuais
+        if len(sujos) > MAX_RETANGULOS_SUJOS:
+            pygame.display.flip()  # Muitas áreas pequenas: a tela inteira sai mais barata
         else:
-            pygame.draw.rect(self.tela, COR_INIMIGO, inimigo.rect)
+            pygame.display.update(sujos)
 
-    def desenhar_projetil(self, projetil):
-        """
-        Método do controlador para renderizar um projétil.
-        Separação correta: renderização no controlador, dados na entidade.
-        """
-        if projetil.sprite:
-            sprite_rect = projetil.sprite.get_rect(center=projetil.rect.center)
-            self.tela.blit(projetil.sprite, sprite_rect)
+    def restaurar_fundo(self, rects):
+        """Redesenha o fundo nas áreas indicadas (apaga o quadro anterior)."""
+        if self.background:
+            self.tela.blits([(self.background, rect, rect) for rect in rects], doreturn=False)
         else:
-            pygame.draw.rect(self.tela, projetil.cor_fallback, projetil.rect)
+            for rect in rects:
+                self.tela.fill(COR_FUNDO, rect)
 
-    def desenhar_efeito_explosao(self, efeito):
+    def sequencia_blits(self):
         """
-        Método do controlador para renderizar efeitos de explosão.
-        Separação correta: renderização no controlador, dados na entidade.
+        Lista (superfície, posição) de todas as entidades do quadro.
+
+        Ordem: jogador, inimigos, projéteis, explosões. Entidades sem sprite
+        entram como superfícies sólidas em cache, para que tudo saia numa
+        única chamada de Surface.blits.
+
+        Returns:
+            list: Pares para Surface.blits
+        """
+        deslocamentos = self.deslocamentos
+        blits = []
+        adicionar = blits.append
+
+        def entidades(lista, cor_padrao):
+            for entidade in lista:
+                sprite = entidade.sprite
+                if sprite is None:
+                    sprite = self.superficie_solida(entidade.rect.size, cor_padrao or entidade.cor_fallback)
+                deslocamento = deslocamentos.get(sprite)
+                if deslocamento is None:
+                    largura, altura = sprite.get_size()
+                    deslocamento = deslocamentos[sprite] = (largura // 2, altura // 2)
+                centro_x, centro_y = entidade.rect.center
+                adicionar((sprite, (centro_x - deslocamento[0], centro_y - deslocamento[1])))
+
+        entidades((self.jogador,), COR_JOGADOR)
+        entidades(self.inimigos, COR_INIMIGO)
+        entidades(self.projeteis_jogador, None)  # Cor do próprio projétil
+        entidades(self.projeteis_inimigo, None)
+        for efeito in self.efeitos_explosao:
+            if not efeito.ativo:
+                continue
+            if efeito.sprite:
+                adicionar((self.quadro_explosao(efeito.sprite, int(efeito.tamanho_atual)),
+                           (efeito.x - efeito.tamanho_atual // 2, efeito.y - efeito.tamanho_atual // 2)))
+            else:
+                quadro, raio = self.quadro_explosao_fallback(efeito)
+                if quadro is not None:
+                    adicionar((quadro, (int(efeito.x) - raio, int(efeito.y) - raio)))
+        return blits
+
+    def superficie_solida(self, tamanho, cor):
+        """Retângulo preenchido com `cor` (em cache), substitui pygame.draw.rect no lote."""
+        chave = (tuple(tamanho), tuple(cor))
+        superficie = self.superficies_solidas.get(chave)
+        if superficie is None:
+            superficie = pygame.Surface(tamanho)
+            superficie.fill(cor)
+            self.superficies_solidas[chave] = superficie
+        return superficie
+
+    def quadro_explosao(self, sprite, tamanho):
+        """
+        Sprite da explosão redimensionado para `tamanho` px (em cache).
+
+        Args:
+            sprite (pygame.Surface): Sprite original da explosão
+            tamanho (int): Lado do quadro em pixels
+
+        Returns:
+            pygame.Surface: Quadro compartilhado (apenas para blit)
         """
-        if not efeito.ativo:
-            return
+        chave = (id(sprite), tamanho)
+        quadro = self.quadros_explosao.get(chave)
+        if quadro is None:
+            quadro = pygame.transform.scale(sprite, (tamanho, tamanho))
+            self.quadros_explosao[chave] = quadro
+        return quadro
 
-        if efeito.sprite:
-            # Redimensiona o sprite baseado no tamanho atual
-            sprite_escalado = pygame.transform.scale(efeito.sprite,
-                                                    (int(efeito.tamanho_atual), int(efeito.tamanho_atual)))
-            pos_x = efeito.x - efeito.tamanho_atual // 2
-            pos_y = efeito.y - efeito.tamanho_atual // 2
-            self.tela.blit(sprite_escalado, (pos_x, pos_y))
-        else:
-            # Efeito de fallback: círculos concêntricos
-            tempo_atual = pygame.time.get_ticks()
-            tempo_decorrido = tempo_atual - efeito.tempo_criacao
-            progresso = tempo_decorrido / efeito.tempo_vida
+    def quadro_explosao_fallback(self, efeito):
+        """
+        Círculos concêntricos do efeito sem sprite, desenhados uma vez por
+        (tamanho, passo) e reaproveitados; o passo vem de efeito.progresso.
 
-            for i, cor in enumerate(efeito.cores_explosao):
-                raio = int(efeito.tamanho_atual * (1 - i * 0.2) * (1 - progresso))
-                if raio > 0:
-                    pygame.draw.circle(self.tela, cor, (int(efeito.x), int(efeito.y)), raio)
+        Returns:
+            tuple: (pygame.Surface ou None, raio externo) - None quando nada é visível
+        """
+        passo = min(int(efeito.progresso * PASSOS_EXPLOSAO), PASSOS_EXPLOSAO - 1)
+        chave = (int(efeito.tamanho_atual), passo)
+        quadro = self.quadros_explosao_fallback.get(chave)
+        if quadro is None:
+            restante = 1 - passo / PASSOS_EXPLOSAO
+            raio_externo = int(efeito.tamanho_atual * restante)
+            quadro = (None, 0)
+            if raio_externo > 0:
+                superficie = pygame.Surface((2 * raio_externo + 1, 2 * raio_externo + 1), pygame.SRCALPHA)
+                for i, cor in enumerate(efeito.cores_explosao):
+                    raio = int(efeito.tamanho_atual * (1 - i * 0.2) * restante)
+                    if raio > 0:
+                        pygame.draw.circle(superficie, cor, (raio_externo, raio_externo), raio)
+                quadro = (superficie, raio_externo)
+            self.quadros_explosao_fallback[chave] = quadro
+        return quadro
 
     def desenhar_hud(self):
         """
         Desenha a interface do usuário (HUD) com pontuação e vidas.
-        """
-        fonte = pygame.font.Font(None, 36)
 
+        Textos em cache (utils.renderizar_texto): só renderiza de novo
+        quando pontos ou vidas mudam.
+
+        Returns:
+            list[pygame.Rect]: Áreas desenhadas (para a renderização parcial)
+        """
         # Pontuação
-        texto_pontos = fonte.render(f"Pontos: {self.pontuacao.pontos}", True, COR_TEXTO)
-        self.tela.blit(texto_pontos, (10, 10))
+        texto_pontos = renderizar_texto(f"Pontos: {self.pontuacao.pontos}", 36, COR_TEXTO)
+        rect_pontos = self.tela.blit(texto_pontos, (10, 10))
 
         # Vidas
-        texto_vidas = fonte.render(f"Vidas: {self.pontuacao.vidas_jogador}", True, COR_TEXTO)
-        self.tela.blit(texto_vidas, (10, 50))
+        texto_vidas = renderizar_texto(f"Vidas: {self.pontuacao.vidas_jogador}", 36, COR_TEXTO)
+        rect_vidas = self.tela.blit(texto_vidas, (10, 50))
 
         # Instruções
-        fonte_pequena = pygame.font.Font(None, 24)
-        instrucoes = fonte_pequena.render("ESC: Menu | WASD/Setas: Mover | Z: Atirar", True, COR_TEXTO)
-        self.tela.blit(instrucoes, (10, ALTURA_TELA - 30))
+        instrucoes = renderizar_texto("ESC: Menu | WASD/Setas: Mover | Z: Atirar", 24, COR_TEXTO)
+        rect_instrucoes = self.tela.blit(instrucoes, (10, ALTURA_TELA - 30))
+        return [rect_pontos, rect_vidas, rect_instrucoes]
     
     # ========================================================================
     # MÉTODO PRINCIPAL - GAME LOOP
@@ -741,5 +831,7 @@ class Jogo:
             self.clock.tick(60)
 
         # Finaliza pygame e sai do programa
+        limpar_cache_texto()  # Fontes em cache não valem após pygame.quit()
+        descartar_atlas_tela()  # Nem o atlas convertido para a tela
         pygame.quit()
         sys.exit()
@@ -20,19 +20,63 @@ VANTAGEM DA SEPARAÇÃO:
 - MESMA LÓGICA para desktop e web
 - Apenas interface muda
 - Demonstra REUTILIZAÇÃO de código
+
+DETERMINISMO:
+- O tempo é um RELÓGIO LÓGICO (tick * INTERVALO_TICK_MS), não o relógio real
+- A aleatoriedade vem de um random.Random com semente própria
+- Mesma semente + mesmos comandos nos mesmos ticks = mesma partida
+  (base para os replays de replay.py)
 """
 
-import pygame  # Apenas para Rect e time (não para display)
+import hashlib    # Hash do estado para verificação de replays
+from array import array  # Vetor plano de floats para snapshots
+import random     # Gerador aleatório com semente por jogo
+import struct     # Empacotamento canônico do estado para o hash
+import threading  # Trava entre thread do game loop e threads de entrada
+import time       # Medição de atraso das entradas (não afeta a simulação)
+import pygame  # Apenas para Rect (não para display)
 # Importa mesmas classes que jogo.py
 from .Dados.jogador import Jogador
 from .Business.jogador_business import JogadorBusiness
 from .Dados.inimigo import Inimigo
+from .Dados.projetil import Projetil
 from .Business.inimigo_business import InimigoBusiness
 from .Business.projetil_business import ProjetilBusiness
 from .Dados.pontuacao import Pontuacao
 from .Business.pontuacao_business import PontuacaoBusiness
+from .replay import GravadorReplay
+from .metricas import Histograma, LIMITES_ATRASO_MS, LIMITES_ATRASO_TICKS
 from .utils import *
 
+# Campos por entidade no vetor plano do snapshot
+CAMPOS_INIMIGO = 4   # x, y, tipo, direcao
+CAMPOS_PROJETIL = 2  # x, y
+CAMPOS_EXPLOSAO = 4  # x, y, tamanho_inicial, tempo_criacao
+
+# ============================================================================
+# CLASSE SNAPSHOTJOGO - ESTADO COMPACTO PARA BUSCA (MCTS, BEAM SEARCH)
+# ============================================================================
+class SnapshotJogo:
+    """
+    Cópia compacta e imutável do estado de simulação de um JogoHeadless.
+
+    ESTRUTURA:
+    - escalares: tupla com relógio, flags, menus, pontuação, timers e comandos
+    - contagens: (inimigos, tiros do jogador, tiros inimigos, explosões)
+    - entidades: array('d') plano com os campos de todas as entidades
+    - rng: estado do random.Random (getstate)
+
+    Criado por JogoHeadless.snapshot() e consumido por JogoHeadless.restore().
+    """
+
+    __slots__ = ("escalares", "contagens", "entidades", "rng")
+
+    def __init__(self, escalares, contagens, entidades, rng):
+        self.escalares = escalares
+        self.contagens = contagens
+        self.entidades = entidades
+        self.rng = rng
+
 # ============================================================================
 # CLASSE JOGOHEADLESS - CONTROLADOR SEM RENDERIZAÇÃO
 # ============================================================================
@@ -65,11 +109,16 @@ class JogoHeadless:
     ========================================================================
     """
 
-    def __init__(self):
+    def __init__(self, semente=None, arquivo_replay=None):
         """
         CONSTRUTOR - Inicializa jogo sem interface gráfica
 
         DIFERENÇA: Não cria tela, não carrega sprites
+
+        Args:
+            semente (int, optional): Semente do RNG (None = sorteia uma de 64 bits)
+            arquivo_replay (str|Path|arquivo binário, optional): Se informado,
+                grava todos os comandos processados neste replay
         """
         # Inicializa pygame apenas para funcionalidades básicas
         # (Rect para colisão, time para controle de tempo)
@@ -77,6 +126,31 @@ class JogoHeadless:
         if not pygame.get_init():
             pygame.init()
 
+        # Relógio lógico: avança INTERVALO_TICK_MS a cada chamada de atualizar()
+        self.tick = 0
+        self.tempo_ms = 0
+
+        # Aleatoriedade própria do jogo (reprodutível pela semente)
+        self.semente = semente if semente is not None else random.getrandbits(64)
+        self.rng = random.Random(self.semente)
+
+        # Serializa comandos (threads web) e atualizações (thread do game loop)
+        self.trava = threading.RLock()
+
+        # Versão do estado observável: só avança quando algo visível muda
+        # (ETag e long-poll da API REST; ver aguardar_versao)
+        self.versao = 0
+        self.estado_mudou = threading.Condition(self.trava)
+
+        # Gravação opcional de replay (apenas entradas)
+        self.gravador = GravadorReplay(arquivo_replay, self.semente) if arquivo_replay is not None else None
+
+        # Rastreamento de latência das entradas (fora da simulação e do hash)
+        self.entradas_pendentes = []  # (origem, seq, t_cliente, recebido_em, tick_recebido)
+        self.entradas_aplicadas = {}  # origem -> {"seq", "tick", "t_cliente"}
+        self.atraso_fila_ms = Histograma(LIMITES_ATRASO_MS)      # Recebida -> tick que a aplicou
+        self.atraso_ticks = Histograma(LIMITES_ATRASO_TICKS)     # Ticks entre recepção e efeito
+
         # Estado do jogo
         self.rodando = True
         self.game_over = False
@@ -89,6 +163,9 @@ class JogoHeadless:
         self.game_over_opcoes = ["JOGAR NOVAMENTE", "MENU PRINCIPAL", "SAIR"]
         self.game_over_selecionada = 0
         self.deseja_sair = False
+        self.modo_ia = False  # True quando a partida foi iniciada por "JOGAR COM IA"
+        self.partida = 0  # Número da partida atual (identifica a partida no placar)
+        self.tick_inicio_partida = 0
 
         # Comandos ativos (controlados pela web)
         self.comandos_ativos = {
@@ -124,7 +201,7 @@ class JogoHeadless:
         self.jogador = Jogador(LARGURA_TELA // 2 - 25, ALTURA_TELA - 50)
         self.jogador_business = JogadorBusiness(self.jogador)
         self.inimigos = self.criar_inimigos()
-        self.inimigo_business = InimigoBusiness(self.inimigos, velocidade_base=self.velocidade_inimigo_base)
+        self.inimigo_business = InimigoBusiness(self.inimigos, velocidade_base=self.velocidade_inimigo_base, rng=self.rng)
         self.projeteis_jogador = []
         self.projeteis_inimigo = []
         self.projetil_business = ProjetilBusiness(
@@ -132,6 +209,7 @@ class JogoHeadless:
             self.projeteis_inimigo,
             jogador=self.jogador,
             sprite_explosao=None,
+            relogio=self.agora,
         )
         self.pontuacao_business.resetar_pontuacao()
         self.game_over = False
@@ -151,6 +229,8 @@ class JogoHeadless:
     def iniciar_partida(self):
         """Prepara um novo jogo e entra no estado de jogo."""
         self.inicializar_jogo(reset_velocidade=True)
+        self.partida += 1
+        self.tick_inicio_partida = self.tick
         self.estado = ESTADO_JOGANDO
         self.game_over_selecionada = 0
         self.menu_selecionada = 0
@@ -173,7 +253,28 @@ class JogoHeadless:
                 inimigos.append(Inimigo(x, y, tipo=tipo_inimigo))
         return inimigos
 
-    def processar_comando(self, comando, estado=None):
+    def agora(self):
+        """Retorna o tempo lógico atual em milissegundos."""
+        return self.tempo_ms
+
+    def definir_semente(self, semente):
+        """
+        Re-semeia o RNG do jogo (ex: novo episódio de simulação).
+
+        O mesmo objeto random.Random é re-semeado, então InimigoBusiness
+        passa a usar a nova sequência sem precisar ser recriado.
+
+        Raises:
+            RuntimeError: Se houver replay sendo gravado (a semente está no cabeçalho)
+        """
+        with self.trava:
+            if self.gravador:
+                raise RuntimeError("Não é possível trocar a semente durante a gravação de um replay")
+            self.semente = semente
+            self.rng.seed(semente)
+            self._nova_versao()
+
+    def processar_comando(self, comando, estado=None, origem=None, seq=None, t_cliente=None, recebido_em=None):
         """
         Processa comandos recebidos (ex: do cliente via rede).
         Substitui o processamento de eventos de teclado local.
@@ -181,10 +282,80 @@ class JogoHeadless:
         Args:
             comando (str): O comando a ser executado ("esquerda", "direita", "cima", "baixo", "atirar", "reiniciar", "pausar", "menu", "menu_cima", "menu_baixo", "menu_selecionar")
             estado (str|None): "pressionar" ou "soltar" para comandos contínuos
+            origem (str, optional): Quem enviou (ex: sid do Socket.IO) - chave do eco em obter_estado()
+            seq (int, optional): Número de sequência do cliente; se informado, a entrada é rastreada
+            t_cliente (float, optional): Marca de tempo do cliente, devolvida no eco (cálculo de RTT)
+            recebido_em (float, optional): time.perf_counter() da recepção no servidor (padrão: agora)
+
+        Returns:
+            int|None: Número da partida que este comando iniciou (menu, game over ou
+                      reiniciar -> jogando); None se não iniciou nenhuma
         """
         if comando is None:
-            return
+            return None
+
+        with self.trava:
+            if self.gravador:
+                self.gravador.registrar(self.tick, comando, estado)
+            partida_anterior = self.partida
+            self._aplicar_comando(comando, estado)
+            if seq is not None:
+                self.entradas_pendentes.append((origem, seq, t_cliente,
+                                                recebido_em if recebido_em is not None else time.perf_counter(),
+                                                self.tick))
+            self._nova_versao()
+            return self.partida if self.partida != partida_anterior else None
+
+    def _nova_versao(self):
+        """Avança a versão do estado e acorda quem espera em aguardar_versao() (com a trava)."""
+        self.versao += 1
+        self.estado_mudou.notify_all()
+
+    def aguardar_versao(self, versao, timeout):
+        """
+        Bloqueia até o estado passar da versão informada (long-poll).
+
+        Args:
+            versao (int): Última versão que o chamador já tem
+            timeout (float): Espera máxima em segundos
 
+        Returns:
+            int: Versão atual (igual a `versao` se o tempo esgotou sem mudanças)
+        """
+        with self.estado_mudou:
+            self.estado_mudou.wait_for(lambda: self.versao != versao, timeout)
+            return self.versao
+
+    def _confirmar_entradas(self):
+        """
+        Marca as entradas pendentes como aplicadas neste tick (chamado em atualizar()).
+
+        Comandos alteram flags na hora, mas o efeito (movimento, tiro) só
+        acontece no tick seguinte: é esse tick que o eco informa.
+        """
+        agora = time.perf_counter()
+        for origem, seq, t_cliente, recebido_em, tick_recebido in self.entradas_pendentes:
+            self.atraso_fila_ms.registrar((agora - recebido_em) * 1000)
+            self.atraso_ticks.registrar(self.tick - tick_recebido)
+            eco = self.entradas_aplicadas.get(origem)
+            if eco is None or seq > eco["seq"]:
+                self.entradas_aplicadas[origem] = {"seq": seq, "tick": self.tick, "t_cliente": t_cliente}
+        self.entradas_pendentes.clear()
+
+    def esquecer_origem(self, origem):
+        """Remove o eco de uma origem (ex: cliente desconectado)."""
+        with self.trava:
+            if self.entradas_aplicadas.pop(origem, None) is not None:
+                self._nova_versao()
+
+    def metricas_latencia(self):
+        """Histogramas de atraso das entradas rastreadas."""
+        with self.trava:
+            return {"atraso_fila_ms": self.atraso_fila_ms.para_dict(),
+                    "atraso_ticks": self.atraso_ticks.para_dict()}
+
+    def _aplicar_comando(self, comando, estado):
+        """Aplica um comando já registrado (chamado com a trava adquirida)."""
         # Sempre permite reiniciar
         if comando == "reiniciar":
             self.iniciar_partida()
@@ -262,7 +433,7 @@ class JogoHeadless:
             print(f"Erro ao mover projéteis: {e}")
 
     def inimigos_atiram(self):
-        agora = pygame.time.get_ticks()
+        agora = self.agora()
         if (agora - self.tempo_ultimo_tiro_inimigo > self.intervalo_tiro_inimigo and
             len(self.projeteis_inimigo) < self.max_tiros_inimigos and
             len(self.inimigos) > 0):
@@ -292,31 +463,64 @@ class JogoHeadless:
     def atualizar_efeitos_explosao(self):
         # Apenas atualiza o estado lógico, sem renderização
         for efeito in self.efeitos_explosao[:]:
-            efeito.atualizar()
+            efeito.atualizar(self.tempo_ms)
             if not efeito.ativo:
                 self.efeitos_explosao.remove(efeito)
 
     def atualizar(self):
         """
         Método para atualizar o estado do jogo.
+
+        Cada chamada é um TICK: o relógio lógico avança sempre,
+        mesmo no menu ou pausado (replays indexam comandos por tick).
+        A versão do estado só avança se o tick mudou algo visível
+        (simulação rodando ou eco de entradas).
         """
-        if self.pausado or self.game_over or self.estado != ESTADO_JOGANDO:
-            return
+        with self.trava:
+            self.tick += 1
+            self.tempo_ms += INTERVALO_TICK_MS
+            if self.entradas_pendentes:
+                self._confirmar_entradas()
+                self._nova_versao()
+
+            if self.pausado or self.game_over or self.estado != ESTADO_JOGANDO:
+                return
+            self._nova_versao()
+
+            # Aplica comandos contínuos antes de atualizar o resto do jogo
+            self.aplicar_controles_continuos()
+
+            self.mover_inimigos()
+            self.mover_projeteis()
+            self.inimigos_atiram()
+            self.verificar_colisoes()
+            self.atualizar_efeitos_explosao()
+
+            # Reinicia o nível se todos os inimigos forem destruídos
+            if len(self.inimigos) == 0:
+                self.velocidade_inimigo_base += 0.5
+                self.inicializar_jogo()
+                # Mantém a dificuldade aumentando a cada onda
+
+    def avancar(self, n_ticks=1):
+        """
+        Executa até n_ticks chamadas de atualizar() (frame skip / action repeat).
 
-        # Aplica comandos contínuos antes de atualizar o resto do jogo
-        self.aplicar_controles_continuos()
+        Para antes se a partida sair do estado de jogo (ex: game over),
+        evitando ticks inúteis. Não monta estado nem observação.
 
-        self.mover_inimigos()
-        self.mover_projeteis()
-        self.inimigos_atiram()
-        self.verificar_colisoes()
-        self.atualizar_efeitos_explosao()
+        Args:
+            n_ticks (int): Número máximo de ticks a simular
 
-        # Reinicia o nível se todos os inimigos forem destruídos
-        if len(self.inimigos) == 0:
-            self.velocidade_inimigo_base += 0.5
-            self.inicializar_jogo()
-            # Mantém a dificuldade aumentando a cada onda
+        Returns:
+            int: Ticks efetivamente executados
+        """
+        with self.trava:
+            for executados in range(n_ticks):
+                if self.estado != ESTADO_JOGANDO:
+                    return executados
+                self.atualizar()
+            return n_ticks
 
     def entrar_game_over(self):
         """Configura estado de game over e limpa controles contínuos."""
@@ -344,7 +548,7 @@ class JogoHeadless:
 
         # Tiro contínuo (segurando)
         if self.comandos_ativos["atirar"]:
-            agora = pygame.time.get_ticks()
+            agora = self.agora()
             if agora - self.tempo_ultimo_tiro > self.intervalo_tiro:
                 projetil = self.jogador_business.atirar()
                 if projetil:
@@ -356,12 +560,18 @@ class JogoHeadless:
         Retorna um dicionário representando o estado atual do jogo.
         Usado para enviar dados ao cliente.
         """
+        with self.trava:
+            return self._montar_estado()
+
+    def _montar_estado(self):
+        """Monta o dicionário de estado (chamado com a trava adquirida)."""
         estado = {
             "jogador": {
                 "x": self.jogador.x,
                 "y": self.jogador.y,
                 "largura": self.jogador.largura,
-                "altura": self.jogador.altura
+                "altura": self.jogador.altura,
+                "velocidade": self.jogador_business.velocidade  # Predição no cliente usa a mesma regra
             },
             "inimigos": [
                 {
@@ -401,10 +611,161 @@ class JogoHeadless:
                 "opcoes": self.game_over_opcoes,
                 "selecionada": self.game_over_selecionada
             },
-            "deseja_sair": self.deseja_sair
+            "deseja_sair": self.deseja_sair,
+            "semente": self.semente,
+            "tick": self.tick,
+            "versao": self.versao,
+            "modo_ia": self.modo_ia,
+            "entradas": {origem: dict(eco) for origem, eco in self.entradas_aplicadas.items()}
         }
         return estado
 
+    def hash_estado(self):
+        """
+        Retorna hash SHA-256 (hex) do estado de simulação.
+
+        Empacota de forma canônica tudo que influencia a partida
+        (relógio, flags, pontuação, entidades, timers e RNG).
+        Usado para verificar replays: mesma entrada => mesmo hash.
+        """
+        with self.trava:
+            h = hashlib.sha256()
+            h.update(struct.pack(
+                "<qqbbbbbqqdqq",
+                self.tick, self.tempo_ms, self.estado,
+                self.pausado, self.game_over, self.menu_selecionada, self.game_over_selecionada,
+                self.pontuacao.pontos, self.pontuacao.vidas_jogador,
+                self.velocidade_inimigo_base,
+                self.tempo_ultimo_tiro, self.tempo_ultimo_tiro_inimigo,
+            ))
+            h.update(bytes(self.comandos_ativos[c] for c in ("esquerda", "direita", "cima", "baixo", "atirar")))
+            h.update(struct.pack("<dd", self.jogador.x, self.jogador.y))
+            for inimigo in self.inimigos:
+                h.update(struct.pack("<ddbb", inimigo.x, inimigo.y, inimigo.tipo, inimigo.direcao))
+            h.update(b"|")
+            for p in self.projeteis_jogador + self.projeteis_inimigo:
+                h.update(struct.pack("<ddb", p.x, p.y, p.eh_inimigo))
+            h.update(b"|")
+            for e in self.efeitos_explosao:
+                h.update(struct.pack("<ddq", e.x, e.y, e.tempo_criacao))
+            h.update(repr(self.rng.getstate()).encode())
+            return h.hexdigest()
+
+    def snapshot(self):
+        """
+        Captura o estado completo da simulação em um SnapshotJogo.
+
+        Muito mais rápido que copy.deepcopy: lê apenas os números
+        necessários para reconstruir as entidades (sem Rects, sem sprites).
+
+        Returns:
+            SnapshotJogo: Estado que pode ser passado para restore()
+        """
+        with self.trava:
+            comandos = self.comandos_ativos
+            escalares = (
+                self.tick, self.tempo_ms, self.semente, self.estado,
+                self.pausado, self.game_over, self.deseja_sair,
+                self.menu_selecionada, self.game_over_selecionada,
+                self.pontuacao.pontos, self.pontuacao.vidas_jogador,
+                self.velocidade_inimigo_base,
+                self.tempo_ultimo_tiro, self.tempo_ultimo_tiro_inimigo,
+                self.jogador.x, self.jogador.y,
+                comandos["esquerda"], comandos["direita"], comandos["cima"],
+                comandos["baixo"], comandos["atirar"],
+            )
+            valores = []
+            for inimigo in self.inimigos:
+                valores += (inimigo.x, inimigo.y, inimigo.tipo, inimigo.direcao)
+            for p in self.projeteis_jogador:
+                valores += (p.x, p.y)
+            for p in self.projeteis_inimigo:
+                valores += (p.x, p.y)
+            for e in self.efeitos_explosao:
+                valores += (e.x, e.y, e.tamanho_inicial, e.tempo_criacao)
+            contagens = (len(self.inimigos), len(self.projeteis_jogador),
+                         len(self.projeteis_inimigo), len(self.efeitos_explosao))
+            return SnapshotJogo(escalares, contagens, array("d", valores), self.rng.getstate())
+
+    def restore(self, snapshot):
+        """
+        Restaura o estado capturado por snapshot().
+
+        As listas de entidades são atualizadas IN-PLACE, então as classes
+        Business continuam apontando para as mesmas listas.
+
+        Args:
+            snapshot (SnapshotJogo): Estado a restaurar
+
+        Raises:
+            RuntimeError: Se houver replay sendo gravado (restaurar quebraria o replay)
+        """
+        with self.trava:
+            if self.gravador:
+                raise RuntimeError("Não é possível restaurar snapshot durante a gravação de um replay")
+            self._nova_versao()
+            (self.tick, self.tempo_ms, self.semente, self.estado,
+             self.pausado, self.game_over, self.deseja_sair,
+             self.menu_selecionada, self.game_over_selecionada,
+             pontos, vidas, velocidade_base,
+             self.tempo_ultimo_tiro, self.tempo_ultimo_tiro_inimigo,
+             jogador_x, jogador_y,
+             esquerda, direita, cima, baixo, atirar) = snapshot.escalares
+            self.comandos_ativos.update(esquerda=esquerda, direita=direita, cima=cima,
+                                        baixo=baixo, atirar=atirar)
+            self.pontuacao.definir_pontos(pontos)
+            self.pontuacao.definir_vidas(vidas)
+            self.velocidade_inimigo_base = velocidade_base
+            self.inimigo_business.velocidade_base = velocidade_base
+            self.jogador.x = jogador_x
+            self.jogador.y = jogador_y
+            self.rng.setstate(snapshot.rng)
+
+            n_inimigos, n_tiros_jogador, n_tiros_inimigo, n_explosoes = snapshot.contagens
+            valores = snapshot.entidades
+            i = 0
+            inimigos = []
+            for _ in range(n_inimigos):
+                inimigo = Inimigo(valores[i], valores[i + 1], tipo=int(valores[i + 2]))
+                if valores[i + 3] < 0:
+                    inimigo.direcao = -1
+                inimigos.append(inimigo)
+                i += CAMPOS_INIMIGO
+            self.inimigos[:] = inimigos
+
+            tiros_jogador = []
+            for _ in range(n_tiros_jogador):
+                tiros_jogador.append(Projetil(valores[i], valores[i + 1]))
+                i += CAMPOS_PROJETIL
+            self.projeteis_jogador[:] = tiros_jogador
+            # Jogador mantém a mesma lista de tiros que projeteis_jogador
+            self.jogador.limpar_tiros()
+            for tiro in tiros_jogador:
+                self.jogador.adicionar_tiro(tiro)
+
+            tiros_inimigo = []
+            for _ in range(n_tiros_inimigo):
+                tiros_inimigo.append(Projetil(valores[i], valores[i + 1], eh_inimigo=True))
+                i += CAMPOS_PROJETIL
+            self.projeteis_inimigo[:] = tiros_inimigo
+
+            efeitos = []
+            for _ in range(n_explosoes):
+                efeitos.append(EfeitoExplosao(valores[i], valores[i + 1], tamanho=valores[i + 2],
+                                              tempo_criacao=int(valores[i + 3])))
+                i += CAMPOS_EXPLOSAO
+            self.efeitos_explosao[:] = efeitos
+
+    def finalizar_gravacao(self):
+        """
+        Encerra a gravação de replay (se houver), escrevendo o trailer
+        com tick final, pontuação e hash do estado para verificação.
+        """
+        with self.trava:
+            if self.gravador:
+                self.gravador.finalizar(self.tick, self.pontuacao.pontos, self.hash_estado())
+                self.gravador = None
+
     def resetar_comandos_continuos(self):
         """Limpa o estado de entradas contínuas para evitar movimento preso."""
         for comando in self.comandos_ativos:
@@ -419,8 +780,10 @@ class JogoHeadless:
         elif comando == "menu_selecionar":
             opcao = self.menu_opcoes[self.menu_selecionada]
             if opcao == "JOGAR COM IA":
+                self.modo_ia = True
                 self.iniciar_partida()
             elif opcao == "JOGAR SOLO":
+                self.modo_ia = False
                 self.iniciar_partida()
             elif opcao == "SAIR":
                 # No webservice não encerramos o servidor; sinalizamos intenção
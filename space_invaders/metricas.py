@@ -0,0 +1,76 @@
+# ============================================================================
+# METRICAS.PY - HISTOGRAMAS DE LATÊNCIA
+# ============================================================================
+"""
+PROPÓSITO:
+Histograma de faixas fixas para medições de latência no servidor
+(custo constante por amostra e memória fixa, independente do tráfego).
+
+USADO POR: JogoHeadless (atraso de fila e de ticks das entradas)
+"""
+
+import bisect  # Busca da faixa de cada amostra
+
+# Limites superiores (inclusivos) das faixas; a última faixa é "acima do maior limite"
+LIMITES_ATRASO_MS = (1, 2, 5, 10, 20, 30, 40, 50, 75, 100, 150, 200, 300, 500, 1000)
+LIMITES_ATRASO_TICKS = (0, 1, 2, 3, 4, 5, 10, 20, 50)
+
+
+class Histograma:
+    """
+    Contagem de amostras por faixa.
+
+    ATRIBUTOS:
+    - limites: Limites superiores das faixas (ordenados)
+    - contagens: Uma contagem por faixa + faixa de estouro
+    - total, soma, maximo: Estatísticas agregadas
+    """
+
+    def __init__(self, limites):
+        """
+        Args:
+            limites (sequence[float]): Limites superiores crescentes das faixas
+        """
+        self.limites = tuple(limites)
+        self.contagens = [0] * (len(self.limites) + 1)
+        self.total = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, valor):
+        """Acrescenta uma amostra."""
+        self.contagens[bisect.bisect_left(self.limites, valor)] += 1
+        self.total += 1
+        self.soma += valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, p):
+        """
+        Estimativa do percentil p (0-100): limite superior da faixa que o contém.
+
+        Returns:
+            float|None: None sem amostras; o máximo observado se cair na faixa de estouro
+        """
+        if self.total == 0:
+            return None
+        alvo = self.total * p / 100
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo and contagem:
+                return self.limites[i] if i < len(self.limites) else self.maximo
+        return self.maximo
+
+    def para_dict(self):
+        """Representação JSON; faixas em ordem, com limite superior (None = estouro)."""
+        return {
+            "total": self.total,
+            "media": self.soma / self.total if self.total else None,
+            "maximo": self.maximo,
+            "p50": self.percentil(50),
+            "p90": self.percentil(90),
+            "p99": self.percentil(99),
+            "faixas": [{"ate": limite, "contagem": contagem}
+                       for limite, contagem in zip(self.limites + (None,), self.contagens)],
+        }
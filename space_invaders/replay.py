@@ -0,0 +1,283 @@
+# ============================================================================
+# REPLAY.PY - GRAVAÇÃO E REPRODUÇÃO DE PARTIDAS (APENAS ENTRADAS)
+# ============================================================================
+"""
+PROPÓSITO:
+Grava uma partida do JogoHeadless como SEMENTE + fluxo de comandos indexados
+por tick, e reproduz essa gravação re-simulando o jogo sem interface.
+
+POR QUE GRAVAR SÓ AS ENTRADAS?
+- A simulação headless é DETERMINÍSTICA (relógio lógico + RNG com semente)
+- Mesma semente + mesmos comandos nos mesmos ticks = mesmo estado final
+- Um replay ocupa poucos bytes por comando (muito menor que dumps de estado)
+- Permite reproduzir bugs e validar pontuações no servidor
+
+FORMATO BINÁRIO (streaming, little-endian):
+- Cabeçalho: b"SIRP" + versão (u8) + semente (u64)
+- Registro:  byte de comando ((índice << 2) | código do estado)
+             + delta de tick em relação ao registro anterior (varint)
+- Trailer:   0xFF + tick final (varint) + pontuação (varint)
+             + hash SHA-256 do estado (32 bytes)
+  O trailer só existe se a gravação foi finalizada; um arquivo truncado
+  ainda pode ser reproduzido, apenas sem verificação.
+
+USO:
+    python -m space_invaders.replay partida.sirp
+"""
+
+import struct  # Empacotamento binário do cabeçalho
+import sys     # Código de saída da ferramenta de linha de comando
+
+# ============================================================================
+# CONSTANTES DO FORMATO
+# ============================================================================
+MAGICO_REPLAY = b"SIRP"  # Identificador do arquivo (Space Invaders RePlay)
+VERSAO_REPLAY = 1
+MARCADOR_FIM = 0xFF      # Byte que inicia o trailer
+
+# Tabela de comandos conhecidos (o índice é gravado no arquivo)
+# IMPORTANTE: apenas ACRESCENTAR no final para manter compatibilidade
+COMANDOS_REPLAY = (
+    "esquerda", "direita", "cima", "baixo", "atirar",
+    "reiniciar", "pausar", "menu",
+    "menu_cima", "menu_baixo", "menu_selecionar",
+)
+INDICE_COMANDO = {comando: i for i, comando in enumerate(COMANDOS_REPLAY)}
+
+# Códigos de estado: processar_comando só distingue "soltar" do resto
+ESTADOS_REPLAY = (None, "pressionar", "soltar")
+
+
+def _codificar_varint(valor):
+    """Codifica inteiro não negativo em varint (7 bits por byte)."""
+    saida = bytearray()
+    while valor >= 0x80:
+        saida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    saida.append(valor)
+    return bytes(saida)
+
+
+def _ler_varint(arquivo):
+    """Lê um varint do arquivo; retorna None se o arquivo terminou."""
+    resultado = 0
+    deslocamento = 0
+    while True:
+        byte = arquivo.read(1)
+        if not byte:
+            return None
+        valor = byte[0]
+        resultado |= (valor & 0x7F) << deslocamento
+        if not valor & 0x80:
+            return resultado
+        deslocamento += 7
+
+
+# ============================================================================
+# CLASSE GRAVADORREPLAY - ESCRITA EM STREAMING
+# ============================================================================
+class GravadorReplay:
+    """
+    Grava comandos de uma partida em formato binário compacto.
+
+    RESPONSABILIDADE: Apenas serializar (não conhece regras do jogo)
+    USADO POR: JogoHeadless (registra cada comando processado)
+    """
+
+    def __init__(self, destino, semente):
+        """
+        Abre o destino e escreve o cabeçalho.
+
+        Args:
+            destino (str|Path|arquivo binário): Caminho ou arquivo aberto em modo binário
+            semente (int): Semente do RNG da partida (0 <= semente < 2**64)
+        """
+        if hasattr(destino, "write"):
+            self.arquivo = destino
+            self.fechar_arquivo = False
+        else:
+            self.arquivo = open(destino, "wb")
+            self.fechar_arquivo = True
+        self.semente = semente
+        self.ultimo_tick = 0
+        self.finalizado = False
+        self.arquivo.write(MAGICO_REPLAY + struct.pack("<BQ", VERSAO_REPLAY, semente))
+
+    def registrar(self, tick, comando, estado=None):
+        """
+        Registra um comando aplicado no tick informado.
+
+        Comandos desconhecidos não são gravados (processar_comando os ignora).
+
+        Args:
+            tick (int): Tick do jogo em que o comando foi aplicado
+            comando (str): Nome do comando
+            estado (str|None): "pressionar", "soltar" ou None
+        """
+        indice = INDICE_COMANDO.get(comando)
+        if indice is None or self.finalizado:
+            return
+        if estado is None:
+            codigo = 0
+        elif estado == "soltar":
+            codigo = 2
+        else:
+            codigo = 1  # Qualquer outro valor equivale a pressionar
+        delta = tick - self.ultimo_tick
+        self.ultimo_tick = tick
+        self.arquivo.write(bytes((indice << 2 | codigo,)) + _codificar_varint(delta))
+
+    def finalizar(self, tick, pontos, hash_estado):
+        """
+        Escreve o trailer de verificação e fecha o arquivo (se foi aberto aqui).
+
+        Args:
+            tick (int): Tick final da simulação
+            pontos (int): Pontuação final
+            hash_estado (str): Hash hexadecimal retornado por JogoHeadless.hash_estado()
+        """
+        if self.finalizado:
+            return
+        self.finalizado = True
+        self.arquivo.write(bytes((MARCADOR_FIM,)) + _codificar_varint(tick)
+                           + _codificar_varint(pontos) + bytes.fromhex(hash_estado))
+        self.arquivo.flush()
+        if self.fechar_arquivo:
+            self.arquivo.close()
+
+
+# ============================================================================
+# CLASSE LEITORREPLAY - LEITURA EM STREAMING
+# ============================================================================
+class LeitorReplay:
+    """
+    Lê um replay gravado por GravadorReplay.
+
+    Iterar sobre o leitor produz tuplas (tick, comando, estado).
+    Após a iteração, o atributo trailer contém {"tick", "pontos", "hash"}
+    ou None se a gravação não foi finalizada.
+    """
+
+    def __init__(self, origem):
+        """
+        Abre a origem e valida o cabeçalho.
+
+        Args:
+            origem (str|Path|arquivo binário): Caminho ou arquivo aberto em modo binário
+
+        Raises:
+            ValueError: Se o arquivo não for um replay válido
+        """
+        if hasattr(origem, "read"):
+            self.arquivo = origem
+        else:
+            self.arquivo = open(origem, "rb")
+        cabecalho = self.arquivo.read(len(MAGICO_REPLAY) + 9)
+        if len(cabecalho) < len(MAGICO_REPLAY) + 9 or not cabecalho.startswith(MAGICO_REPLAY):
+            raise ValueError("Arquivo não é um replay do Space Invaders")
+        self.versao, self.semente = struct.unpack("<BQ", cabecalho[len(MAGICO_REPLAY):])
+        if self.versao != VERSAO_REPLAY:
+            raise ValueError(f"Versão de replay não suportada: {self.versao}")
+        self.trailer = None
+
+    def __iter__(self):
+        tick = 0
+        while True:
+            byte = self.arquivo.read(1)
+            if not byte:
+                return  # Gravação interrompida: sem trailer
+            if byte[0] == MARCADOR_FIM:
+                tick_final = _ler_varint(self.arquivo)
+                pontos = _ler_varint(self.arquivo)
+                hash_bytes = self.arquivo.read(32)
+                if tick_final is not None and pontos is not None and len(hash_bytes) == 32:
+                    self.trailer = {"tick": tick_final, "pontos": pontos, "hash": hash_bytes.hex()}
+                return
+            delta = _ler_varint(self.arquivo)
+            if delta is None:
+                return
+            tick += delta
+            indice, codigo = byte[0] >> 2, byte[0] & 0x3
+            if indice >= len(COMANDOS_REPLAY) or codigo >= len(ESTADOS_REPLAY):
+                raise ValueError(f"Registro inválido no replay: {byte[0]:#x}")
+            yield tick, COMANDOS_REPLAY[indice], ESTADOS_REPLAY[codigo]
+
+    def fechar(self):
+        """Fecha o arquivo de origem."""
+        self.arquivo.close()
+
+
+# ============================================================================
+# REPRODUÇÃO - RE-SIMULAÇÃO HEADLESS EM VELOCIDADE MÁXIMA
+# ============================================================================
+def reproduzir_replay(origem):
+    """
+    Re-simula um replay sem interface e verifica o resultado.
+
+    LÓGICA:
+    1. Cria JogoHeadless com a semente gravada
+    2. Para cada comando: avança ticks até o tick gravado e aplica o comando
+    3. Avança até o tick final do trailer e compara pontuação e hash
+
+    Args:
+        origem (str|Path|arquivo binário): Replay a reproduzir
+
+    Returns:
+        dict: {"semente", "tick", "pontos", "hash", "valido"}
+              valido é None quando o replay não tem trailer
+    """
+    from .jogo_headless import JogoHeadless  # Import local evita ciclo
+
+    leitor = LeitorReplay(origem)
+    try:
+        jogo = JogoHeadless(semente=leitor.semente)
+        for tick, comando, estado in leitor:
+            while jogo.tick < tick:
+                jogo.atualizar()
+            jogo.processar_comando(comando, estado)
+        if leitor.trailer:
+            while jogo.tick < leitor.trailer["tick"]:
+                jogo.atualizar()
+    finally:
+        leitor.fechar()
+
+    resultado = {
+        "semente": leitor.semente,
+        "tick": jogo.tick,
+        "pontos": jogo.pontuacao.pontos,
+        "hash": jogo.hash_estado(),
+        "valido": None,
+    }
+    if leitor.trailer:
+        resultado["valido"] = (leitor.trailer["pontos"] == resultado["pontos"]
+                               and leitor.trailer["hash"] == resultado["hash"])
+    return resultado
+
+
+def main(argv=None):
+    """
+    FERRAMENTA DE LINHA DE COMANDO - Reproduz e verifica replays
+
+    Retorna 0 se todos os replays forem válidos (ou sem trailer), 1 caso contrário.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Uso: python -m space_invaders.replay arquivo.sirp [...]")
+        return 2
+    codigo = 0
+    for caminho in argv:
+        resultado = reproduzir_replay(caminho)
+        if resultado["valido"] is None:
+            situacao = "SEM TRAILER"
+        elif resultado["valido"]:
+            situacao = "OK"
+        else:
+            situacao = "DIVERGENTE"
+            codigo = 1
+        print(f"{caminho}: {situacao} | semente={resultado['semente']} "
+              f"ticks={resultado['tick']} pontos={resultado['pontos']} hash={resultado['hash'][:16]}")
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
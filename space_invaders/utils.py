@@ -11,8 +11,11 @@ PRINCÍPIO DE POO:
 - REUTILIZAÇÃO: Importado por todas as outras classes
 """
 
-import pygame  # Biblioteca para desenvolvimento de jogos
-import os      # Para manipulação de caminhos de arquivos
+import pygame   # Biblioteca para desenvolvimento de jogos
+import os       # Para manipulação de caminhos de arquivos
+import hashlib  # Derivação de sementes independentes
+import struct   # Empacotamento binário das sementes
+import functools  # Cache de fontes e textos renderizados
 
 # ============================================================================
 # CONSTANTES DO JOGO - CONFIGURAÇÕES PRINCIPAIS
@@ -33,6 +36,15 @@ VELOCIDADE_JOGADOR = 5  # Velocidade de movimento da nave do jogador
 VELOCIDADE_TIRO = 7     # Velocidade dos projéteis
 VELOCIDADE_INIMIGO = 2  # Velocidade lateral dos inimigos
 
+# Duração lógica de um tick do jogo headless (relógio determinístico)
+INTERVALO_TICK_MS = 30  # ~33 atualizações por segundo (mesmo ritmo do game loop web)
+
+# Quadros pré-desenhados da animação de explosão sem sprite (~19 ms cada em 300 ms de vida)
+PASSOS_EXPLOSAO = 16
+
+# Renderização por retângulos sujos: acima disto, flip() da tela inteira
+MAX_RETANGULOS_SUJOS = 400
+
 # ============================================================================
 # CONSTANTES DE INTERFACE - CORES DE TEXTO E MENUS
 # ============================================================================
@@ -79,7 +91,7 @@ class EfeitoExplosao:
     ========================================================================
     """
 
-    def __init__(self, x: int, y: int, tamanho: int = 20):
+    def __init__(self, x: int, y: int, tamanho: int = 20, tempo_criacao: int = None):
         """
         CONSTRUTOR DA CLASSE EFEITOEXPLOSAO
 
@@ -87,6 +99,7 @@ class EfeitoExplosao:
             x (int): Posição horizontal da explosão
             y (int): Posição vertical da explosão
             tamanho (int): Tamanho inicial da explosão em pixels
+            tempo_criacao (int, optional): Momento de criação em ms; se None usa pygame.time.get_ticks()
         """
         # ENCAPSULAMENTO: Atributos privados
         self.__x = x
@@ -94,8 +107,10 @@ class EfeitoExplosao:
         self.__tamanho_inicial = tamanho
         self.__tamanho_atual = tamanho
         self.__tempo_vida = 300  # Duração em milissegundos
-        self.__tempo_criacao = pygame.time.get_ticks()  # Momento da criação
+        # Momento da criação (relógio lógico injetado ou relógio do pygame)
+        self.__tempo_criacao = pygame.time.get_ticks() if tempo_criacao is None else tempo_criacao
         self.__ativo = True      # Explosão está ativa
+        self.__progresso = 0.0   # Fração do tempo de vida já decorrida (0 a 1)
         self.__sprite = None     # Sprite opcional para renderização
 
         # Cores para efeito de fallback (gradiente de explosão)
@@ -140,6 +155,11 @@ class EfeitoExplosao:
         """Momento de criação (somente leitura)"""
         return self.__tempo_criacao
 
+    @property
+    def progresso(self) -> float:
+        """Fração do tempo de vida decorrida na última atualização, 0 a 1 (somente leitura)"""
+        return self.__progresso
+
     @property
     def ativo(self) -> bool:
         """Status ativo da explosão (somente leitura)"""
@@ -163,43 +183,75 @@ class EfeitoExplosao:
     # ========================================================================
     # MÉTODOS PÚBLICOS - LÓGICA DE ANIMAÇÃO
     # ========================================================================
-    def atualizar(self):
+    def atualizar(self, tempo_atual: int = None):
         """
         LÓGICA: Atualiza animação da explosão
         - Verifica se tempo expirou
         - Aumenta tamanho progressivamente
+
+        Args:
+            tempo_atual (int, optional): Tempo atual em ms; se None usa pygame.time.get_ticks()
         """
-        tempo_atual = pygame.time.get_ticks()
+        if tempo_atual is None:
+            tempo_atual = pygame.time.get_ticks()
         tempo_decorrido = tempo_atual - self.__tempo_criacao
 
         if tempo_decorrido >= self.__tempo_vida:
             self.__ativo = False  # Desativa explosão
+            self.__progresso = 1.0
         else:
             # Efeito de expansão progressiva
-            progresso = tempo_decorrido / self.__tempo_vida
-            self.__tamanho_atual = self.__tamanho_inicial * (1 + progresso * 0.5)
+            self.__progresso = max(0.0, tempo_decorrido / self.__tempo_vida)
+            self.__tamanho_atual = self.__tamanho_inicial * (1 + self.__progresso * 0.5)
+
+# ============================================================================
+# FUNÇÕES UTILITÁRIAS - ALEATORIEDADE REPRODUTÍVEL
+# ============================================================================
+def derivar_semente(semente_base, indice):
+    """
+    Deriva uma semente de 64 bits independente a partir de (base, índice)
+
+    Usado para simulações em paralelo: cada jogo recebe sua própria
+    semente, determinística e sem correlação com as demais.
+
+    Args:
+        semente_base (int): Semente principal do experimento
+        indice (int): Índice do jogo/episódio
+
+    Returns:
+        int: Semente derivada (0 <= semente < 2**64)
+    """
+    dados = struct.pack("<QQ", semente_base & 0xFFFFFFFFFFFFFFFF, indice & 0xFFFFFFFFFFFFFFFF)
+    return int.from_bytes(hashlib.blake2b(dados, digest_size=8).digest(), "little")
 
 # ============================================================================
 # FUNÇÕES UTILITÁRIAS - CARREGAMENTO DE RECURSOS
 # ============================================================================
-def carregar_sprite(nome_arquivo, largura, altura):
+def carregar_sprite(nome_arquivo, largura, altura, diretorio="static"):
     """
     Carrega e redimensiona sprite do diretório static
 
+    Com uma janela aberta, converte para o formato da tela (convert_alpha):
+    sem isso cada blit converte os pixels de novo. O Jogo usa o atlas
+    (atlas.py), que faz o mesmo para todos os sprites de uma vez.
+
     TRATAMENTO DE ERROS: Retorna fallback magenta se falhar
 
     Args:
         nome_arquivo (str): Nome do arquivo de imagem
         largura (int): Largura desejada
         altura (int): Altura desejada
+        diretorio (str|Path): Pasta das imagens
 
     Returns:
         pygame.Surface: Imagem carregada ou fallback
     """
-    caminho = os.path.join("static", nome_arquivo)
+    caminho = os.path.join(diretorio, nome_arquivo)
     try:
         imagem = pygame.image.load(caminho)
         imagem = pygame.transform.scale(imagem, (largura, altura))
+        if pygame.display.get_surface() is not None:
+            imagem = imagem.convert_alpha()
         return imagem
     except Exception as e:
         print(f"Erro ao carregar sprite {nome_arquivo}: {e}")
@@ -207,3 +259,50 @@ def carregar_sprite(nome_arquivo, largura, altura):
         surface = pygame.Surface((largura, altura))
         surface.fill((255, 0, 255))  # Magenta
         return surface
+
+# ============================================================================
+# FUNÇÕES UTILITÁRIAS - TEXTO (CACHE DE FONTES E SUPERFÍCIES)
+# ============================================================================
+MAX_TEXTOS_CACHE = 256  # Superfícies de texto mantidas (HUD muda a cada ponto)
+
+@functools.lru_cache(maxsize=None)
+def obter_fonte(tamanho, nome=None):
+    """
+    Retorna a fonte pygame de (nome, tamanho), criada uma única vez
+
+    Criar pygame.font.Font lê e prepara o arquivo da fonte: caro demais
+    para fazer a cada quadro.
+
+    Args:
+        tamanho (int): Tamanho da fonte
+        nome (str, optional): Arquivo da fonte (None = fonte padrão do pygame)
+
+    Returns:
+        pygame.font.Font: Fonte compartilhada
+    """
+    return pygame.font.Font(nome, tamanho)
+
+@functools.lru_cache(maxsize=MAX_TEXTOS_CACHE)
+def renderizar_texto(texto, tamanho, cor, nome=None):
+    """
+    Retorna o texto renderizado (antialiasing), reaproveitando a superfície
+    enquanto (nome, tamanho, texto, cor) não mudar
+
+    Textos fixos (títulos, instruções) são renderizados uma vez; o HUD só
+    renderiza de novo quando pontos ou vidas mudam.
+
+    Args:
+        texto (str): Texto a renderizar
+        tamanho (int): Tamanho da fonte
+        cor (tuple): Cor RGB (tupla, para servir de chave)
+        nome (str, optional): Arquivo da fonte
+
+    Returns:
+        pygame.Surface: Superfície compartilhada - apenas para blit, não alterar
+    """
+    return obter_fonte(tamanho, nome).render(texto, True, cor)
+
+def limpar_cache_texto():
+    """Descarta fontes e textos em cache (necessário após pygame.quit())."""
+    renderizar_texto.cache_clear()
+    obter_fonte.cache_clear()
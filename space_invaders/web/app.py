@@ -21,15 +21,30 @@ from flask import Flask, render_template, jsonify, request, redirect, url_for, s
 from flask_socketio import SocketIO  # Importa SocketIO para comunicação de dados em tempo real (websockets) 
 from functools import wraps  # Importa wraps para criar decorators que preservam metadados da função original
 import threading  # Importa threading para lidar com execução concorrente (game loop)
-import json  # Importa biblioteca para manipulação de arquivos JSON
-import hashlib  # Importa hashlib para criptografia (hashing) de senhas
 import time  # Importa time para funções relacionadas a tempo (timestamp)
+import math  # Arredonda o Retry-After para cima
+import hashlib  # Versão (hash) do atlas de sprites
+import os  # Importa os para ler variáveis de ambiente (pasta das políticas treinadas)
 from ..jogo_headless import JogoHeadless  # Importa a classe JogoHeadless do pacote pai (..)
+from ..atlas import Atlas  # Todos os sprites num único PNG para o cliente web
+from ..utils import INTERVALO_TICK_MS, ESTADO_JOGANDO, ESTADO_GAME_OVER  # Duração lógica de um tick (ms) e estados
+from ..ia.rede import RedeNeural, MIN_CAMADAS, MAX_CAMADAS, MIN_NEURONIOS, MAX_NEURONIOS  # Política (MLP) do modo IA
+from ..ia.inferencia import ServicoInferencia  # Inferência em lote das sessões controladas pela IA
+from ..ia.checkpoint import carregar_politica, nome_politica  # Políticas treinadas (.sipol, carregadas por mmap)
+from .fluxo import ControleFluxo  # Taxa de envio por conexão (confirmações, aba oculta)
+from .senhas import HashSenhas  # KDF com sal (scrypt/pbkdf2) num pool limitado de threads
+from .limite import LimitadorTaxa  # Token bucket por IP e por email (login/cadastro)
+from ..Dados.usuarios import RepositorioUsuarios  # Usuários em memória com gravação em segundo plano
+from ..Dados.banco import RepositorioSQLite  # Backend opcional em SQLite (mesma interface)
+from ..Business.placar_business import PlacarBusiness, MAX_TOP  # Placar persistente (índice ordenado)
 
 # Diretórios relevantes
 BASE_DIR = Path(__file__).resolve().parent.parent  # Define BASE_DIR como o diretório pai do pai deste arquivo (space_invaders/)
 PROJECT_ROOT = BASE_DIR.parent                    # Define PROJECT_ROOT como o diretório pai de BASE_DIR (raiz do projeto)
 DATA_DIR = BASE_DIR / "data"                      # Define DATA_DIR como o subdiretório "data" dentro de BASE_DIR
+BANCO_SQLITE = os.environ.get("SPACE_INVADERS_BANCO")  # Se definido, usuários e resultados ficam neste SQLite
+POLITICAS_DIR = Path(os.environ.get("SPACE_INVADERS_POLITICAS", PROJECT_ROOT / "checkpoints"))  # Políticas treinadas (ia/treino.py)
+DIAGNOSTICO = os.environ.get("SPACE_INVADERS_DIAGNOSTICO") == "1"  # Libera os endpoints de diagnóstico (também com app.debug)
 
 # Inicialização do Flask (controllers/views)
 app = Flask(  # Cria a instância da aplicação Flask
@@ -45,23 +60,49 @@ app.config['SESSION_COOKIE_HTTPONLY'] = True  # Protege o cookie de sessão cont
 
 # Arquivo para armazenar usuários (camada de dados persistentes)
 USUARIOS_FILE = DATA_DIR / "usuarios.json"  # Define o caminho completo para o arquivo JSON de usuários
+# JSON: lê o arquivo uma vez, consultas em memória, gravação em segundo plano; SQLite: WAL + pool de conexões
+repositorio_usuarios = RepositorioSQLite(BANCO_SQLITE) if BANCO_SQLITE else RepositorioUsuarios(USUARIOS_FILE)
+
+placar = PlacarBusiness(repositorio_usuarios)  # Melhor resultado por usuário, indexado uma vez na carga
 
 def carregar_usuarios():
-    """Carrega usuários do arquivo JSON."""
-    if USUARIOS_FILE.exists():  # Verifica se o arquivo de usuários existe
-        with open(USUARIOS_FILE, 'r', encoding='utf-8') as f:  # Abre o arquivo em modo leitura ('r') com encoding UTF-8
-            return json.load(f)  # Carrega e retorna o conteúdo do JSON como um dicionário Python
-    return {}  # Retorna um dicionário vazio se o arquivo não existir
+    """Retorna cópia de todos os usuários (as rotas consultam repositorio_usuarios diretamente)."""
+    return repositorio_usuarios.todos()  # Cópia: alterações só valem via salvar_usuarios
 
 def salvar_usuarios(usuarios):
-    """Salva usuários no arquivo JSON."""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)  # Cria o diretório de dados se não existir (incluindo pais)
-    with open(USUARIOS_FILE, 'w', encoding='utf-8') as f:  # Abre o arquivo em modo escrita ('w') com encoding UTF-8
-        json.dump(usuarios, f, ensure_ascii=False, indent=2)  # Escreve o dicionário no arquivo JSON com formatação legível
+    """Substitui todos os usuários (reescrita atômica do arquivo em segundo plano)."""
+    repositorio_usuarios.substituir(usuarios)  # Arquivo temporário + os.replace na thread de gravação
+
+# Hash de senhas fora das threads do jogo: scrypt (padrão) com sal, custo ajustável por SPACE_INVADERS_KDF*
+senhas = HashSenhas.de_ambiente()  # Pool limitado: no máximo N hashes ao mesmo tempo
+ESPERA_OCUPADO_S = 5  # Retry-After do 503 quando a fila de hash está cheia
 
 def hash_senha(senha):
-    """Gera hash da senha."""
-    return hashlib.sha256(senha.encode()).hexdigest()  # Converte senha para bytes, gera hash SHA-256 e retorna em hex
+    """Gera hash da senha (KDF com sal, calculada no pool de senhas)."""
+    return senhas.gerar(senha)  # Bloqueia só a thread da requisição; RuntimeError se a fila estiver cheia
+
+# Limite de tentativas de login/cadastro, verificado antes do hash e do repositório
+TENTATIVAS_IP_MIN = int(os.environ.get("SPACE_INVADERS_LIMITE_IP", 20))  # Por minuto (e rajada) por IP
+TENTATIVAS_EMAIL_MIN = int(os.environ.get("SPACE_INVADERS_LIMITE_EMAIL", 5))  # Por minuto (e rajada) por conta
+limite_ip = LimitadorTaxa(TENTATIVAS_IP_MIN, TENTATIVAS_IP_MIN / 60)  # Um balde por IP
+limite_email = LimitadorTaxa(TENTATIVAS_EMAIL_MIN, TENTATIVAS_EMAIL_MIN / 60)  # Um balde por email
+
+def limitar_tentativa(email):
+    """
+    Gasta uma tentativa do IP e do email da requisição.
+
+    Email vazio não tem balde próprio (todos dividiriam o mesmo): só o IP limita.
+
+    Returns:
+        int: 0 se permitida; senão segundos até a próxima tentativa (Retry-After)
+    """
+    ip = request.remote_addr or '?'  # IP do socket (cabeçalhos de proxy não são confiáveis)
+    if not limite_ip.consumir(ip):  # Balde do IP vazio
+        return max(1, math.ceil(limite_ip.tentar_em(ip)))  # Espera até a próxima ficha
+    chave = (email or '').strip().lower()  # Mesmo balde para variações de maiúsculas e espaços
+    if chave and not limite_email.consumir(chave):  # Balde do email vazio
+        return max(1, math.ceil(limite_email.tentar_em(chave)))  # Espera até a próxima ficha
+    return 0  # Tentativa permitida
 
 def login_required(f):
     """Decorator para exigir login."""
@@ -72,6 +113,17 @@ def login_required(f):
         return f(*args, **kwargs)  # Executa a função original se estiver logado
     return decorated_function  # Retorna a função decorada
 
+def diagnostico_required(f):
+    """Decorator para endpoints de diagnóstico: exige SPACE_INVADERS_DIAGNOSTICO=1 (ou debug) e login."""
+    @wraps(f)  # Preserva os metadados da função original 'f'
+    def decorated_function(*args, **kwargs):  # Define a função wrapper que aceita quaisquer argumentos
+        if not (DIAGNOSTICO or app.debug):  # Diagnóstico desligado (padrão em produção)
+            return jsonify({"erro": "não encontrado"}), 404  # Mesma resposta de uma rota inexistente
+        if 'usuario_email' not in session:  # API: responde 401 em vez de redirecionar para o login
+            return jsonify({"erro": "login necessário"}), 401  # Sem sessão não há diagnóstico
+        return f(*args, **kwargs)  # Executa a função original
+    return decorated_function  # Retorna a função decorada
+
 # Socket.IO para comunicação em tempo real
 # Usa threading para simplicidade (conforme requisitos)
 socketio = SocketIO(app, async_mode='threading')  # Inicializa SocketIO integrando com o app Flask, modo threading
@@ -85,6 +137,141 @@ thread_lock = threading.Lock()  # Lock para garantir acesso exclusivo ao criar a
 # JogoHeadless coordena Dados/ e Business/ sem lógica de apresentação
 jogo = JogoHeadless()  # Instancia a classe JogoHeadless que gerencia a lógica do jogo
 
+# Controle de fluxo: cada conexão recebe estado_jogo na taxa que consegue processar
+fluxo = ControleFluxo()  # Janela de quadros sem confirmação por cliente
+
+# GET /api/estado condicional (ETag) e long-poll, baseados em jogo.versao
+INSTANCIA_ESTADO = format(time.time_ns(), 'x')  # Distingue ETags de execuções anteriores do servidor
+MAX_ESPERA_LONG_POLL_S = 30.0  # Espera máxima aceita em ?aguardar=
+MAX_LONG_POLLS = 64  # Requisições bloqueadas ao mesmo tempo (cada uma ocupa uma thread)
+long_polls = threading.BoundedSemaphore(MAX_LONG_POLLS)  # Acima do limite, responde sem esperar
+
+# Atlas de sprites do cliente web (um PNG em vez de um por sprite), montado no primeiro acesso
+atlas_web = None  # (png, versao, retângulos)
+atlas_lock = threading.Lock()  # Monta uma única vez mesmo com requisições simultâneas
+
+def obter_atlas_web():
+    """
+    Atlas dos sprites para o cliente web (mesma imagem e retângulos do desktop).
+
+    Returns:
+        tuple: (bytes do PNG, versão = hash do PNG, {nome: [x, y, largura, altura]})
+    """
+    global atlas_web  # Cache do módulo
+    if atlas_web is None:  # Ainda não montado
+        with atlas_lock:  # Uma thread monta, as demais esperam
+            if atlas_web is None:  # Outra thread pode ter montado enquanto esperava
+                atlas = Atlas.montar(PROJECT_ROOT / "static")  # Lê os PNGs uma única vez
+                png = atlas.png()  # Codifica o atlas
+                atlas_web = (png, hashlib.sha256(png).hexdigest()[:16], atlas.para_dict())  # Versão muda se algum sprite mudar
+    return atlas_web  # PNG, versão e retângulos
+
+# Inferência em lote para partidas "JOGAR COM IA" (uma passada da rede por tick para todas as sessões)
+servico_ia = ServicoInferencia(prazo_ms=INTERVALO_TICK_MS / 6)  # Espera no máximo ~5ms por lote
+politicas = {}  # Cache de redes por arquitetura: (camadas, neuronios) -> RedeNeural
+config_ia = (2, 16)  # Arquitetura escolhida no overlay (padrão igual ao configIA do cliente)
+SEMENTE_POLITICA = 0  # Pesos reprodutíveis para arquiteturas ainda sem política treinada
+
+def obter_politica(camadas, neuronios):
+    """
+    Retorna a rede da arquitetura pedida (carregada uma única vez e compartilhada).
+
+    Usa a política treinada POLITICAS_DIR/politica_<camadas>x<neuronios>.sipol
+    (mapeada em memória, somente leitura); sem ela, usa pesos aleatórios fixos.
+    """
+    chave = (camadas, neuronios)
+    if chave not in politicas:  # Primeira sessão com esta arquitetura
+        caminho = POLITICAS_DIR / nome_politica(camadas, neuronios)
+        try:
+            politicas[chave], _ = carregar_politica(caminho)
+        except (OSError, ValueError) as e:  # Sem política treinada (ou arquivo inválido)
+            if caminho.exists():
+                print(f"Erro ao carregar política {caminho}: {e}")
+            politicas[chave] = RedeNeural.aleatoria(camadas, neuronios, semente=SEMENTE_POLITICA)
+    return politicas[chave]
+
+def ler_config_ia(dados):
+    """Valida {"layers", "neuronios"} do overlay; retorna (camadas, neuronios) ou None."""
+    try:
+        camadas = int(dados.get('layers'))  # Número de camadas ocultas
+        neuronios = int(dados.get('neuronios'))  # Neurônios por camada
+    except (AttributeError, TypeError, ValueError):
+        return None  # Payload inválido: mantém a configuração anterior
+    camadas = min(max(camadas, MIN_CAMADAS), MAX_CAMADAS)  # Mesmos limites do overlay
+    neuronios = min(max(neuronios, MIN_NEURONIOS), MAX_NEURONIOS)
+    return camadas, neuronios
+
+def ler_sequencia(dados):
+    """Extrai (seq, t) opcionais do payload de entrada; valores inválidos viram None."""
+    seq, t = dados.get('seq'), dados.get('t')
+    if isinstance(seq, bool) or not isinstance(seq, int):  # bool é subclasse de int
+        return None, None
+    if isinstance(t, bool) or not isinstance(t, (int, float)):
+        t = None
+    return seq, t
+
+def etag_estado(versao):
+    """ETag (fraco) de uma versão do estado: "<instancia>.<versao>"."""
+    return f"{INSTANCIA_ESTADO}.{versao}"
+
+def ler_versao_cliente():
+    """
+    Versão que o cliente já tem: ?versao=N ou o ETag de If-None-Match.
+
+    Returns:
+        int|None: None se ausente, inválida, de outra execução do servidor ou
+                  maior que a versão atual (o cliente recebe o estado na hora)
+    """
+    valor = request.args.get('versao')  # Long-poll por número de versão
+    if valor is None:  # Sem parâmetro: usa o ETag condicional
+        for etag in request.if_none_match.as_set(include_weak=True):
+            instancia, _, valor = etag.partition('.')
+            if instancia == INSTANCIA_ESTADO:
+                break
+        else:
+            return None
+    try:
+        versao = int(valor)
+    except ValueError:
+        return None
+    return versao if 0 <= versao <= jogo.versao else None
+
+# Placar: a partida pertence ao usuário logado que a iniciou
+dono_partida = {"partida": None, "email": None}  # Última partida iniciada -> email da sessão que a iniciou (None = anônima)
+partida_registrada = 0  # Última partida cujo resultado já foi gravado
+
+def marcar_dono_partida(email, partida):
+    """
+    Associa a partida ao usuário do comando que a iniciou.
+
+    Args:
+        email (str|None): Usuário da sessão do comando (None = anônimo: partida sem dono)
+        partida (int|None): Retorno de jogo.processar_comando (None = o comando não iniciou partida)
+    """
+    if partida is not None:  # Só o comando que levou o jogo a "jogando" define o dono
+        dono_partida.update(partida=partida, email=email)  # Comandos seguintes (de qualquer sessão) não mudam o dono
+
+def registrar_fim_partida():
+    """Grava o resultado no placar quando a partida atual chega ao game over (uma vez por partida)."""
+    global partida_registrada
+    if jogo.estado != ESTADO_GAME_OVER or partida_registrada == jogo.partida:
+        return
+    partida_registrada = jogo.partida
+    partida, email = dono_partida["partida"], dono_partida["email"]  # Cópia: comandos chegam em outras threads
+    if partida != jogo.partida or email is None:  # Partida iniciada sem sessão (ex: cliente REST anônimo)
+        return
+    # Só enfileira: a gravação (arquivo ou SQLite) roda na thread do placar, fora do tick
+    placar.enfileirar(email, jogo.pontuacao.pontos,
+                      ticks=jogo.tick - jogo.tick_inicio_partida, semente=jogo.semente, modo_ia=jogo.modo_ia)
+
+def sincronizar_ia():
+    """Registra o jogo no serviço de IA enquanto estiver jogando no modo IA (e remove ao sair)."""
+    deve_controlar = jogo.modo_ia and jogo.estado == ESTADO_JOGANDO
+    if deve_controlar and not servico_ia.controlado(jogo):
+        servico_ia.registrar(jogo, obter_politica(*config_ia))
+    elif not deve_controlar and servico_ia.controlado(jogo):
+        servico_ia.remover(jogo)
+
 # ============================================================================
 # ROTAS (ENDPOINTS) - Camada de Controle
 # ============================================================================
@@ -115,13 +302,31 @@ def login():
         email = request.form.get('email', '').strip()  # Obtém email do formulário e remove espaços
         senha = request.form.get('senha', '')  # Obtém senha do formulário
 
-        usuarios = carregar_usuarios()  # Carrega a lista de usuários cadastrados
+        espera = limitar_tentativa(email)  # Antes de qualquer hash ou acesso ao repositório
+        if espera:  # Muitas tentativas
+            error = 'Muitas tentativas, aguarde e tente novamente'  # Mensagem exibida no formulário
+            return render_template('login.html', error=error, success=success), 429, {'Retry-After': str(espera)}  # 429 Too Many Requests
+
+        usuario = repositorio_usuarios.obter(email)  # Consulta em memória (sem ler o arquivo)
+
+        confere = False  # Resultado da verificação da senha
+        try:
+            # Email inexistente: KDF contra um hash fictício, mesmo custo (não revela quais contas existem)
+            confere, novo_hash = senhas.verificar(senha, usuario['senha'] if usuario else None)  # KDF no pool (aceita SHA-256 antigo)
+        except RuntimeError:  # Fila de hash cheia
+            error = 'Servidor ocupado, tente novamente'  # Sobrecarga, não credencial errada
+            return render_template('login.html', error=error, success=success), 503, {'Retry-After': str(ESPERA_OCUPADO_S)}  # 503 Service Unavailable
+        except ValueError:  # Hash armazenado em formato desconhecido
+            print(f"Hash de senha inválido para {email}")  # Registra e trata como senha errada
+        else:
+            if novo_hash is not None:  # Hash antigo (SHA-256 ou parâmetros anteriores)
+                repositorio_usuarios.atualizar(email, senha=novo_hash)  # Atualização transparente
 
         # Verifica se email existe e se a senha (hash) confere
-        if email in usuarios and usuarios[email]['senha'] == hash_senha(senha):
+        if confere:
             session.permanent = False  # Sessão expira ao fechar navegador
             session['usuario_email'] = email  # Salva email na sessão
-            session['usuario_nome'] = usuarios[email]['nome']  # Salva nome na sessão
+            session['usuario_nome'] = usuario['nome']  # Salva nome na sessão
             return redirect(url_for('jogo_route'))  # Redireciona para o jogo
         else:
             error = 'Email ou senha inválidos'  # Define mensagem de erro se falhar
@@ -145,22 +350,30 @@ def cadastro():
         email = request.form.get('email', '').strip()  # Obtém email
         senha = request.form.get('senha', '')  # Obtém senha
 
+        espera = limitar_tentativa(email)  # Antes de qualquer hash ou acesso ao repositório
+        if espera:  # Muitas tentativas
+            error = 'Muitas tentativas, aguarde e tente novamente'  # Mensagem exibida no formulário
+            return render_template('cadastro.html', error=error), 429, {'Retry-After': str(espera)}  # 429 Too Many Requests
+
         if not nome or not email or not senha:  # Validação básica: campos vazios
             error = 'Todos os campos são obrigatórios'
         elif len(senha) < 4:  # Validação: tamanho da senha
             error = 'Senha deve ter pelo menos 4 caracteres'
+        elif repositorio_usuarios.existe(email):  # Verifica se email já existe
+            error = 'Email já cadastrado'
         else:
-            usuarios = carregar_usuarios()  # Carrega usuários existentes
-
-            if email in usuarios:  # Verifica se email já existe
-                error = 'Email já cadastrado'
-            else:
-                usuarios[email] = {  # Cria novo registro de usuário
-                    'nome': nome,
-                    'senha': hash_senha(senha)  # Salva senha com hash
-                }
-                salvar_usuarios(usuarios)  # Persiste no arquivo JSON
+            try:
+                senha_hash = hash_senha(senha)  # KDF com sal, calculada no pool de senhas
+            except RuntimeError:  # Fila de hash cheia
+                error = 'Servidor ocupado, tente novamente'  # Sobrecarga: não cadastra agora
+                return render_template('cadastro.html', error=error), 503, {'Retry-After': str(ESPERA_OCUPADO_S)}  # 503 Service Unavailable
+            novo = {  # Cria novo registro de usuário
+                'nome': nome,
+                'senha': senha_hash  # Salva senha com hash
+            }
+            if repositorio_usuarios.adicionar(email, novo):  # Verifica e insere atomicamente (persistência em segundo plano)
                 return redirect(url_for('login', success='Cadastro realizado com sucesso!'))  # Redireciona login
+            error = 'Email já cadastrado'  # Outro cadastro simultâneo usou o mesmo email
 
     return render_template('cadastro.html', error=error)  # Renderiza template de cadastro
 
@@ -178,7 +391,25 @@ def jogo_route():
     Rota do jogo (protegida por login).
     Retorna a interface HTML do jogo.
     """
-    return render_template('index.html')  # Renderiza o template principal do jogo
+    _, versao, rects = obter_atlas_web()  # Retângulos dos sprites no atlas
+    return render_template('index.html', atlas_rects=rects, atlas_versao=versao)  # Renderiza o template principal do jogo
+
+@app.route('/atlas.png')  # Atlas de sprites do cliente web
+def atlas_png():
+    """
+    Todos os sprites numa única imagem (retângulos em atlas_rects do template).
+    Com ?v=<versão> atual, o navegador guarda em cache sem revalidar.
+    """
+    png, versao, _ = obter_atlas_web()  # Montado uma única vez
+    resposta = app.response_class(png, mimetype='image/png')  # Bytes já codificados
+    resposta.set_etag(versao)  # Revalidação barata sem ?v=
+    if request.args.get('v') == versao:  # URL versionada: conteúdo nunca muda
+        resposta.cache_control.public = True  # Pode ficar em caches compartilhados
+        resposta.cache_control.max_age = 31536000  # Um ano
+        resposta.cache_control.immutable = True  # Sem revalidação ao recarregar a página
+    else:
+        resposta.cache_control.no_cache = True  # Revalida pelo ETag
+    return resposta.make_conditional(request)  # 304 se If-None-Match bater
 
 # ============================================================================
 # SOCKET.IO EVENTS - Comunicação em Tempo Real
@@ -191,6 +422,7 @@ def handle_connect():
     Inicia o game loop quando um cliente se conecta.
     """
     print('Client connected')  # Loga conexão no console
+    fluxo.conectar(request.sid)  # Começa em taxa cheia
     start_game_thread()  # Inicia a thread do jogo se ainda não estiver rodando
 
 @socketio.on('input_jogador')  # Define handler para evento 'input_jogador'
@@ -200,12 +432,55 @@ def handle_input(data):
     Recebe comandos do cliente e delega para o jogo.
 
     Args:
-        data (dict): {"acao": str, "estado": str}
+        data (dict): {"acao": str, "estado": str, "seq": int, "t": float,
+                      "config_ia": {"layers": int, "neuronios": int}}
+                     seq/t são opcionais (rastreamento de latência, eco em estado_jogo["entradas"][sid]);
+                     config_ia é opcional (enviado ao escolher "JOGAR COM IA")
     """
+    global config_ia  # Arquitetura da política usada pelo modo IA
+    recebido_em = time.perf_counter()  # Instante de chegada (atraso de fila até o tick)
+    if data.get('config_ia') is not None:  # Overlay de configuração da IA
+        config = ler_config_ia(data['config_ia'])
+        if config is not None:
+            config_ia = config
+            servico_ia.remover(jogo)  # Se já estiver sob IA, será registrado com a nova rede
     acao = data.get('acao')  # Extrai a ação do payload
     estado = data.get('estado')  # Extrai o estado (pressionado/solto)
+    seq, t_cliente = ler_sequencia(data)  # Sequência e marca de tempo do cliente (opcionais)
     if acao:  # Se houver ação válida
-        jogo.processar_comando(acao, estado)  # Envia para a lógica do jogo processar
+        partida = jogo.processar_comando(acao, estado, origem=request.sid, seq=seq,
+                                         t_cliente=t_cliente, recebido_em=recebido_em)  # Envia para a lógica do jogo processar
+        marcar_dono_partida(session.get('usuario_email'), partida)  # Se o comando iniciou uma partida, ela é deste usuário
+
+@socketio.on('disconnect')  # Define handler para desconexão Socket.IO
+def handle_disconnect():
+    """Remove o eco de entradas e o controle de fluxo do cliente que saiu."""
+    jogo.esquecer_origem(request.sid)  # Eco de entradas
+    fluxo.desconectar(request.sid)  # Quadros em voo
+
+@socketio.on('estado_recebido')  # Define handler de confirmação de quadro
+def handle_estado_recebido(data):
+    """
+    Confirmação de que o cliente processou um estado_jogo.
+
+    Args:
+        data (dict): {"tick": int} - tick do último estado_jogo processado
+    """
+    recebido_em = time.perf_counter()  # Instante da confirmação (RTT do quadro)
+    tick = data.get('tick') if isinstance(data, dict) else None  # Tick confirmado
+    if isinstance(tick, int) and not isinstance(tick, bool):  # bool é subclasse de int
+        fluxo.confirmar(request.sid, tick, recebido_em)  # Libera a janela e ajusta a taxa
+
+@socketio.on('visibilidade')  # Define handler de visibilidade da aba
+def handle_visibilidade(data):
+    """
+    Aba oculta pausa o envio de estado_jogo; visível retoma com um quadro imediato.
+
+    Args:
+        data (dict): {"visivel": bool}
+    """
+    visivel = data.get('visivel', True) if isinstance(data, dict) else True  # Padrão: visível
+    fluxo.definir_visibilidade(request.sid, bool(visivel))  # Pausa/retoma o fluxo da conexão
 
 # ============================================================================
 # API REST - Endpoints HTTP
@@ -219,11 +494,41 @@ def api_estado():
 
     Conforme ensinado: métodos HTTP adequados (GET para leitura).
 
+    GET condicional: a resposta traz ETag (fraco) da versão do estado; com
+    If-None-Match igual e nada mudou, retorna 304 sem corpo. A versão só
+    avança quando algo visível muda (no menu/pausa/game over sem entradas,
+    o estado fica parado e "tick" no corpo em cache pode estar defasado).
+
+    Long-poll (Query):
+        aguardar (float): Segundos (máx. 30) a esperar por uma versão nova
+        versao (int): Versão já conhecida (alternativa ao If-None-Match)
+
     Returns:
-        JSON com estado completo do jogo
+        JSON com estado completo do jogo (inclui "versao"), ou 304 se o
+        cliente já tem a versão atual (inclusive após esgotar a espera)
     """
     start_game_thread()  # Garante que o jogo está rodando
-    return jsonify(jogo.obter_estado())  # Retorna estado do jogo como JSON
+    versao_cliente = ler_versao_cliente()  # Versão que o cliente já tem (None = nenhuma)
+    try:
+        espera = min(max(float(request.args.get('aguardar', 0)), 0.0), MAX_ESPERA_LONG_POLL_S)
+    except ValueError:
+        espera = 0.0  # Valor inválido: sem long-poll
+    if versao_cliente is not None and espera > 0 and versao_cliente == jogo.versao:
+        if long_polls.acquire(blocking=False):  # Limite de threads bloqueadas
+            try:
+                jogo.aguardar_versao(versao_cliente, espera)  # Acorda no tick que mudar o estado
+            finally:
+                long_polls.release()
+    if versao_cliente is not None and versao_cliente == jogo.versao:  # Nada mudou: sem montar o estado
+        versao = versao_cliente
+        resposta = app.response_class(status=304)
+    else:
+        estado = jogo.obter_estado()  # Estado e versão lidos sob a mesma trava
+        versao = estado['versao']
+        resposta = jsonify(estado)  # Retorna estado do jogo como JSON
+    resposta.set_etag(etag_estado(versao), weak=True)  # Validador para o próximo GET
+    resposta.headers['Cache-Control'] = 'no-cache'  # Caches devem revalidar sempre
+    return resposta
 
 @app.route('/api/comando', methods=['POST'])  # Define endpoint REST POST /api/comando
 def api_comando():
@@ -236,23 +541,102 @@ def api_comando():
     Request Body (JSON):
         {
             "acao": str,      # Comando a executar
-            "estado": str     # "pressionar" ou "soltar"
+            "estado": str,    # "pressionar" ou "soltar"
+            "seq": int,       # Opcional: número de sequência do cliente
+            "t": float        # Opcional: marca de tempo do cliente (devolvida no eco)
         }
 
     Returns:
-        JSON: {"ok": bool, "estado": dict} ou {"erro": str}
+        JSON: {"ok": bool, "origem": str, "estado": dict} ou {"erro": str}
+              O eco da entrada fica em estado["entradas"][origem] após o próximo tick
     """
+    recebido_em = time.perf_counter()  # Instante de chegada
     payload = request.get_json(silent=True) or {}  # Obtém JSON do corpo da requisição (seguro contra vazio)
     acao = payload.get('acao')  # Extrai ação
     estado = payload.get('estado')  # Extrai estado
+    seq, t_cliente = ler_sequencia(payload)  # Sequência opcional
+    origem = f"rest:{session.get('usuario_email', request.remote_addr)}"  # Origem do eco para clientes REST
 
     # Validação de entrada
     if not acao:  # Se não tiver ação
         return jsonify({"erro": "campo 'acao' é obrigatório"}), 400  # Retorna erro 400 Bad Request
 
     start_game_thread()  # Garante jogo rodando
-    jogo.processar_comando(acao, estado)  # Processa comando
-    return jsonify({"ok": True, "estado": jogo.obter_estado()})  # Retorna sucesso e novo estado
+    partida = jogo.processar_comando(acao, estado, origem=origem, seq=seq,
+                                     t_cliente=t_cliente, recebido_em=recebido_em)  # Processa comando
+    marcar_dono_partida(session.get('usuario_email'), partida)  # Partidas iniciadas por REST logado também contam
+    return jsonify({"ok": True, "origem": origem, "estado": jogo.obter_estado()})  # Retorna sucesso e novo estado
+
+@app.route('/api/latencia', methods=['GET'])  # Define endpoint REST GET /api/latencia
+@diagnostico_required  # Só com diagnóstico ligado e sessão
+def api_latencia():
+    """
+    Histogramas de latência das entradas com número de sequência.
+
+    Returns:
+        JSON: {"atraso_fila_ms": {...}, "atraso_ticks": {...}}
+              atraso_fila_ms: da chegada ao servidor até o tick que aplicou a entrada
+              atraso_ticks: ticks entre a chegada e o efeito
+    """
+    return jsonify(jogo.metricas_latencia())
+
+@app.route('/api/placar', methods=['GET'])  # Define endpoint REST GET /api/placar
+def api_placar():
+    """
+    Placar global: melhor resultado de cada usuário (partidas da IA não contam).
+
+    Query:
+        k (int): Quantidade de colocados (padrão 10, máx. 100)
+
+    Returns:
+        JSON: {"top": [{"posicao", "nome", "pontos", "criado_em"}], "total": int}
+    """
+    try:
+        k = int(request.args.get('k', 10))  # Quantidade pedida
+    except ValueError:
+        return jsonify({"erro": "k deve ser inteiro"}), 400
+    return jsonify({"top": placar.top(min(max(k, 1), MAX_TOP)), "total": len(placar)})  # Top-K em cache
+
+@app.route('/api/placar/usuario', methods=['GET'])  # Define endpoint REST GET /api/placar/usuario
+def api_placar_usuario():
+    """
+    Melhor resultado e posição do usuário logado no placar (só da própria conta).
+
+    Returns:
+        JSON: {"posicao", "pontos", "criado_em", "total"}; 401 sem sessão, 404 se não jogou
+    """
+    email = session.get('usuario_email')  # Nunca aceita email de parâmetro (privacidade)
+    if email is None:  # API: responde 401 em vez de redirecionar para o login
+        return jsonify({"erro": "login necessário"}), 401
+    posicao = placar.posicao(email)  # Busca binária no índice
+    if posicao is None:  # Ainda não terminou nenhuma partida
+        return jsonify({"erro": "usuário sem resultados no placar"}), 404
+    return jsonify(posicao)  # Sem email, como no top
+
+@app.route('/api/fluxo', methods=['GET'])  # Define endpoint REST GET /api/fluxo
+@diagnostico_required  # Só com diagnóstico ligado e sessão
+def api_fluxo():
+    """
+    Controle de fluxo por conexão Socket.IO.
+
+    Returns:
+        JSON: {"janela": int, "por_modo": {modo: n}, "clientes": {apelido: {...}}}
+              apelido: hash curto do sid (o sid não é exposto)
+              modo: "normal", "reduzido", "keyframe" ou "pausado"
+    """
+    return jsonify(fluxo.estatisticas())
+
+@app.route('/api/limites', methods=['GET'])  # Define endpoint REST GET /api/limites
+@diagnostico_required  # Só com diagnóstico ligado e sessão
+def api_limites():
+    """
+    Contadores do limite de tentativas de login/cadastro (sem IPs nem emails).
+
+    Returns:
+        JSON: {"ip": {...}, "email": {...}} com capacidade, por_segundo, chaves,
+              permitidas, recusadas e removidas
+    """
+    return jsonify({"ip": limite_ip.estatisticas(), "email": limite_email.estatisticas()})
 
 # ============================================================================
 # LÓGICA DE THREAD E GAME LOOP
@@ -266,6 +650,8 @@ def start_game_thread():
     Usa mecanismo do SocketIO para compatibilidade com diferentes servidores.
     """
     global game_thread  # Referencia variável global
+    if game_thread is not None and game_thread.is_alive():  # Caminho rápido: chamada a cada requisição REST
+        return
     with thread_lock:  # Adquire lock para thread-safety
         if game_thread is None or not game_thread.is_alive():  # Se thread não existe ou morreu
             game_thread = socketio.start_background_task(game_loop)  # Inicia nova background task com game_loop
@@ -276,16 +662,22 @@ def game_loop():
 
     Responsabilidades:
     - Atualizar estado do jogo (~30 FPS)
-    - Emitir estado para clientes conectados via Socket.IO
+    - Decidir as ações das partidas no modo IA (lote com prazo, ver ia/inferencia.py)
+    - Emitir estado para clientes conectados via Socket.IO (na taxa de cada um, ver web/fluxo.py)
 
     Nota: A lógica do jogo está em jogo_headless.py (Facade),
     que coordena Dados/ e Business/ (separação de responsabilidades).
     """
     while True:  # Loop infinito
         jogo.atualizar()  # Atualiza lógica do jogo (física, movimentos)
-        state = jogo.obter_estado()  # Obtém estado atualizado
-        socketio.emit('estado_jogo', state)  # Envia estado para todos clientes conectados via WebSocket
-        socketio.sleep(0.03)  # Pausa por ~30ms para manter aprox. 30 FPS e não travar CPU
+        registrar_fim_partida()  # Game over: grava o resultado do dono da partida no placar
+        sincronizar_ia()  # Entra/sai do controle da IA conforme modo e estado
+        servico_ia.tick()  # Ações da IA para o próximo tick (nunca espera além do prazo)
+        destinos = fluxo.destinos(jogo.tick, (jogo.estado, jogo.pausado))  # Conexões que recebem este quadro
+        if destinos:  # Sem destinos (ex: todas as abas ocultas) não serializa o estado
+            state = jogo.obter_estado()  # Obtém estado atualizado
+            socketio.emit('estado_jogo', state, to=destinos)  # Um único pacote codificado, enviado a cada destino
+        socketio.sleep(INTERVALO_TICK_MS / 1000)  # Pausa de um tick (~30ms) para manter aprox. 30 FPS e não travar CPU
 
 # Execução movida para mainFlask.py conforme padrão ensinado
 # Para executar: python mainFlask.py
\ No newline at end of file
@@ -0,0 +1,297 @@
+# ============================================================================
+# CARGA.PY - BOTS PARA TESTE DE CARGA DO WEBSERVICE
+# ============================================================================
+"""
+PROPÓSITO:
+Gerador de carga local: N clientes simulados fazem login pelo /login,
+conectam por Socket.IO, enviam input_jogador com tempos realistas de
+pressionar/soltar e medem:
+- Intervalo entre chegadas de estado_jogo (ideal: um tick, ~30 ms)
+- Latência entrada -> estado: tempo entre enviar uma entrada numerada
+  (seq) e receber o estado_jogo cujo eco (entradas[sid]) já a inclui
+
+Roda rodadas com quantidades crescentes de clientes e imprime percentis
+por rodada, mostrando onde um processo do servidor satura.
+
+OBSERVAÇÕES:
+- O servidor tem UM jogo compartilhado: todos os bots controlam a mesma
+  nave. Só o bot 0 navega menus; o eco é por conexão, então a latência
+  de cada bot não depende das entradas dos outros
+- Entradas ainda sem eco no fim da rodada contam como "sem resposta"
+- Os bots confirmam cada estado_jogo (estado_recebido), como o cliente
+  web; --lentos N faz os N últimos bots demorarem para processar cada
+  quadro, exercitando o controle de fluxo do servidor (web/fluxo.py)
+- Contas bot<i>@carga.local são cadastradas pelo /cadastro se o login falhar
+- Todos os bots saem do mesmo IP: suba o servidor com um limite de
+  tentativas por IP maior que ~3x o número de clientes (ex:
+  SPACE_INVADERS_LIMITE_IP=1000), senão os logins recebem 429
+
+USO (com o servidor rodando):
+    python -m space_invaders.web.carga --url http://127.0.0.1:5000 --clientes 1,10,50 --duracao 20
+"""
+
+import argparse   # Linha de comando
+import random     # Tempos realistas de teclas
+import threading  # Um fluxo de entradas por bot
+import time       # Medições
+import requests   # Login HTTP (mantém o cookie de sessão)
+import socketio   # Cliente Socket.IO (python-socketio)
+
+ACOES_BOT = ("esquerda", "direita", "cima", "baixo", "atirar")
+SENHA_BOT = "carga123"
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) por interpolação linear; None se vazio."""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    base = int(posicao)
+    fracao = posicao - base
+    if base + 1 < len(ordenados):
+        return ordenados[base] + (ordenados[base + 1] - ordenados[base]) * fracao
+    return ordenados[base]
+
+
+# ============================================================================
+# CLASSE BOTJOGADOR - UM CLIENTE SIMULADO
+# ============================================================================
+class BotJogador:
+    """
+    Cliente simulado: sessão HTTP autenticada + conexão Socket.IO.
+
+    ATRIBUTOS:
+    - intervalos_ms: Tempo entre chegadas de estado_jogo
+    - latencias_ms: Latência entrada -> estado (pelo eco da sequência)
+    - sem_resposta: Entradas sem eco ao fim da rodada
+    """
+
+    def __init__(self, url, indice, lider=False, atraso_s=0.0):
+        """
+        Args:
+            url (str): Endereço do servidor (ex: http://127.0.0.1:5000)
+            indice (int): Número do bot (define o email da conta)
+            lider (bool): Se True, navega menu/game over para manter a partida rodando
+            atraso_s (float): Tempo simulado de processamento de cada estado_jogo
+        """
+        self.url = url.rstrip("/")
+        self.indice = indice
+        self.lider = lider
+        self.atraso_s = atraso_s
+        self.email = f"bot{indice}@carga.local"
+        self.http = requests.Session()
+        self.cliente = socketio.Client(reconnection=False)
+        self.cliente.on("estado_jogo", self._ao_receber_estado)
+        self.sid = None
+        self.estado = None
+        self.ultima_chegada = None
+        self.intervalos_ms = []
+        self.latencias_ms = []
+        self.sem_resposta = 0
+        self.estados_recebidos = 0
+        self._seq = 0
+        self._enviados = {}  # seq -> instante do envio (aguardando eco)
+        self._medindo = False  # Só mede durante jogar() (não durante a conexão dos outros bots)
+        self._trava = threading.Lock()
+        self._processando = threading.Lock()  # Serializa o processamento simulado (bots lentos)
+        self._parar = threading.Event()
+
+    # ========================================================================
+    # CONEXÃO
+    # ========================================================================
+    def entrar(self):
+        """
+        Faz login (cadastrando a conta do bot se necessário) e conecta o Socket.IO.
+
+        Raises:
+            RuntimeError: Se o login não for aceito
+        """
+        dados = {"email": self.email, "senha": SENHA_BOT}
+        resposta = self.http.post(f"{self.url}/login", data=dados, allow_redirects=False)
+        if resposta.status_code != 302:
+            self.http.post(f"{self.url}/cadastro", data=dict(dados, nome=f"Bot {self.indice}"),
+                           allow_redirects=False)
+            resposta = self.http.post(f"{self.url}/login", data=dados, allow_redirects=False)
+        if resposta.status_code != 302 or "/jogo" not in resposta.headers.get("Location", ""):
+            dica = {429: " - limite de tentativas, veja SPACE_INVADERS_LIMITE_IP",
+                    503: " - fila de hash de senhas cheia, veja SPACE_INVADERS_KDF_THREADS"}.get(resposta.status_code, "")
+            raise RuntimeError(f"Login do bot {self.indice} recusado ({resposta.status_code}){dica}")
+        cookie = "; ".join(f"{nome}={valor}" for nome, valor in self.http.cookies.items())
+        self.cliente.connect(self.url, headers={"Cookie": cookie}, transports=["websocket"])
+        self.sid = self.cliente.get_sid()  # Chave do eco em estado_jogo["entradas"]
+
+    def sair(self):
+        """Para o fluxo de entradas e desconecta."""
+        self._parar.set()
+        if self.cliente.connected:
+            self.cliente.disconnect()
+
+    def _enviar(self, acao, estado="pressionar"):
+        with self._trava:
+            self._seq += 1
+            seq = self._seq
+            if self._medindo:
+                self._enviados[seq] = time.perf_counter()
+        self.cliente.emit("input_jogador", {"acao": acao, "estado": estado, "seq": seq})
+
+    # ========================================================================
+    # MEDIÇÕES
+    # ========================================================================
+    def _ao_receber_estado(self, estado):
+        agora = time.perf_counter()
+        with self._trava:
+            if self._medindo and self.ultima_chegada is not None:
+                self.intervalos_ms.append((agora - self.ultima_chegada) * 1000)
+            self.ultima_chegada = agora
+            self.estado = estado
+            if self._medindo:
+                self.estados_recebidos += 1
+            eco = estado.get("entradas", {}).get(self.sid)
+            if self._medindo and eco and self._enviados:
+                # Todas as entradas até eco["seq"] já foram aplicadas
+                for seq in [s for s in self._enviados if s <= eco["seq"]]:
+                    self.latencias_ms.append((agora - self._enviados.pop(seq)) * 1000)
+        if self.atraso_s:
+            with self._processando:  # Um quadro por vez (eventos chegam em threads paralelas)
+                time.sleep(self.atraso_s)  # Cliente lento: segura a confirmação
+        try:
+            self.cliente.emit("estado_recebido", {"tick": estado["tick"]})
+        except socketio.exceptions.BadNamespaceError:
+            pass  # Desconectou enquanto processava
+
+    # ========================================================================
+    # COMPORTAMENTO
+    # ========================================================================
+    def _navegar(self, estado):
+        """Bot líder: sai do menu por "JOGAR SOLO" e reinicia no game over."""
+        if estado["estado"] == "menu":
+            selecionada = estado["menu"]["selecionada"]
+            indice_solo = estado["menu"]["opcoes"].index("JOGAR SOLO")
+            self._enviar("menu_baixo" if selecionada < indice_solo else
+                         "menu_cima" if selecionada > indice_solo else "menu_selecionar")
+        elif estado["estado"] == "game_over":
+            self._enviar("reiniciar")
+
+    def jogar(self, duracao_s, rng):
+        """
+        Envia entradas com tempos de tecla realistas até o fim da rodada.
+
+        Args:
+            duracao_s (float): Duração da rodada
+            rng (random.Random): Gerador de tempos (um por bot)
+        """
+        self._medindo = True
+        fim = time.perf_counter() + duracao_s
+        while time.perf_counter() < fim and not self._parar.is_set():
+            estado = self.estado
+            if estado is None:
+                time.sleep(0.05)
+                continue
+            if estado["estado"] != "jogando" or estado.get("pausado"):
+                if self.lider:
+                    self._navegar(estado)
+                time.sleep(0.1)
+                continue
+            acao = rng.choice(ACOES_BOT)
+            self._enviar(acao)
+            time.sleep(rng.uniform(0.08, 0.4))    # Tecla segurada
+            self._enviar(acao, "soltar")
+            time.sleep(rng.uniform(0.05, 0.3))    # Intervalo entre teclas
+        time.sleep(0.5)  # Tempo para os últimos ecos chegarem
+        with self._trava:
+            self._medindo = False
+            self.sem_resposta += len(self._enviados)
+            self._enviados.clear()
+
+
+# ============================================================================
+# RODADAS E RELATÓRIO
+# ============================================================================
+def executar_rodada(url, n_clientes, duracao_s, semente=0, lentos=0, atraso_lento_s=0.2):
+    """
+    Conecta n_clientes bots, joga por duracao_s e agrega as medições.
+
+    Args:
+        lentos (int): Quantos bots (os últimos) processam cada quadro em atraso_lento_s
+
+    Returns:
+        dict: Percentis de intervalo e latência, estados/s por cliente (normais
+              e lentos) e falhas
+    """
+    lentos = min(lentos, max(0, n_clientes - 1))  # O líder nunca é lento
+    bots = [BotJogador(url, i, lider=(i == 0), atraso_s=atraso_lento_s if i >= n_clientes - lentos else 0.0)
+            for i in range(n_clientes)]
+    conectados = []
+    for bot in bots:
+        try:
+            bot.entrar()
+            conectados.append(bot)
+        except Exception as e:
+            print(f"Bot {bot.indice}: falha ao conectar ({e})")
+    threads = [threading.Thread(target=bot.jogar, args=(duracao_s, random.Random(semente + bot.indice)),
+                                daemon=True) for bot in conectados]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for bot in conectados:
+        bot.sair()
+
+    normais = [bot for bot in conectados if not bot.atraso_s]
+    lentos = [bot for bot in conectados if bot.atraso_s]
+    intervalos = [v for bot in normais for v in bot.intervalos_ms]
+    latencias = [v for bot in normais for v in bot.latencias_ms]
+    return {
+        "clientes": n_clientes,
+        "conectados": len(conectados),
+        "estados_por_s": sum(bot.estados_recebidos for bot in normais) / duracao_s / max(1, len(normais)),
+        "estados_por_s_lentos": (sum(bot.estados_recebidos for bot in lentos) / duracao_s / len(lentos)
+                                 if lentos else None),
+        "intervalo_ms": {p: percentil(intervalos, p) for p in (50, 90, 99, 100)},
+        "latencia_ms": {p: percentil(latencias, p) for p in (50, 90, 99, 100)},
+        "entradas": len(latencias),
+        "sem_resposta": sum(bot.sem_resposta for bot in normais),
+    }
+
+
+def formatar_relatorio(rodadas):
+    """Tabela de percentis por quantidade de clientes (percentis só dos bots normais)."""
+    def ms(valor):
+        return f"{valor:7.1f}" if valor is not None else "      -"
+
+    linhas = [f"{'CLIENTES':>8} {'ESTADOS/s':>9} {'LENTOS':>6} | {'INTERVALO p50':>13} {'p90':>7} {'p99':>7} {'máx':>7} | "
+              f"{'LATÊNCIA p50':>12} {'p90':>7} {'p99':>7} {'máx':>7} | ENTRADAS (sem resposta)"]
+    for r in rodadas:
+        i, l = r["intervalo_ms"], r["latencia_ms"]
+        lentos = f"{r['estados_por_s_lentos']:6.1f}" if r["estados_por_s_lentos"] is not None else "     -"
+        linhas.append(f"{r['conectados']:>4}/{r['clientes']:<3} {r['estados_por_s']:>9.1f} {lentos} | "
+                      f"{ms(i[50]):>13} {ms(i[90])} {ms(i[99])} {ms(i[100])} | "
+                      f"{ms(l[50]):>12} {ms(l[90])} {ms(l[99])} {ms(l[100])} | "
+                      f"{r['entradas']} ({r['sem_resposta']})")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    """FERRAMENTA DE LINHA DE COMANDO - Teste de carga com bots."""
+    parser = argparse.ArgumentParser(description="Bots de carga para o webservice do Space Invaders")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--clientes", default="1,5,10,25,50",
+                        help="Quantidades de clientes por rodada, separadas por vírgula")
+    parser.add_argument("--duracao", type=float, default=15.0, help="Segundos por rodada")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--lentos", type=int, default=0,
+                        help="Bots que demoram --atraso-lento segundos para processar cada quadro")
+    parser.add_argument("--atraso-lento", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    rodadas = []
+    for n in (int(v) for v in args.clientes.split(",")):
+        print(f"Rodada com {n} clientes ({args.duracao:.0f}s)...")
+        rodadas.append(executar_rodada(args.url, n, args.duracao, args.semente, args.lentos, args.atraso_lento))
+    print(formatar_relatorio(rodadas))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,213 @@
+# ============================================================================
+# FLUXO.PY - CONTROLE DE FLUXO POR CONEXÃO (ESTADO_JOGO)
+# ============================================================================
+"""
+PROPÓSITO:
+Decide, a cada tick, para quais conexões Socket.IO o estado_jogo é
+enviado, para que uma aba lenta ou em segundo plano não acumule quadros
+nos buffers do servidor.
+
+FUNCIONAMENTO:
+- O cliente confirma cada quadro processado (evento estado_recebido com
+  o tick); o servidor guarda no máximo `janela` quadros sem confirmação
+- Janela cheia = congestionamento: o quadro é pulado e o intervalo entre
+  envios dobra (1, 2, 4, 8 ticks); confirmações em dia reduzem pela metade
+- No intervalo máximo o cliente entra em modo keyframe: um quadro a cada
+  ~1s ou quando o marco do jogo muda (estado/pausa)
+- Aba oculta (evento visibilidade) não recebe quadros; ao voltar recebe
+  um quadro imediatamente
+- Confirmações que não chegam em TEMPO_LIMITE_CONFIRMACAO_S são
+  descartadas e contam como congestionamento
+
+OBSERVAÇÕES:
+- Clientes que nunca confirmaram (ex: integrações antigas) recebem todos
+  os quadros, como antes; o controle começa na primeira confirmação
+- Memória por cliente é fixa (deque limitado à janela)
+- estatisticas() identifica as conexões por um hash curto do sid: o sid
+  autentica a conexão Socket.IO e não sai do servidor
+"""
+
+import hashlib    # Apelido das conexões nas estatísticas
+import threading  # Confirmações chegam nas threads do Socket.IO
+import time       # Idade das confirmações e RTT
+from collections import deque
+from ..utils import INTERVALO_TICK_MS
+
+JANELA_PADRAO = 8                # Quadros sem confirmação (~240ms a taxa cheia)
+INTERVALO_MAX = 8                # Ticks entre envios antes do modo keyframe (~4 quadros/s)
+INTERVALO_KEYFRAME = round(1000 / INTERVALO_TICK_MS)  # ~1 quadro/s no modo keyframe
+CONFIRMACOES_PARA_ACELERAR = 8   # Confirmações em dia seguidas para dividir o intervalo
+TEMPO_LIMITE_CONFIRMACAO_S = 2.0
+
+
+class FluxoCliente:
+    """
+    Estado de envio de uma conexão.
+
+    ATRIBUTOS:
+    - visivel: False quando a aba informou estar oculta
+    - confirma: True após a primeira confirmação (controle ativo)
+    - intervalo: Ticks entre envios (1 = taxa cheia)
+    - em_voo: (tick, instante) dos quadros enviados sem confirmação
+    - rtt_ms: Tempo envio -> confirmação, suavizado
+    """
+
+    def __init__(self, janela):
+        self.visivel = True
+        self.confirma = False
+        self.intervalo = 1
+        self.em_voo = deque(maxlen=janela)
+        self.ultimo_envio = None  # Tick do último quadro enviado
+        self.ultimo_marco = None  # Marco do jogo no último quadro enviado
+        self.congestionado = False  # Já desacelerou neste congestionamento
+        self.em_dia = 0  # Confirmações seguidas sem quadros pendentes
+        self.rtt_ms = None
+        self.enviados = 0
+        self.pulados = 0
+
+    @property
+    def modo(self):
+        """"pausado", "keyframe", "reduzido" ou "normal"."""
+        if not self.visivel:
+            return "pausado"
+        if self.intervalo >= INTERVALO_MAX:
+            return "keyframe"
+        return "reduzido" if self.intervalo > 1 else "normal"
+
+    def desacelerar(self):
+        self.intervalo = min(self.intervalo * 2, INTERVALO_MAX)
+        self.em_dia = 0
+
+    def para_dict(self):
+        return {"modo": self.modo, "intervalo": self.intervalo, "em_voo": len(self.em_voo),
+                "confirma": self.confirma, "rtt_ms": self.rtt_ms,
+                "enviados": self.enviados, "pulados": self.pulados}
+
+
+def apelido_sid(sid):
+    """Hash curto do sid: distingue conexões sem permitir reutilizá-lo."""
+    return hashlib.sha256(str(sid).encode()).hexdigest()[:12]
+
+
+# ============================================================================
+# CLASSE CONTROLEFLUXO - TODAS AS CONEXÕES
+# ============================================================================
+class ControleFluxo:
+    """
+    Controle de fluxo do estado_jogo para todas as conexões.
+
+    USO (game loop):
+        destinos = fluxo.destinos(jogo.tick, (jogo.estado, jogo.pausado))
+        if destinos:
+            socketio.emit('estado_jogo', jogo.obter_estado(), to=destinos)
+    """
+
+    def __init__(self, janela=JANELA_PADRAO):
+        """
+        Args:
+            janela (int): Máximo de quadros sem confirmação por cliente
+        """
+        if janela < 1:
+            raise ValueError("janela deve ser >= 1")
+        self.janela = janela
+        self.clientes = {}  # sid -> FluxoCliente
+        self.trava = threading.Lock()
+
+    def conectar(self, sid):
+        with self.trava:
+            self.clientes[sid] = FluxoCliente(self.janela)
+
+    def desconectar(self, sid):
+        with self.trava:
+            self.clientes.pop(sid, None)
+
+    def definir_visibilidade(self, sid, visivel):
+        """Aba oculta pausa o envio; ao voltar, o próximo tick envia um quadro."""
+        with self.trava:
+            cliente = self.clientes.get(sid)
+            if cliente is None:
+                return
+            if visivel and not cliente.visivel:
+                cliente.ultimo_marco = None  # Força envio imediato
+            cliente.visivel = visivel
+
+    def confirmar(self, sid, tick, agora=None):
+        """
+        Registra que o cliente processou o quadro do tick (e todos os anteriores).
+
+        Args:
+            sid (str): Conexão
+            tick (int): Tick do estado_jogo processado
+            agora (float, optional): time.perf_counter() da chegada
+        """
+        agora = time.perf_counter() if agora is None else agora
+        with self.trava:
+            cliente = self.clientes.get(sid)
+            if cliente is None:
+                return
+            cliente.confirma = True
+            enviado_em = None
+            while cliente.em_voo and cliente.em_voo[0][0] <= tick:
+                enviado_em = cliente.em_voo.popleft()[1]
+            if enviado_em is None:
+                return  # Confirmação repetida ou de quadro já expirado
+            amostra = (agora - enviado_em) * 1000
+            cliente.rtt_ms = amostra if cliente.rtt_ms is None else 0.8 * cliente.rtt_ms + 0.2 * amostra
+            cliente.congestionado = False
+            if cliente.em_voo:
+                cliente.em_dia = 0
+                return
+            cliente.em_dia += 1
+            if cliente.em_dia >= CONFIRMACOES_PARA_ACELERAR and cliente.intervalo > 1:
+                cliente.intervalo //= 2
+                cliente.em_dia = 0
+
+    def destinos(self, tick, marco=None, agora=None):
+        """
+        Escolhe as conexões que recebem o quadro deste tick (e registra o envio).
+
+        Args:
+            tick (int): Tick do estado que será enviado
+            marco (hashable, optional): Resumo discreto do jogo (ex: estado, pausado);
+                                        mudança força envio mesmo em taxa reduzida
+            agora (float, optional): time.perf_counter()
+
+        Returns:
+            list[str]: sids que devem receber o quadro
+        """
+        agora = time.perf_counter() if agora is None else agora
+        destinos = []
+        with self.trava:
+            for sid, cliente in self.clientes.items():
+                if not cliente.visivel:
+                    continue
+                if cliente.confirma:
+                    if cliente.em_voo and agora - cliente.em_voo[0][1] > TEMPO_LIMITE_CONFIRMACAO_S:
+                        cliente.em_voo.clear()  # Confirmações perdidas: trata como congestionamento
+                        cliente.desacelerar()
+                    if len(cliente.em_voo) >= self.janela:
+                        if not cliente.congestionado:
+                            cliente.congestionado = True
+                            cliente.desacelerar()
+                        cliente.pulados += 1
+                        continue
+                    intervalo = INTERVALO_KEYFRAME if cliente.intervalo >= INTERVALO_MAX else cliente.intervalo
+                    if (marco == cliente.ultimo_marco and cliente.ultimo_envio is not None
+                            and tick - cliente.ultimo_envio < intervalo):
+                        cliente.pulados += 1
+                        continue
+                cliente.em_voo.append((tick, agora))
+                cliente.ultimo_envio = tick
+                cliente.ultimo_marco = marco
+                cliente.enviados += 1
+                destinos.append(sid)
+        return destinos
+
+    def estatisticas(self):
+        """Resumo por conexão (chave: apelido do sid) e contagem por modo (para /api/fluxo)."""
+        with self.trava:
+            clientes = {apelido_sid(sid): cliente.para_dict() for sid, cliente in self.clientes.items()}
+        por_modo = {}
+        for dados in clientes.values():
+            por_modo[dados["modo"]] = por_modo.get(dados["modo"], 0) + 1
+        return {"janela": self.janela, "por_modo": por_modo, "clientes": clientes}
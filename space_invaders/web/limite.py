@@ -0,0 +1,113 @@
+# ============================================================================
+# LIMITE.PY - LIMITE DE TENTATIVAS (TOKEN BUCKET EM MEMÓRIA)
+# ============================================================================
+"""
+PROPÓSITO:
+Limita tentativas de login e cadastro por IP e por email antes de
+qualquer hash de senha ou acesso ao repositório, para que uma rajada de
+tentativas não consuma a CPU do game loop.
+
+FUNCIONAMENTO (token bucket):
+- Cada chave tem um balde de `capacidade` fichas, reposto continuamente
+  a `por_segundo` fichas/s; cada tentativa gasta uma ficha
+- Balde vazio = tentativa recusada; tentar_em() diz quando haverá ficha
+- Por chave guarda só (fichas, instante da última atualização)
+- Baldes que já estariam cheios são removidos a cada INTERVALO_LIMPEZA_S
+  (um balde cheio é igual a um balde inexistente); acima de max_chaves
+  é descartado o balde usado há mais tempo (LRU)
+
+OBSERVAÇÕES:
+- Estado por processo (não compartilhado entre servidores)
+- O IP é o do socket (request.remote_addr); atrás de proxy, todas as
+  requisições dividiriam o mesmo balde
+"""
+
+import threading  # Requisições chegam em threads diferentes
+import time       # Reposição das fichas
+from collections import OrderedDict  # Ordem de uso dos baldes (LRU)
+
+INTERVALO_LIMPEZA_S = 60.0
+MAX_CHAVES = 100_000  # Limite de memória (~100 bytes por chave)
+
+
+class LimitadorTaxa:
+    """
+    Token bucket por chave (IP, email...).
+
+    ATRIBUTOS:
+    - capacidade: Rajada máxima de tentativas
+    - por_segundo: Reposição de fichas por segundo
+    - permitidas, recusadas, removidas: Contadores para monitoramento
+    """
+
+    def __init__(self, capacidade, por_segundo, max_chaves=MAX_CHAVES):
+        """
+        Args:
+            capacidade (int): Fichas do balde cheio
+            por_segundo (float): Fichas repostas por segundo
+            max_chaves (int): Baldes mantidos no máximo
+
+        Raises:
+            ValueError: Parâmetros não positivos
+        """
+        if capacidade < 1 or por_segundo <= 0 or max_chaves < 1:
+            raise ValueError("capacidade, por_segundo e max_chaves devem ser positivos")
+        self.capacidade = capacidade
+        self.por_segundo = por_segundo
+        self.max_chaves = max_chaves
+        self._baldes = OrderedDict()  # chave -> (fichas, instante), do menos ao mais recente
+        self._trava = threading.Lock()
+        self._proxima_limpeza = time.monotonic() + INTERVALO_LIMPEZA_S
+        self.permitidas = 0
+        self.recusadas = 0
+        self.removidas = 0
+
+    def consumir(self, chave, agora=None):
+        """
+        Gasta uma ficha do balde da chave.
+
+        Returns:
+            bool: False se o balde estiver vazio (tentativa recusada)
+        """
+        agora = time.monotonic() if agora is None else agora
+        with self._trava:
+            if agora >= self._proxima_limpeza:
+                self._limpar(agora)
+            fichas, instante = self._baldes.get(chave, (self.capacidade, agora))
+            fichas = min(self.capacidade, fichas + (agora - instante) * self.por_segundo)
+            if chave in self._baldes:
+                self._baldes.move_to_end(chave)  # Usado agora (inclusive se recusado)
+            elif len(self._baldes) >= self.max_chaves:
+                self._baldes.popitem(last=False)  # Descarta o balde usado há mais tempo
+                self.removidas += 1
+            if fichas < 1:
+                self._baldes[chave] = (fichas, agora)
+                self.recusadas += 1
+                return False
+            self._baldes[chave] = (fichas - 1, agora)
+            self.permitidas += 1
+            return True
+
+    def tentar_em(self, chave, agora=None):
+        """Segundos até a chave ter uma ficha (0 se já tiver)."""
+        agora = time.monotonic() if agora is None else agora
+        with self._trava:
+            fichas, instante = self._baldes.get(chave, (self.capacidade, agora))
+        fichas = min(self.capacidade, fichas + (agora - instante) * self.por_segundo)
+        return max(0.0, (1 - fichas) / self.por_segundo)
+
+    def _limpar(self, agora):
+        """Remove baldes que já se reencheram (com a trava adquirida)."""
+        cheios = [chave for chave, (fichas, instante) in self._baldes.items()
+                  if fichas + (agora - instante) * self.por_segundo >= self.capacidade]
+        for chave in cheios:
+            del self._baldes[chave]
+        self.removidas += len(cheios)
+        self._proxima_limpeza = agora + INTERVALO_LIMPEZA_S
+
+    def estatisticas(self):
+        """Contadores e parâmetros (para /api/limites)."""
+        with self._trava:
+            return {"capacidade": self.capacidade, "por_segundo": self.por_segundo,
+                    "chaves": len(self._baldes), "permitidas": self.permitidas,
+                    "recusadas": self.recusadas, "removidas": self.removidas}
@@ -0,0 +1,254 @@
+# ============================================================================
+# SENHAS.PY - HASH DE SENHAS (KDF COM SAL) EM POOL DE THREADS
+# ============================================================================
+"""
+PROPÓSITO:
+Gera e confere hashes de senha com uma função de derivação lenta e com
+sal (hashlib.scrypt ou hashlib.pbkdf2_hmac), executada num pool limitado
+de threads para que o custo não atrase o game loop nem o Socket.IO.
+
+FORMATO ARMAZENADO (campo "senha" do usuário):
+- scrypt$<log2 n>$<r>$<p>$<sal b64>$<hash b64>
+- pbkdf2_sha256$<iterações>$<sal b64>$<hash b64>
+- 64 dígitos hex: SHA-256 sem sal (formato antigo); aceito no login e
+  substituído pelo formato atual (atualização transparente)
+
+CONCORRÊNCIA:
+- scrypt e pbkdf2_hmac liberam o GIL durante o cálculo: as threads do
+  pool não bloqueiam o restante do processo
+- No máximo `trabalhadores` hashes rodam ao mesmo tempo (limita a CPU
+  usada por logins); até `fila` pedidos aguardam, acima disso
+  RuntimeError (o chamador responde "servidor ocupado")
+
+CONFIGURAÇÃO (variáveis de ambiente, lidas por de_ambiente()):
+- SPACE_INVADERS_KDF: "scrypt" (padrão) ou "pbkdf2"
+- SPACE_INVADERS_KDF_CUSTO: log2 de n (scrypt) ou iterações (pbkdf2)
+- SPACE_INVADERS_KDF_THREADS: tamanho do pool
+
+BENCHMARK (logins por segundo x custo):
+    python -m space_invaders.web.senhas --custos 12,14,15 --threads 1,2,4
+"""
+
+import argparse   # Benchmark
+import base64     # Sal e hash no texto armazenado
+import hashlib    # scrypt / pbkdf2_hmac / sha256 (formato antigo)
+import hmac       # Comparação em tempo constante
+import os         # Sal aleatório, cpu_count, variáveis de ambiente
+import re         # Reconhece o formato antigo
+import threading  # Limite da fila
+import time       # Benchmark
+from concurrent.futures import ThreadPoolExecutor
+
+ALGORITMOS = ("scrypt", "pbkdf2")
+CUSTO_PADRAO = {"scrypt": 14, "pbkdf2": 600_000}  # log2(n)=14: 16 MiB por hash; iterações OWASP p/ SHA-256
+SCRYPT_R = 8
+SCRYPT_P = 1
+TAMANHO_SAL = 16
+TAMANHO_HASH = 32
+ESPERA_FILA_S = 5.0  # Espera máxima por uma vaga na fila antes de desistir
+PADRAO_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+
+def _b64(dados):
+    return base64.b64encode(dados).decode("ascii")
+
+
+def _trabalhadores_padrao():
+    """Deixa pelo menos um núcleo para o game loop (mínimo 1, máximo 4)."""
+    return min(4, max(1, (os.cpu_count() or 2) - 1))
+
+
+class HashSenhas:
+    """
+    KDF de senhas com sal executada num pool limitado de threads.
+
+    ATRIBUTOS:
+    - algoritmo: "scrypt" ou "pbkdf2"
+    - custo: log2(n) do scrypt ou iterações do pbkdf2
+    - trabalhadores: Hashes calculados ao mesmo tempo
+    """
+
+    def __init__(self, algoritmo="scrypt", custo=None, trabalhadores=None, fila=None):
+        """
+        Args:
+            algoritmo (str): "scrypt" ou "pbkdf2"
+            custo (int, optional): Padrão CUSTO_PADRAO[algoritmo]
+            trabalhadores (int, optional): Threads do pool (padrão: núcleos - 1, até 4)
+            fila (int, optional): Pedidos aguardando além dos em execução (padrão: 8 por thread)
+
+        Raises:
+            ValueError: Algoritmo desconhecido ou parâmetros inválidos
+        """
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"algoritmo deve ser um de {ALGORITMOS}")
+        self.algoritmo = algoritmo
+        self.custo = CUSTO_PADRAO[algoritmo] if custo is None else int(custo)
+        if algoritmo == "scrypt" and not 1 <= self.custo <= 20:
+            raise ValueError("custo do scrypt (log2 n) deve estar entre 1 e 20")
+        if algoritmo == "pbkdf2" and self.custo < 1:
+            raise ValueError("iterações do pbkdf2 devem ser >= 1")
+        self.trabalhadores = trabalhadores or _trabalhadores_padrao()
+        fila = 8 * self.trabalhadores if fila is None else fila
+        self._vagas = threading.BoundedSemaphore(self.trabalhadores + fila)
+        self._pool = ThreadPoolExecutor(max_workers=self.trabalhadores, thread_name_prefix="hash-senha")
+        self._hash_ficticio = None  # Alvo de verificar() para emails inexistentes (mesmos parâmetros)
+        self._trava_ficticio = threading.Lock()
+
+    @classmethod
+    def de_ambiente(cls):
+        """Instância configurada pelas variáveis SPACE_INVADERS_KDF*."""
+        algoritmo = os.environ.get("SPACE_INVADERS_KDF", "scrypt")
+        custo = os.environ.get("SPACE_INVADERS_KDF_CUSTO")
+        threads = os.environ.get("SPACE_INVADERS_KDF_THREADS")
+        return cls(algoritmo, int(custo) if custo else None, int(threads) if threads else None)
+
+    # ========================================================================
+    # CÁLCULO (NAS THREADS DO POOL)
+    # ========================================================================
+    def _derivar(self, senha, sal, algoritmo, custo):
+        if algoritmo == "scrypt":
+            n = 1 << custo
+            return hashlib.scrypt(senha.encode(), salt=sal, n=n, r=SCRYPT_R, p=SCRYPT_P,
+                                  maxmem=256 * SCRYPT_R * n, dklen=TAMANHO_HASH)
+        return hashlib.pbkdf2_hmac("sha256", senha.encode(), sal, custo, dklen=TAMANHO_HASH)
+
+    def _formatar(self, senha):
+        sal = os.urandom(TAMANHO_SAL)
+        hash_ = self._derivar(senha, sal, self.algoritmo, self.custo)
+        if self.algoritmo == "scrypt":
+            return f"scrypt${self.custo}${SCRYPT_R}${SCRYPT_P}${_b64(sal)}${_b64(hash_)}"
+        return f"pbkdf2_sha256${self.custo}${_b64(sal)}${_b64(hash_)}"
+
+    def _conferir(self, senha, armazenado):
+        """Retorna (confere, novo_hash ou None)."""
+        if PADRAO_SHA256.fullmatch(armazenado):
+            confere = hmac.compare_digest(hashlib.sha256(senha.encode()).hexdigest(), armazenado)
+            return confere, (self._formatar(senha) if confere else None)
+        partes = armazenado.split("$")
+        if partes[0] == "scrypt" and len(partes) == 6:
+            custo, r, p = int(partes[1]), int(partes[2]), int(partes[3])
+            sal, esperado = base64.b64decode(partes[4]), base64.b64decode(partes[5])
+            n = 1 << custo
+            calculado = hashlib.scrypt(senha.encode(), salt=sal, n=n, r=r, p=p,
+                                       maxmem=256 * r * n, dklen=len(esperado))
+            atual = (self.algoritmo, self.custo, r, p) == ("scrypt", custo, SCRYPT_R, SCRYPT_P)
+        elif partes[0] == "pbkdf2_sha256" and len(partes) == 4:
+            custo = int(partes[1])
+            sal, esperado = base64.b64decode(partes[2]), base64.b64decode(partes[3])
+            calculado = hashlib.pbkdf2_hmac("sha256", senha.encode(), sal, custo, dklen=len(esperado))
+            atual = (self.algoritmo, self.custo) == ("pbkdf2", custo)
+        else:
+            raise ValueError("formato de hash de senha desconhecido")
+        confere = hmac.compare_digest(calculado, esperado)
+        # Parâmetros antigos (outro algoritmo ou custo): recalcula já com a senha em mãos
+        return confere, (self._formatar(senha) if confere and not atual else None)
+
+    def _executar(self, funcao, *args):
+        if not self._vagas.acquire(timeout=ESPERA_FILA_S):
+            raise RuntimeError("fila de hash de senhas cheia")
+        try:
+            futuro = self._pool.submit(funcao, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        return futuro.result()
+
+    # ========================================================================
+    # INTERFACE (CHAMADA PELAS THREADS DAS REQUISIÇÕES)
+    # ========================================================================
+    def gerar(self, senha):
+        """
+        Hash com sal novo, nos parâmetros atuais.
+
+        Returns:
+            str: Texto para o campo "senha" do usuário
+
+        Raises:
+            RuntimeError: Fila do pool cheia
+        """
+        return self._executar(self._formatar, senha)
+
+    def verificar(self, senha, armazenado):
+        """
+        Confere a senha com o hash armazenado (qualquer formato aceito).
+
+        Com armazenado=None (email inexistente) calcula a KDF contra um hash
+        fictício com os parâmetros atuais e recusa: o tempo de resposta não
+        revela quais contas existem.
+
+        Returns:
+            tuple: (confere, novo_hash) - novo_hash não é None quando a senha
+                   confere mas o hash armazenado usa formato/parâmetros antigos
+
+        Raises:
+            RuntimeError: Fila do pool cheia
+        """
+        if armazenado is None:
+            self._executar(self._conferir, senha, self._obter_hash_ficticio())
+            return False, None
+        return self._executar(self._conferir, senha, armazenado)
+
+    def _obter_hash_ficticio(self):
+        with self._trava_ficticio:
+            if self._hash_ficticio is None:
+                self._hash_ficticio = self._executar(self._formatar, os.urandom(TAMANHO_SAL).hex())
+            return self._hash_ficticio
+
+    def fechar(self):
+        self._pool.shutdown(wait=True)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+def medir(algoritmo, custo, trabalhadores, logins):
+    """
+    Logins por segundo com `logins` verificações simultâneas.
+
+    Returns:
+        dict: {"algoritmo", "custo", "threads", "ms_por_hash", "logins_s"}
+    """
+    kdf = HashSenhas(algoritmo, custo, trabalhadores, fila=logins)
+    try:
+        armazenado = kdf.gerar("senha-benchmark")
+        inicio = time.perf_counter()
+        kdf.verificar("senha-benchmark", armazenado)
+        ms_por_hash = (time.perf_counter() - inicio) * 1000
+        clientes = [threading.Thread(target=kdf.verificar, args=("senha-benchmark", armazenado))
+                    for _ in range(logins)]
+        inicio = time.perf_counter()
+        for cliente in clientes:
+            cliente.start()
+        for cliente in clientes:
+            cliente.join()
+        duracao = time.perf_counter() - inicio
+    finally:
+        kdf.fechar()
+    return {"algoritmo": algoritmo, "custo": kdf.custo, "threads": kdf.trabalhadores,
+            "ms_por_hash": ms_por_hash, "logins_s": logins / duracao}
+
+
+def main(argv=None):
+    """FERRAMENTA DE LINHA DE COMANDO - Vazão de login em função do custo da KDF."""
+    parser = argparse.ArgumentParser(description="Benchmark de logins/s x custo da KDF")
+    parser.add_argument("--algoritmo", choices=ALGORITMOS, default="scrypt")
+    parser.add_argument("--custos", default=None,
+                        help="Lista separada por vírgula (log2 n no scrypt, iterações no pbkdf2)")
+    parser.add_argument("--threads", default=str(_trabalhadores_padrao()), help="Tamanhos de pool, ex: 1,2,4")
+    parser.add_argument("--logins", type=int, default=32, help="Verificações simultâneas por medição")
+    args = parser.parse_args(argv)
+
+    custos = ([int(c) for c in args.custos.split(",")] if args.custos
+              else [CUSTO_PADRAO[args.algoritmo]])
+    print(f"{'ALGORITMO':<10}{'CUSTO':>9}{'THREADS':>9}{'MS/HASH':>10}{'LOGINS/S':>10}")
+    for custo in custos:
+        for threads in (int(t) for t in args.threads.split(",")):
+            r = medir(args.algoritmo, custo, threads, args.logins)
+            print(f"{r['algoritmo']:<10}{r['custo']:>9}{r['threads']:>9}"
+                  f"{r['ms_por_hash']:>10.1f}{r['logins_s']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
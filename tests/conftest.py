@@ -0,0 +1,25 @@
+"""Fixtures comuns dos testes."""
+
+import pytest
+
+
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    """Módulo web.app com repositório, placar, KDF e limites isolados do ambiente real."""
+    import space_invaders.web.app as web
+    from space_invaders.Business.placar_business import PlacarBusiness
+    from space_invaders.Dados.usuarios import RepositorioUsuarios
+    from space_invaders.web.limite import LimitadorTaxa
+    from space_invaders.web.senhas import HashSenhas
+
+    repositorio = RepositorioUsuarios(tmp_path / "usuarios.json")
+    senhas = HashSenhas("pbkdf2", custo=1, trabalhadores=1)
+    monkeypatch.setattr(web, "repositorio_usuarios", repositorio)
+    monkeypatch.setattr(web, "placar", PlacarBusiness(repositorio))
+    monkeypatch.setattr(web, "senhas", senhas)
+    monkeypatch.setattr(web, "limite_ip", LimitadorTaxa(1000, 1000))
+    monkeypatch.setattr(web, "limite_email", LimitadorTaxa(1000, 1000))
+    web.app.config["TESTING"] = True
+    yield web
+    senhas.fechar()
+    repositorio.fechar()
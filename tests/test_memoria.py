@@ -0,0 +1,92 @@
+"""Testes da MemoriaReplay (space_invaders/ia/memoria.py)."""
+
+import time
+
+import numpy as np
+import pytest
+
+from space_invaders.ia.memoria import MemoriaReplay
+
+
+def encher(memoria, k):
+    obs = np.arange(k, dtype=np.float32).reshape(k, 1)
+    return memoria.adicionar_lote(obs, np.zeros((k, memoria.n_acoes)), np.arange(k), obs, np.zeros(k))
+
+
+def melhor_tempo(funcao, repeticoes=30):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def test_lote_maior_que_capacidade_guarda_as_ultimas(tmp_path):
+    memoria = MemoriaReplay(tmp_path, capacidade=4, forma_obs=(1,))
+    posicoes = encher(memoria, 10)
+    assert list(posicoes) == [2, 3, 0, 1]
+    assert memoria.escritos == 10
+    assert sorted(memoria.recompensas[:]) == [6, 7, 8, 9]
+
+
+def test_amostragem_ignora_posicoes_em_escrita(tmp_path):
+    memoria = MemoriaReplay(tmp_path, capacidade=8, forma_obs=(1,))
+    encher(memoria, 8)
+    with memoria.trava:
+        memoria._definir_prioridades(np.arange(6), 0.0)  # Como no meio de adicionar_lote
+    rng = np.random.default_rng(0)
+    for alfa in (None, memoria.alfa):
+        lote = memoria.amostrar(500, rng, alfa=alfa)
+        assert set(lote["indices"].tolist()) == {6, 7}
+        assert np.isfinite(lote["pesos"]).all()
+
+
+def test_sem_transicoes_concluidas(tmp_path):
+    memoria = MemoriaReplay(tmp_path, capacidade=4, forma_obs=(1,))
+    encher(memoria, 4)
+    with memoria.trava:
+        memoria._definir_prioridades(np.arange(4), 0.0)
+    for alfa in (None, memoria.alfa):
+        with pytest.raises(ValueError):
+            memoria.amostrar(2, alfa=alfa)
+
+
+def test_amostragem_priorizada_proporcional(tmp_path):
+    memoria = MemoriaReplay(tmp_path, capacidade=5, forma_obs=(1,), alfa=1.0)
+    encher(memoria, 5)
+    memoria.atualizar_prioridades(np.arange(5), np.array([1, 2, 3, 4, 0]), epsilon=1.0)
+    lote = memoria.amostrar(100_000, np.random.default_rng(1), alfa=1.0)
+    frequencias = np.bincount(lote["indices"], minlength=5) / 100_000
+    np.testing.assert_allclose(frequencias, np.array([2, 3, 4, 5, 1]) / 15, atol=0.01)
+
+
+def test_alfa_diferente_do_da_memoria(tmp_path):
+    memoria = MemoriaReplay(tmp_path, capacidade=4, forma_obs=(1,))
+    encher(memoria, 4)
+    with pytest.raises(ValueError):
+        memoria.amostrar(2, alfa=memoria.alfa + 0.1)
+
+
+def test_arvore_reaberta_por_outro_processo(tmp_path):
+    memoria = MemoriaReplay(tmp_path, capacidade=4, forma_obs=(1,), alfa=1.0)
+    encher(memoria, 4)
+    memoria.atualizar_prioridades(np.array([2]), np.array([99.0]), epsilon=1.0)
+    memoria.fechar()
+    reaberta = MemoriaReplay(tmp_path)
+    lote = reaberta.amostrar(1000, np.random.default_rng(2), alfa=1.0)
+    assert np.mean(lote["indices"] == 2) > 0.9
+
+
+@pytest.mark.parametrize("alfa", [None, 0.6])
+def test_custo_da_amostragem_nao_cresce_com_a_capacidade(tmp_path, alfa):
+    tempos = []
+    for capacidade in (1 << 10, 1 << 20):
+        memoria = MemoriaReplay(tmp_path / str(capacidade), capacidade=capacidade, forma_obs=(1,))
+        encher(memoria, capacidade)
+        rng = np.random.default_rng(0)
+        saida = memoria.criar_lote(64)
+        tempos.append(melhor_tempo(lambda: memoria.amostrar(64, rng, alfa=alfa, saida=saida)))
+        memoria.fechar()
+    # 1024x mais posições: uma varredura O(n) ficaria centenas de vezes mais lenta
+    assert tempos[1] < 8 * tempos[0]
@@ -0,0 +1,101 @@
+"""Testes das rotas de web/app.py (cliente de teste do Flask)."""
+
+import pytest
+
+from space_invaders.web import senhas as modulo_senhas
+
+
+@pytest.fixture
+def fila_cheia(web, monkeypatch):
+    """Ocupa todas as vagas do pool de hash (trabalhadores + fila)."""
+    monkeypatch.setattr(modulo_senhas, "ESPERA_FILA_S", 0.01)
+    vagas = web.senhas._vagas
+    ocupadas = 0
+    while vagas.acquire(blocking=False):
+        ocupadas += 1
+    yield
+    for _ in range(ocupadas):
+        vagas.release()
+
+
+@pytest.mark.parametrize("rota, dados", [
+    ("/login", {"email": "a@b.c", "senha": "1234"}),
+    ("/cadastro", {"nome": "A", "email": "a@b.c", "senha": "1234"}),
+])
+def test_fila_de_hash_cheia_responde_503(web, fila_cheia, rota, dados):
+    resposta = web.app.test_client().post(rota, data=dados)
+    assert resposta.status_code == 503
+    assert int(resposta.headers["Retry-After"]) > 0
+    assert not web.repositorio_usuarios.existe("a@b.c")
+
+
+def test_senha_errada_continua_200(web):
+    cliente = web.app.test_client()
+    cliente.post("/cadastro", data={"nome": "A", "email": "a@b.c", "senha": "1234"})
+    resposta = cliente.post("/login", data={"email": "a@b.c", "senha": "errada"})
+    assert resposta.status_code == 200
+
+
+@pytest.fixture
+def partida(web, monkeypatch):
+    """Jogo novo sem game loop em segundo plano; dois clientes: anônimo e logado."""
+    from space_invaders.jogo_headless import JogoHeadless
+
+    monkeypatch.setattr(web, "jogo", JogoHeadless(semente=1))
+    monkeypatch.setattr(web, "start_game_thread", lambda: None)
+    monkeypatch.setattr(web, "dono_partida", {"partida": None, "email": None})
+    monkeypatch.setattr(web, "partida_registrada", 0)
+    web.repositorio_usuarios.adicionar("a@b.c", {"nome": "A", "senha": "x"})
+    anonimo, logado = web.app.test_client(), web.app.test_client()
+    with logado.session_transaction() as sessao:
+        sessao["usuario_email"] = "a@b.c"
+    return anonimo, logado
+
+
+def terminar_partida(web):
+    from space_invaders.utils import ESTADO_GAME_OVER
+
+    web.jogo.pontuacao.pontos = 50
+    web.jogo.estado = ESTADO_GAME_OVER
+    web.registrar_fim_partida()
+    web.placar.aguardar()
+
+
+def test_partida_anonima_nao_vai_para_quem_so_apertou_tecla(web, partida):
+    anonimo, logado = partida
+    anonimo.post("/api/comando", json={"acao": "reiniciar"})  # Inicia a partida sem sessão
+    logado.post("/api/comando", json={"acao": "esquerda", "estado": "pressionar"})
+    terminar_partida(web)
+    assert web.placar.posicao("a@b.c") is None
+
+
+def test_partida_pertence_a_sessao_que_a_iniciou(web, partida):
+    anonimo, logado = partida
+    logado.post("/api/comando", json={"acao": "reiniciar"})
+    anonimo.post("/api/comando", json={"acao": "esquerda", "estado": "pressionar"})
+    terminar_partida(web)
+    assert web.placar.posicao("a@b.c")["pontos"] == 50
+
+
+def test_email_em_branco_nao_divide_balde(web, monkeypatch):
+    from space_invaders.web.limite import LimitadorTaxa
+
+    monkeypatch.setattr(web, "limite_email", LimitadorTaxa(1, 0.001))
+    clientes = []
+    for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+        cliente = web.app.test_client()
+        cliente.environ_base["REMOTE_ADDR"] = ip
+        clientes.append(cliente)
+    for cliente in clientes:  # Cada IP tenta com email em branco ou só espaços
+        for email in ("", "   "):
+            assert cliente.post("/login", data={"email": email, "senha": "x"}).status_code == 200
+    assert web.limite_email.estatisticas()["chaves"] == 0
+
+
+def test_email_normalizado_no_limite(web, monkeypatch):
+    from space_invaders.web.limite import LimitadorTaxa
+
+    monkeypatch.setattr(web, "limite_email", LimitadorTaxa(1, 0.001))
+    cliente = web.app.test_client()
+    assert cliente.post("/login", data={"email": "A@B.c", "senha": "x"}).status_code == 200
+    assert cliente.post("/login", data={"email": " a@b.C ", "senha": "x"}).status_code == 429